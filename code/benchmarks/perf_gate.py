@@ -0,0 +1,180 @@
+"""
+Performance Regression Gate
+
+Runs a fixed workload - 200k bars of synthetic XAUUSD-like M5 data plus
+its H1 resample - through ZoneDetector.detect_zones and
+BacktestEngine.run_backtest, then compares against a stored baseline:
+- Throughput (bars/sec, best of N runs) must stay within `tolerance` of
+  the baseline, otherwise the gate fails
+- Results must match exactly: zone counts, trade count, total R and
+  profit factor. A speedup that changes results is a failure too
+
+Baselines are machine-specific; the gate warns when the stored baseline
+was recorded on a different environment. Refresh it with --update after
+an intentional change.
+
+Usage (from the code/ directory):
+    python -m benchmarks.perf_gate                 # check, exit 1 on regression
+    python -m benchmarks.perf_gate --update        # record a new baseline
+    python -m benchmarks.perf_gate --tolerance 0.1
+"""
+
+import argparse
+import json
+import sys
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.suite import synthetic_ohlcv, resample_h1, load_engine, time_call, environment
+from utils.reporting import configure_logging
+from zones.detector import ZoneDetector, ZoneType
+
+
+N_BARS = 200_000
+SEED = 1
+PRICE = 1800.0          # XAUUSD-like price level
+VOLATILITY = 0.0006
+REPEATS = 5
+TOLERANCE = 0.25        # Allowed fractional throughput drop
+
+BASELINE_PATH = Path(__file__).parent / "perf_baseline.json"
+
+def workload():
+    """The fixed M5/H1 frames every gate run uses"""
+    m5 = synthetic_ohlcv(N_BARS, seed=SEED, price=PRICE, volatility=VOLATILITY)
+    return m5, resample_h1(m5)
+
+
+def measure(repeats: int = REPEATS) -> Dict:
+    """
+    Time the workload and record its results
+
+    Returns:
+        Dictionary with 'timings' (target -> seconds, bars_per_sec) and
+        'parity' (values that must not change)
+    """
+    m5, h1 = workload()
+    engine_module = load_engine()
+
+    detector = ZoneDetector()
+    zones = detector.detect_zones(m5)
+    detect_times = time_call(lambda: detector.detect_zones(m5), repeats)
+
+    results = {}
+
+    def backtest():
+        results.update(engine_module.BacktestEngine().run_backtest(m5, h1, "XAUUSD"))
+
+    backtest()
+    backtest_times = time_call(backtest, repeats)
+
+    timings = {}
+    for target, times in (('detect_zones', detect_times), ('run_backtest', backtest_times)):
+        best = min(times)
+        timings[target] = {'seconds': best, 'bars_per_sec': N_BARS / best}
+
+    parity = {
+        'zones': len(zones),
+        'supply_zones': zones.count(zone_type=ZoneType.SUPPLY),
+        'demand_zones': zones.count(zone_type=ZoneType.DEMAND),
+        'trades': int(results['total_trades']),
+        'total_pnl_r': float(results['total_pnl_r']),
+        'profit_factor': float(results['profit_factor']),
+    }
+
+    return {'timings': timings, 'parity': parity}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """
+    Failures of current against baseline (empty if the gate passes)
+
+    Args:
+        current: Output of measure()
+        baseline: Stored baseline document
+        tolerance: Allowed fractional throughput drop (0.25 = 25% slower)
+    """
+    failures = []
+
+    for target, stats in baseline['timings'].items():
+        if target not in current['timings']:
+            failures.append(f"{target}: missing from current run")
+            continue
+        floor = stats['bars_per_sec'] * (1 - tolerance)
+        rate = current['timings'][target]['bars_per_sec']
+        if rate < floor:
+            failures.append(f"{target}: {rate:,.0f} bars/s is below {floor:,.0f} "
+                            f"(baseline {stats['bars_per_sec']:,.0f}, tolerance {tolerance:.0%})")
+
+    for name, expected in baseline['parity'].items():
+        actual = current['parity'].get(name)
+        if isinstance(expected, float):
+            same = actual is not None and bool(np.isclose(actual, expected, rtol=1e-9, atol=1e-12))
+        else:
+            same = actual == expected
+        if not same:
+            failures.append(f"parity {name}: {actual} != baseline {expected}")
+
+    return failures
+
+
+def save_baseline(current: Dict, path: Path = BASELINE_PATH) -> Dict:
+    """Write current measurements as the new baseline"""
+    document = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'workload': {'bars': N_BARS, 'seed': SEED, 'price': PRICE, 'volatility': VOLATILITY},
+        'environment': environment(),
+        **current,
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return document
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail on detector/backtest throughput or result regressions")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="Allowed fractional slowdown")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="Timed runs per target")
+    parser.add_argument('--update', action='store_true', help="Record a new baseline instead of checking")
+    args = parser.parse_args()
+
+    # Silence the engine's per-run banners
+    configure_logging('warning')
+
+    print("=" * 80)
+    print("PERFORMANCE REGRESSION GATE")
+    print("=" * 80)
+    print(f"Workload: {N_BARS:,} synthetic M5 bars + H1 | seed: {SEED} | repeats: {args.repeats}\n")
+
+    current = measure(args.repeats)
+    for target, stats in current['timings'].items():
+        print(f"  {target:<14} {stats['seconds']:>9.4f}s  {stats['bars_per_sec']:>14,.0f} bars/s")
+    print("  " + ", ".join(f"{name}={value}" for name, value in current['parity'].items()))
+
+    if args.update or not args.baseline.exists():
+        save_baseline(current, args.baseline)
+        print(f"\nBaseline written: {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if baseline.get('environment') != environment():
+        print("\nNote: baseline was recorded on a different environment; timings may not be comparable")
+
+    failures = compare(current, baseline, args.tolerance)
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        return 1
+
+    print(f"\nPASS: throughput within {args.tolerance:.0%} of baseline, results unchanged")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+Performance Benchmark Suite
+
+Times the research hot paths on deterministic synthetic OHLCV so results
+are comparable across machines and commits:
+- ZoneDetector.detect_zones and ZoneDetector._update_zone_freshness
+- TrendAnalyzer.analyze
+- PeriodicOBFilter.add_time_features
+- DataLoader.load (Parquet round trip in the loader's M5/<symbol> layout)
+- BacktestEngine.run_backtest (M5 plus resampled H1)
+
+Each (target, size) is timed `repeats` times (best run reported as
+bars/sec) and run once more under tracemalloc for peak memory. Scaling
+exponents come from a log-log fit of time against bars (1.0 = linear).
+Results are written as JSON for regression comparison.
+
+Usage (from the code/ directory):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sizes 10000 100000 --targets detect_zones run_backtest
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import importlib.util
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from data.data_loader import DataLoader
+from zones.detector import ZoneDetector
+from zones.time_filter import PeriodicOBFilter
+from strategies.trend_analyzer import TrendAnalyzer
+
+
+SIZES = (10_000, 100_000, 1_000_000)
+REPEATS = 3
+SEED = 42
+SYMBOL = "BENCH"
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# The backtest engine lives outside code/ and is loaded by path
+ENGINE_PATH = Path(__file__).parent.parent.parent / "tradingview" / "validation" / "backtest_engine.py"
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory of one target at one size"""
+    target: str
+    n_bars: int
+    seconds: float          # Best of `repeats` runs
+    mean_seconds: float
+    bars_per_sec: float
+    peak_mb: float          # Peak traced allocation during one run
+    repeats: int
+
+
+def synthetic_ohlcv(
+    n_bars: int,
+    seed: int = SEED,
+    freq: str = "5min",
+    start: str = "2020-01-01",
+    price: float = 1800.0,
+    volatility: float = 0.0006
+) -> pd.DataFrame:
+    """
+    Deterministic OHLCV with consolidation-then-breakout structure
+
+    Bars come in blocks of 40: one block in three is quiet and
+    mean-reverting (a consolidation), the others are active with a drift
+    that flips every 3000 bars, so the detector finds zones at a realistic
+    rate. High/low always bracket open/close.
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+        freq: Bar frequency
+        start: First timestamp
+        price: Starting price
+        volatility: Per-bar log-return standard deviation in active blocks
+
+    Returns:
+        DataFrame with timestamp index and open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    bar = np.arange(n_bars)
+
+    quiet = (bar // 40) % 3 == 0
+    sigma = np.where(quiet, volatility * 0.15, volatility)
+    drift = np.where(quiet, 0.0, volatility * 0.15 * np.where((bar // 3000) % 2 == 0, 1, -1))
+
+    noise = rng.standard_normal(n_bars)
+    # Differenced noise keeps quiet blocks inside a tight range
+    steps = np.where(quiet, 0.2 * np.diff(noise, prepend=0.0), noise) * sigma + drift
+
+    close = price * np.exp(np.cumsum(steps))
+    open_ = np.concatenate([[price], close[:-1]])
+    wick = price * sigma * (0.5 + 0.2 * np.abs(rng.standard_normal((2, n_bars))))
+    high = np.maximum(open_, close) + wick[0]
+    low = np.minimum(open_, close) - wick[1]
+    volume = rng.integers(1000, 10000, n_bars).astype(float)
+
+    return pd.DataFrame({
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    }, index=pd.date_range(start, periods=n_bars, freq=freq, name='timestamp'))
+
+
+def resample_h1(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate M5 (or finer) bars to H1"""
+    return df.resample('1h').agg({
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum'
+    }).dropna()
+
+
+def load_engine():
+    """Import tradingview/validation/backtest_engine.py"""
+    spec = importlib.util.spec_from_file_location("backtest_engine", ENGINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _quiet(func: Callable) -> Callable:
+    """Run func with stdout discarded (engine progress banners)"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+
+# Each builder takes (m5, h1, workdir) and returns the zero-argument callable
+# to time; setup work (ATR, candidate scan, Parquet write) stays untimed.
+
+def _bench_detect_zones(m5, h1, workdir):
+    detector = ZoneDetector()
+    return lambda: detector.detect_zones(m5)
+
+
+def _bench_update_zone_freshness(m5, h1, workdir):
+    detector = ZoneDetector()
+    df = detector._add_atr(m5)
+    zones = detector._scan_zones(df, detector.lookback_periods, len(df))
+    return lambda: detector._update_zone_freshness(zones, df)
+
+
+def _bench_trend_analyze(m5, h1, workdir):
+    analyzer = TrendAnalyzer()
+    return lambda: analyzer.analyze(m5)
+
+
+def _bench_add_time_features(m5, h1, workdir):
+    ob_filter = PeriodicOBFilter()
+    return lambda: ob_filter.add_time_features(m5)
+
+
+def _bench_data_load(m5, h1, workdir):
+    (workdir / "M5").mkdir(parents=True, exist_ok=True)
+    m5.to_parquet(workdir / "M5" / f"{SYMBOL}.parquet")
+    loader = DataLoader(workdir)
+    return lambda: loader.load(SYMBOL, "M5")
+
+
+def _bench_run_backtest(m5, h1, workdir):
+    engine_module = load_engine()
+    # A fresh engine per run, so cached features never carry over
+    return _quiet(lambda: engine_module.BacktestEngine().run_backtest(m5, h1, SYMBOL))
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'detect_zones': _bench_detect_zones,
+    'update_zone_freshness': _bench_update_zone_freshness,
+    'trend_analyze': _bench_trend_analyze,
+    'add_time_features': _bench_add_time_features,
+    'data_load': _bench_data_load,
+    'run_backtest': _bench_run_backtest,
+}
+
+
+def time_call(func: Callable, repeats: int = REPEATS) -> List[float]:
+    """Wall-clock seconds of each of `repeats` calls"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(func: Callable) -> int:
+    """Peak bytes allocated (numpy and Python) during one call"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(
+    sizes: Sequence[int] = SIZES,
+    targets: Optional[Sequence[str]] = None,
+    repeats: int = REPEATS,
+    seed: int = SEED,
+    verbose: bool = True
+) -> List[BenchmarkResult]:
+    """
+    Benchmark every target at every size
+
+    Args:
+        sizes: M5 bar counts
+        targets: Names from BENCHMARKS (default: all)
+        repeats: Timed runs per (target, size)
+        seed: Seed for the synthetic data
+        verbose: Print one line per result
+
+    Returns:
+        List of BenchmarkResult, by size then target
+    """
+    targets = list(targets or BENCHMARKS)
+    unknown = [t for t in targets if t not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark targets: {unknown}. Available: {list(BENCHMARKS)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bars in sizes:
+            m5 = synthetic_ohlcv(n_bars, seed=seed)
+            h1 = resample_h1(m5)
+
+            for target in targets:
+                func = BENCHMARKS[target](m5, h1, Path(tmp))
+                func()  # Warm-up (imports, caches)
+
+                times = time_call(func, repeats)
+                peak = peak_memory(func)
+
+                best = min(times)
+                result = BenchmarkResult(
+                    target=target,
+                    n_bars=n_bars,
+                    seconds=best,
+                    mean_seconds=float(np.mean(times)),
+                    bars_per_sec=n_bars / best if best > 0 else float('inf'),
+                    peak_mb=peak / 1e6,
+                    repeats=repeats
+                )
+                results.append(result)
+
+                if verbose:
+                    print(f"  {target:<24} {n_bars:>10,} bars  {best:>9.4f}s  "
+                          f"{result.bars_per_sec:>14,.0f} bars/s  {result.peak_mb:>9.1f} MB")
+
+    return results
+
+
+def scaling_exponents(results: List[BenchmarkResult]) -> Dict[str, float]:
+    """
+    Slope of log(seconds) against log(bars) per target
+
+    1.0 means linear scaling, 2.0 quadratic. Targets measured at fewer
+    than two sizes are left out.
+    """
+    exponents = {}
+    for target in dict.fromkeys(r.target for r in results):
+        rows = [r for r in results if r.target == target and r.seconds > 0]
+        if len({r.n_bars for r in rows}) < 2:
+            continue
+        slope = np.polyfit(np.log([r.n_bars for r in rows]), np.log([r.seconds for r in rows]), 1)[0]
+        exponents[target] = float(slope)
+    return exponents
+
+
+def environment() -> Dict:
+    """Interpreter, library and machine details stored with results"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(results: List[BenchmarkResult], path: Path, seed: int = SEED) -> Dict:
+    """
+    Write results, scaling exponents and environment as JSON
+
+    Returns:
+        The written document
+    """
+    document = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'environment': environment(),
+        'results': [asdict(r) for r in results],
+        'scaling': scaling_exponents(results),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+    return document
+
+
+def load_results(path: Path) -> List[BenchmarkResult]:
+    """Read results written by save_results()"""
+    with open(path) as f:
+        document = json.load(f)
+    return [BenchmarkResult(**r) for r in document['results']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark detector, trend, filter, loader and backtest")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help="M5 bar counts")
+    parser.add_argument('--targets', nargs='+', default=None, choices=list(BENCHMARKS), help="Subset to run")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help="Timed runs per measurement")
+    parser.add_argument('--seed', type=int, default=SEED, help="Synthetic data seed")
+    parser.add_argument('--output', type=Path,
+                        default=RESULTS_DIR / f"benchmarks_{datetime.now():%Y%m%d_%H%M%S}.json",
+                        help="JSON results file")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PERFORMANCE BENCHMARKS")
+    print("=" * 80)
+    print(f"Sizes: {', '.join(f'{n:,}' for n in args.sizes)} bars | repeats: {args.repeats} | seed: {args.seed}\n")
+
+    results = run_suite(args.sizes, args.targets, args.repeats, args.seed)
+    document = save_results(results, args.output, args.seed)
+
+    if document['scaling']:
+        print("\nScaling (time ~ bars^k):")
+        for target, exponent in document['scaling'].items():
+            print(f"  {target:<24} k = {exponent:.2f}")
+
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Dataset Catalog
+
+A JSON index (<data root>/_catalog.json) of every Parquet dataset
+DataLoader can load, so discovery and date-range queries never walk the
+directory or read bars. One entry per (timeframe, symbol):
+- file: base file, resolved with DataLoader's naming precedence
+  (<symbol>_<TF>_2020_2025.parquet in the root, <TF>/<symbol>.parquet,
+  <TF>/<symbol>_<TF>.parquet)
+- rows, first, last: over the base file and appended parts
+- row_groups: rows and timestamp range of each base-file row group
+- size, mtime_ns, hash: change detection and a content hash (BLAKE2b)
+- columns, parts (files appended by DataLoader.append) and gaps
+
+refresh() is incremental: files are stat()ed, and only new or changed
+files have their footers read and contents hashed. Writers (ingest, the
+synthetic generator, DataLoader.append) record what they write, so a
+refresh after them finds nothing to do.
+
+Usage (from the code/ directory):
+    python -m data.catalog --root data/raw/combined_2020_2025
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import pandas as pd
+import pyarrow.parquet as pq
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+CATALOG_FILE = "_catalog.json"
+
+# Subdirectory of the data path holding persisted features (not a timeframe)
+FEATURES_DIR = "features"
+
+# Subdirectory of the data path holding tick files (see data.ticks; not a timeframe)
+TICKS_DIR = "ticks"
+
+# Directory next to <symbol>.parquet holding appended part files
+PARTS_SUFFIX = ".parts"
+
+_COMBINED = re.compile(r"^(?P<symbol>.+)_(?P<timeframe>[A-Z]\d+)_2020_2025\.parquet$")
+
+_HASH_BLOCK = 1 << 20
+
+
+def _naive(value) -> Optional[pd.Timestamp]:
+    """Timestamp without timezone (converted to UTC first)"""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_convert('UTC').tz_localize(None) if ts.tz is not None else ts
+
+
+def _iso(value) -> Optional[str]:
+    return None if value is None else _naive(value).isoformat()
+
+
+def content_hash(path: Path) -> str:
+    """BLAKE2b digest of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_stats(path: Path, root: Path, symbol: Optional[str] = None) -> Dict:
+    """
+    Catalog record of one Parquet file from its footer
+
+    Timestamp ranges come from the 'timestamp' column statistics; files
+    without them have their timestamp index read instead. For files with
+    a 'pair' column (several symbols), rows, first and last are those of
+    symbol, read from the two columns.
+    """
+    stat = path.stat()
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    names = metadata.schema.names
+
+    row_groups = []
+    column = names.index('timestamp') if 'timestamp' in names else None
+    for i in range(metadata.num_row_groups):
+        group = metadata.row_group(i)
+        stats = group.column(column).statistics if column is not None else None
+        if stats is None or not stats.has_min_max:
+            row_groups = None
+            break
+        row_groups.append({'rows': group.num_rows, 'first': _iso(stats.min), 'last': _iso(stats.max)})
+
+    if row_groups is not None:
+        first = min((g['first'] for g in row_groups), default=None)
+        last = max((g['last'] for g in row_groups), default=None)
+    else:
+        df = pd.read_parquet(path, columns=['timestamp'] if column is not None else [])
+        times = pd.DatetimeIndex(df['timestamp'] if column is not None else df.index)
+        first, last = (_iso(times.min()), _iso(times.max())) if len(times) else (None, None)
+        row_groups = []
+
+    rows = metadata.num_rows
+    if symbol is not None and 'pair' in names and column is not None:
+        df = pd.read_parquet(path, columns=['timestamp', 'pair'])
+        times = df.loc[df['pair'] == symbol, 'timestamp']
+        rows = len(times)
+        first, last = (_iso(times.min()), _iso(times.max())) if rows else (None, None)
+
+    return {
+        'file': path.relative_to(root).as_posix(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': content_hash(path),
+        'rows': rows,
+        'first': first,
+        'last': last,
+        'columns': [n for n in names if n != 'timestamp' and not n.startswith('__')],
+        'row_groups': row_groups,
+    }
+
+
+def _unchanged(record: Optional[Dict], path: Path, root: Path) -> bool:
+    if record is None or record.get('file') != path.relative_to(root).as_posix():
+        return False
+    stat = path.stat()
+    return record.get('size') == stat.st_size and record.get('mtime_ns') == stat.st_mtime_ns
+
+
+class DataCatalog:
+    """Incrementally maintained index of a DataLoader data root"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.path = self.root / CATALOG_FILE
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f).get('entries', {})
+
+    @staticmethod
+    def key(symbol: str, timeframe: str) -> str:
+        return f"{timeframe}/{symbol}"
+
+    def entry(self, symbol: str, timeframe: str) -> Optional[Dict]:
+        return self.entries.get(self.key(symbol, timeframe))
+
+    def timeframes(self) -> List[str]:
+        return sorted({entry['timeframe'] for entry in self.entries.values()})
+
+    def symbols(self, timeframe: str) -> List[str]:
+        return sorted(entry['symbol'] for entry in self.entries.values() if entry['timeframe'] == timeframe)
+
+    def refresh(self, persist_errors: bool = True) -> Dict[str, int]:
+        """
+        Bring the catalog in line with the files on disk
+
+        Args:
+            persist_errors: Raise if the updated catalog cannot be written;
+                            with False (refreshes triggered by reads, e.g. on
+                            a read-only data root) it is kept in memory only
+
+        Returns:
+            Counts of 'added', 'updated', 'removed' and 'unchanged' entries
+        """
+        found = self._discover()
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        for key in list(self.entries):
+            if key not in found:
+                del self.entries[key]
+                counts['removed'] += 1
+
+        for key, (symbol, timeframe, base, parts) in found.items():
+            old = self.entries.get(key)
+            old_parts = {p['file']: p for p in (old or {}).get('parts', [])}
+            base_same = old is not None and _unchanged(old, base, self.root)
+            parts_same = (
+                old is not None
+                and [p.relative_to(self.root).as_posix() for p in parts] == list(old_parts)
+                and all(_unchanged(old_parts[p.relative_to(self.root).as_posix()], p, self.root) for p in parts)
+            )
+            if base_same and parts_same:
+                counts['unchanged'] += 1
+                continue
+
+            base_record = self._base_record(old) if base_same else file_stats(base, self.root, symbol)
+            part_records = []
+            for part in parts:
+                record = old_parts.get(part.relative_to(self.root).as_posix())
+                part_records.append(record if _unchanged(record, part, self.root) else self._part_stats(part))
+
+            gaps = old.get('gaps', []) if base_same else []
+            self._set(symbol, timeframe, base_record, part_records, gaps)
+            counts['added' if old is None else 'updated'] += 1
+
+        if counts['added'] or counts['updated'] or counts['removed']:
+            try:
+                self.save()
+            except OSError:
+                if persist_errors:
+                    raise
+        return counts
+
+    def record_dataset(self, symbol: str, timeframe: str, path: Path, gaps: Sequence = ()):
+        """Record a freshly written base file (without parts)"""
+        self._set(symbol, timeframe, file_stats(Path(path), self.root, symbol), [], list(gaps))
+        self.save()
+
+    def record_part(self, symbol: str, timeframe: str, path: Path, gaps: Sequence = ()):
+        """Record a part file appended to an existing entry"""
+        entry = self.entry(symbol, timeframe)
+        parts = entry['parts'] + [self._part_stats(Path(path))]
+        self._set(symbol, timeframe, self._base_record(entry), parts, entry.get('gaps', []) + list(gaps))
+        self.save()
+
+    def save(self):
+        """Write the catalog atomically (a unique temp file per write, so concurrent writers never collide)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.root, prefix=f"{CATALOG_FILE}.", suffix='.tmp',
+                                         delete=False) as f:
+            json.dump({'version': 1, 'entries': self.entries}, f, indent=2)
+        try:
+            os.replace(f.name, self.path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    @staticmethod
+    def _base_record(entry: Dict) -> Dict:
+        """The base-file part of an entry (rows/first/last without parts)"""
+        return {**entry, 'rows': entry['base_rows'], 'first': entry['base_first'], 'last': entry['base_last']}
+
+    def _part_stats(self, path: Path) -> Dict:
+        stats = file_stats(path, self.root)
+        return {k: stats[k] for k in ('file', 'size', 'mtime_ns', 'hash', 'rows', 'first', 'last')}
+
+    def _set(self, symbol: str, timeframe: str, base: Dict, parts: List[Dict], gaps: List):
+        """Store an entry; rows/first/last span the base file and its parts"""
+        firsts = [r['first'] for r in [base, *parts] if r.get('first')]
+        lasts = [r['last'] for r in [base, *parts] if r.get('last')]
+        base_fields = {k: base[k] for k in ('file', 'size', 'mtime_ns', 'hash', 'columns', 'row_groups')}
+        self.entries[self.key(symbol, timeframe)] = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            **base_fields,
+            'rows': base['rows'] + sum(p['rows'] for p in parts),
+            'first': min(firsts, default=None),
+            'last': max(lasts, default=None),
+            'base_rows': base['rows'],
+            'base_first': base['first'],
+            'base_last': base['last'],
+            'parts': parts,
+            'gaps': gaps,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def _discover(self) -> Dict[str, tuple]:
+        """Key -> (symbol, timeframe, base file, part files) with DataLoader's precedence"""
+        found = {}
+        if not self.root.is_dir():
+            return found
+
+        # Subfolder layouts: <TF>/<symbol>.parquet before <TF>/<symbol>_<TF>.parquet
+        for tf_dir in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            timeframe = tf_dir.name
+            if timeframe in (FEATURES_DIR, TICKS_DIR) or timeframe.startswith(('.', '_')):
+                continue
+            files = sorted(p for p in tf_dir.glob("*.parquet") if p.is_file())
+            for path in sorted(files, key=lambda p: p.stem.endswith(f"_{timeframe}")):
+                stem = path.stem
+                symbol = stem[:-len(f"_{timeframe}")] if stem.endswith(f"_{timeframe}") else stem
+                found.setdefault(self.key(symbol, timeframe), (symbol, timeframe, path))
+
+        # Combined files in the root take precedence over both
+        for path in self.root.glob("*.parquet"):
+            match = _COMBINED.match(path.name)
+            if match:
+                found[self.key(match['symbol'], match['timeframe'])] = (match['symbol'], match['timeframe'], path)
+
+        return {
+            key: (symbol, timeframe, base,
+                  sorted((self.root / timeframe / f"{symbol}{PARTS_SUFFIX}").glob("*.parquet")))
+            for key, (symbol, timeframe, base) in found.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh and list the dataset catalog of a DataLoader root")
+    parser.add_argument('--root', type=Path, default=Path("data") / "raw" / "combined_2020_2025", help="DataLoader root")
+    args = parser.parse_args()
+
+    catalog = DataCatalog(args.root)
+    counts = catalog.refresh()
+    print(", ".join(f"{n} {kind}" for kind, n in counts.items()))
+    for key, entry in sorted(catalog.entries.items()):
+        print(f"{key:<20} {entry['rows']:>12,} bars  {entry['first']} .. {entry['last']}  "
+              f"{len(entry['parts'])} part(s)  {entry['hash']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,85 @@ Data Loader for Supply & Demand Research
 Loads OHLCV data from MFX_Research_to_Prod parquet files
 """
 
+import os
+import shutil
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from data.catalog import FEATURES_DIR, PARTS_SUFFIX, TICKS_DIR, DataCatalog
+from data.features import FeatureStore
+from data.panel import FIELDS, Panel
+from data.sessions import FX, TradingCalendar, calendar_for
+from data.ticks import TickStore
+
+# Bar length in minutes per timeframe name
+TIMEFRAME_MINUTES = {
+    'M1': 1, 'M5': 5, 'M15': 15, 'M30': 30,
+    'H1': 60, 'H4': 240, 'D1': 1440,
+}
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate bars to a higher timeframe (periods without bars are dropped)"""
+    return df.resample(f"{TIMEFRAME_MINUTES[timeframe]}min").agg({
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum'
+    }).dropna()
+
+
+@dataclass
+class AppendResult:
+    """Outcome of DataLoader.append"""
+    symbol: str
+    timeframe: str
+    rows_appended: int
+    rows_overlapping: int                   # Incoming bars at or before the existing last bar (skipped)
+    first: Optional[pd.Timestamp] = None    # First appended bar
+    last: Optional[pd.Timestamp] = None     # Last appended bar
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp, int]] = field(default_factory=list)   # (after, before, missing bars)
+    path: Optional[Path] = None             # File written
+
+
+def find_gaps(
+    index: pd.DatetimeIndex,
+    timeframe: str,
+    previous: Optional[pd.Timestamp] = None,
+    calendar: TradingCalendar = FX
+) -> List[Tuple[pd.Timestamp, pd.Timestamp, int]]:
+    """
+    Missing bars in a sorted index, counted in open-market time
+
+    Args:
+        index: Bar timestamps (sorted)
+        timeframe: Bar timeframe
+        previous: Last bar before index (checks the join as well)
+        calendar: Market hours; closures are not gaps (see data.sessions)
+
+    Returns:
+        List of (last bar before the gap, first bar after it, missing bars)
+    """
+    if previous is not None:
+        index = pd.DatetimeIndex([previous]).append(index)
+    if len(index) < 2:
+        return []
+    return calendar.sessions(index, timeframe).gaps()
+
+
+def register_dataset(root: Path, timeframe: str, symbol: str, gaps: List = ()):
+    """
+    Record a freshly written <root>/<TF>/<symbol>.parquet in the catalog
+
+    Drops parts appended to the previous version.
+    """
+    path = Path(root) / timeframe / f"{symbol}.parquet"
+    shutil.rmtree(path.with_name(f"{symbol}{PARTS_SUFFIX}"), ignore_errors=True)
+    DataCatalog(root).record_dataset(symbol, timeframe, path, gaps)
 
 
 class DataLoader:
@@ -31,6 +107,13 @@ class DataLoader:
                 "Please ensure data is available. Run scripts/combine_data_2020_2025.py first."
             )
 
+        # Index of every dataset; refreshed here, so later queries never walk the directory
+        self.catalog = DataCatalog(self.data_path)
+        self.catalog.refresh(persist_errors=False)
+
+        # Tick files; bars of timeframes without a stored file are built from them on demand
+        self.ticks = TickStore(self.data_path / TICKS_DIR)
+
     def load(
         self,
         symbol: str,
@@ -41,6 +124,10 @@ class DataLoader:
         """
         Load OHLCV data for a symbol
 
+        Without a stored file for the timeframe, bars are built from the
+        symbol's ticks (if any), including custom timeframes such as M1,
+        M2 or S30; see data.ticks.
+
         Args:
             symbol: Symbol name (e.g., "EURUSD", "XAUUSD")
             timeframe: Timeframe (M1, M5, M15, H1, H4, D1)
@@ -50,29 +137,21 @@ class DataLoader:
         Returns:
             DataFrame with timestamp index and OHLCV columns
         """
-        # Try different file naming conventions
-        # 1. Combined 2020-2025 format: EURUSD_M5_2020_2025.parquet (in root)
-        file_path = self.data_path / f"{symbol}_{timeframe}_2020_2025.parquet"
-
-        # 2. If not found, try subfolder format: M5/EURUSD.parquet
-        if not file_path.exists():
-            file_path = self.data_path / timeframe / f"{symbol}.parquet"
-
-        # 3. If not found, try with timeframe suffix: M5/EURUSD_M5.parquet
-        if not file_path.exists():
-            file_path = self.data_path / timeframe / f"{symbol}_{timeframe}.parquet"
-
-        if not file_path.exists():
+        file_path = self._data_file(symbol, timeframe)
+        if file_path is None and self.ticks.months(symbol):
+            return self.ticks.bars(symbol, timeframe, start_date, end_date)
+        if file_path is None:
             raise FileNotFoundError(
                 f"Data file not found for {symbol} {timeframe}\n"
-                f"Available instruments: {self.list_available_symbols(timeframe)}"
+                f"Available instruments: {self.catalog.symbols(timeframe)}"
             )
 
-        df = pd.read_parquet(file_path)
+        df = self._read_bars(file_path)
 
-        # Set timestamp as index if not already
-        if 'timestamp' in df.columns:
-            df = df.set_index('timestamp')
+        # Bars appended since the file was written; parts wholly outside the range are skipped
+        parts = self._parts(symbol, timeframe, start_date, end_date)
+        if parts:
+            df = pd.concat([df] + [self._read_bars(part) for part in parts])
 
         # Filter by symbol if column exists
         if 'pair' in df.columns:
@@ -101,6 +180,170 @@ class DataLoader:
 
         return df
 
+    def load_ticks(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load ticks for a symbol
+
+        Returns:
+            DataFrame with timestamp index and bid, ask (and bid_volume, ask_volume if stored)
+        """
+        return self.ticks.read(symbol, start_date, end_date)
+
+    @staticmethod
+    def _read_bars(path: Path) -> pd.DataFrame:
+        """One Parquet file with timestamp as index, whether stored as a column or as the index"""
+        df = pd.read_parquet(path)
+        if 'timestamp' in df.columns:
+            df = df.set_index('timestamp')
+        return df
+
+    def _data_file(self, symbol: str, timeframe: str) -> Optional[Path]:
+        """
+        Base Parquet file of a symbol from the catalog
+
+        The catalog resolves the naming conventions in this order:
+        1. Combined 2020-2025 format: EURUSD_M5_2020_2025.parquet (in root)
+        2. Subfolder format: M5/EURUSD.parquet
+        3. With timeframe suffix: M5/EURUSD_M5.parquet
+        A miss refreshes the catalog once, picking up files added since.
+        """
+        entry = self.catalog.entry(symbol, timeframe)
+        if entry is None or not (self.data_path / entry['file']).exists():
+            self.catalog.refresh(persist_errors=False)
+            entry = self.catalog.entry(symbol, timeframe)
+        return self.data_path / entry['file'] if entry is not None else None
+
+    def _parts(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Path]:
+        """Appended part files in time order, pruned to the date range by the catalog"""
+        selected = []
+        for part in self.coverage(symbol, timeframe).get('parts', []):
+            if start_date and pd.Timestamp(part['last']) < pd.Timestamp(start_date):
+                continue
+            if end_date and pd.Timestamp(part['first']) > pd.Timestamp(end_date):
+                continue
+            selected.append(self.data_path / part['file'])
+        return selected
+
+    def coverage(self, symbol: str, timeframe: str = "M15") -> Dict:
+        """Catalog entry of a symbol: file, first, last, rows, row_groups, hash, parts, gaps (empty if none)"""
+        return self.catalog.entry(symbol, timeframe) or {}
+
+    def append(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> AppendResult:
+        """
+        Append new bars to a symbol's dataset without rewriting it
+
+        Bars at or before the dataset's last timestamp are counted as
+        overlap and skipped; the rest go to one new part file under
+        <TF>/<symbol>.parts/, which load() picks up. Gaps between the
+        existing last bar and the new bars (and within them) are reported,
+        market closures of the symbol's calendar excepted. If the symbol has no data yet, the bars
+        become <TF>/<symbol>.parquet.
+
+        Args:
+            symbol: Symbol name
+            timeframe: Timeframe of the bars
+            bars: DataFrame with timestamp index (tz-aware is converted to UTC) and OHLC(V)
+
+        Returns:
+            AppendResult
+        """
+        bars = bars.copy()
+        if bars.index.tz is not None:
+            bars.index = bars.index.tz_convert('UTC').tz_localize(None)
+        bars.index.name = 'timestamp'
+        bars = bars.sort_index()
+        bars = bars[~bars.index.duplicated(keep='last')]
+
+        timeframe_dir = self.data_path / timeframe
+        base = self._data_file(symbol, timeframe)
+
+        if base is None:
+            gaps = find_gaps(bars.index, timeframe, calendar=calendar_for(symbol))
+            path = timeframe_dir / f"{symbol}.parquet"
+            self._write_parquet(bars, path)
+            self._register(symbol, timeframe, self._gap_records(gaps))
+            return AppendResult(symbol, timeframe, len(bars), 0, bars.index.min(), bars.index.max(), gaps, path)
+
+        entry = self.coverage(symbol, timeframe)
+        last = pd.Timestamp(entry['last']) if entry.get('last') else None
+
+        # Match the stored schema (combined files carry a 'pair' column)
+        columns = entry['columns']
+        if 'pair' in columns and 'pair' not in bars.columns:
+            bars['pair'] = symbol
+        bars = bars.rename(columns={'volume': 'tick_volume'}) if 'tick_volume' in columns else bars
+        missing = [c for c in columns if c not in bars.columns]
+        if missing:
+            raise ValueError(f"Bars are missing columns of the stored {symbol} {timeframe} data: {missing}")
+        bars = bars[columns]
+
+        new = bars[bars.index > last] if last is not None else bars
+        gaps = find_gaps(new.index, timeframe, previous=last, calendar=calendar_for(symbol))
+        result = AppendResult(symbol, timeframe, len(new), len(bars) - len(new), gaps=gaps)
+        if new.empty:
+            return result
+
+        result.first, result.last = new.index[0], new.index[-1]
+        result.path = timeframe_dir / f"{symbol}{PARTS_SUFFIX}" / f"{result.first:%Y%m%dT%H%M%S}.parquet"
+        self._write_parquet(new, result.path)
+
+        self.catalog.record_part(symbol, timeframe, result.path, self._gap_records(gaps))
+
+        if gaps:
+            print(f"Warning: {symbol} {timeframe} append has {len(gaps)} gap(s), "
+                  f"{sum(g[2] for g in gaps)} missing bars (first after {gaps[0][0]})")
+        return result
+
+    def compact(self, symbol: str, timeframe: str = "M15") -> Path:
+        """Merge appended parts into the symbol's base file and remove them"""
+        return self.rewrite(symbol, timeframe, self.load(symbol, timeframe))
+
+    def rewrite(self, symbol: str, timeframe: str, df: pd.DataFrame) -> Path:
+        """
+        Replace a symbol's dataset (base file and parts) with df
+
+        Writes <TF>/<symbol>.parquet and records it with gaps recomputed
+        from df. Only per-symbol files under <TF>/ can be replaced.
+        """
+        path = self._data_file(symbol, timeframe)
+        if path is None or path.parent != self.data_path / timeframe:
+            raise ValueError(f"Rewriting needs a per-symbol file under {timeframe}/ for {symbol}")
+
+        target = path.with_name(f"{symbol}.parquet")
+        self._write_parquet(df, target)
+        if target != path:
+            path.unlink()
+        self._register(symbol, timeframe, self._gap_records(find_gaps(df.index, timeframe, calendar=calendar_for(symbol))))
+        return target
+
+    def _register(self, symbol: str, timeframe: str, gaps: List):
+        """register_dataset, then reload the catalog it updated"""
+        register_dataset(self.data_path, timeframe, symbol, gaps)
+        self.catalog = DataCatalog(self.data_path)
+
+    @staticmethod
+    def _gap_records(gaps: List[Tuple[pd.Timestamp, pd.Timestamp, int]]) -> List[List]:
+        return [[after.isoformat(), before.isoformat(), missing] for after, before, missing in gaps]
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, path: Path):
+        """Write atomically with the index as a timestamp column"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        df.rename_axis('timestamp').reset_index().to_parquet(tmp, index=False, compression='zstd')
+        os.replace(tmp, path)
+
     def load_multiple_timeframes(
         self,
         symbol: str,
@@ -157,37 +400,59 @@ class DataLoader:
 
         return data
 
+    def load_panel(
+        self,
+        symbols: List[str],
+        timeframe: str = "M15",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        fields: Tuple[str, ...] = FIELDS,
+        dtype=np.float64
+    ) -> Panel:
+        """
+        Load several symbols onto one timestamp axis
+
+        Args:
+            symbols: List of symbols
+            timeframe: Timeframe
+            start_date: Start date, optional
+            end_date: End date, optional
+            fields: Columns to align
+            dtype: Value dtype (float32 halves memory)
+
+        Returns:
+            Panel of (symbol, time, field) values with a presence mask
+        """
+        frames = self.load_multiple_symbols(symbols, timeframe, start_date, end_date)
+        return Panel.from_frames(frames, fields, timeframe, dtype)
+
     def list_available_timeframes(self) -> List[str]:
         """List all available timeframes"""
-        timeframes = []
-        for path in self.data_path.iterdir():
-            if path.is_dir():
-                timeframes.append(path.name)
-        return sorted(timeframes)
+        return self.catalog.timeframes()
 
     def list_available_symbols(self, timeframe: str = "M15") -> List[str]:
         """List all available symbols for a timeframe"""
-        tf_path = self.data_path / timeframe
-        if not tf_path.exists():
-            return []
-
-        symbols = []
-        for file_path in tf_path.glob("*.parquet"):
-            # Remove timeframe suffix if present (e.g., XAUUSD_M5 -> XAUUSD)
-            stem = file_path.stem
-            if stem.endswith(f"_{timeframe}"):
-                stem = stem[:-len(f"_{timeframe}")]
-            symbols.append(stem)
-        return sorted(set(symbols))  # Remove duplicates
+        return self.catalog.symbols(timeframe)
+
+    def feature_store(self) -> FeatureStore:
+        """Feature store persisting indicators alongside the bars"""
+        return FeatureStore(self.data_path / FEATURES_DIR)
 
     def get_date_range(
         self,
         symbol: str,
         timeframe: str = "M15"
     ) -> tuple[pd.Timestamp, pd.Timestamp]:
-        """Get the available date range for a symbol"""
-        df = self.load(symbol, timeframe)
-        return df.index.min(), df.index.max()
+        """
+        Get the available date range for a symbol
+
+        Answered from the catalog, without reading any bars.
+        """
+        if self._data_file(symbol, timeframe) is None:
+            raise FileNotFoundError(f"Data file not found for {symbol} {timeframe}")
+
+        entry = self.coverage(symbol, timeframe)
+        return pd.Timestamp(entry['first']), pd.Timestamp(entry['last'])
 
 
 def main():
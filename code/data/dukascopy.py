@@ -0,0 +1,324 @@
+"""
+Dukascopy Datafeed Downloader
+
+Concurrent, resumable download of Dukascopy minute candles:
+- Each instrument is split into month-sized jobs, run on a bounded
+  thread pool; a failed month is retried on its own instead of
+  re-downloading the whole range
+- A month job fetches the daily BID_candles_min_1.bi5 files (LZMA
+  compressed, 24-byte big-endian records), decodes them, resamples to
+  the target timeframe and writes one CSV per month
+- Completed months are checkpointed in download_manifest.json as they
+  finish; a re-run only fetches months missing from the manifest (or
+  whose CSV has gone). A 404 counts as a day without data, so a month
+  that has not ended yet (by the UTC date) is written but never
+  checkpointed: the next run fetches it again with the days published
+  since
+
+Month CSVs are written as <output>/<SYMBOL>/<SYMBOL>_<TF>_<YYYY-MM>.csv with
+columns timestamp (UTC, ISO 8601), open, high, low, close, volume.
+
+For offline runs, point base_url at data.dukascopy_mock.MockDatafeedServer.
+
+Example:
+    downloader = DukascopyDownloader(DATA_DIR, {'XAUUSD': {'dukascopy_symbol': 'xauusd', 'point': 1e3}})
+    results = downloader.run("2020-01-01", "2025-12-31")
+"""
+
+import json
+import lzma
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from data.data_loader import TIMEFRAME_MINUTES, resample_ohlcv
+from utils.reporting import Progress, get_logger, log_event
+
+
+DATAFEED_URL = "https://datafeed.dukascopy.com/datafeed"
+MANIFEST_FILE = "download_manifest.json"
+
+# Price scale: datafeed prices are integers in points
+DEFAULT_POINT = 1e5
+POINTS = {
+    'usdjpy': 1e3,
+    'xauusd': 1e3,
+    'btcusd': 1e1,
+}
+
+# One record: seconds from midnight, open, close, low, high (points), volume
+CANDLE_DTYPE = np.dtype([
+    ('seconds', '>i4'),
+    ('open', '>i4'),
+    ('close', '>i4'),
+    ('low', '>i4'),
+    ('high', '>i4'),
+    ('volume', '>f4'),
+])
+
+log = get_logger('dukascopy')
+
+
+@dataclass(frozen=True)
+class DownloadJob:
+    """One instrument-month"""
+    symbol: str
+    month: str          # YYYY-MM
+
+    @property
+    def key(self) -> str:
+        return f"{self.symbol}/{self.month}"
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        start = pd.Timestamp(f"{self.month}-01")
+        return pd.date_range(start, start + pd.offsets.MonthEnd(0), freq='D')
+
+
+def utc_today() -> pd.Timestamp:
+    """Current UTC day (naive midnight)"""
+    return pd.Timestamp.now(tz='UTC').normalize().tz_localize(None)
+
+
+def plan_jobs(symbols: List[str], start: str, end: str) -> List[DownloadJob]:
+    """Month jobs covering [start, end] for each symbol"""
+    months = pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq='M')
+    return [DownloadJob(symbol, str(month)) for symbol in symbols for month in months]
+
+
+def day_url(base_url: str, dukascopy_symbol: str, day: pd.Timestamp, side: str = "BID") -> str:
+    """Datafeed URL of one day of minute candles (months are zero-based)"""
+    return (f"{base_url.rstrip('/')}/{dukascopy_symbol.upper()}/"
+            f"{day.year:04d}/{day.month - 1:02d}/{day.day:02d}/{side}_candles_min_1.bi5")
+
+
+def decode_candles(payload: bytes, day: pd.Timestamp, point: float) -> pd.DataFrame:
+    """
+    Decode one day of bi5 minute candles
+
+    Args:
+        payload: Raw (LZMA compressed) file content; empty means no data
+        day: UTC day the file covers
+        point: Price scale (prices are integers in 1/point units)
+
+    Returns:
+        DataFrame with UTC timestamp index and open, high, low, close, volume
+    """
+    raw = lzma.decompress(payload) if payload else b""
+    records = np.frombuffer(raw, dtype=CANDLE_DTYPE)
+    index = pd.DatetimeIndex(
+        pd.Timestamp(day, tz='UTC') + pd.to_timedelta(records['seconds'].astype(np.int64), unit='s'),
+        name='timestamp'
+    )
+    return pd.DataFrame({
+        'open': records['open'] / point,
+        'high': records['high'] / point,
+        'low': records['low'] / point,
+        'close': records['close'] / point,
+        'volume': records['volume'].astype(float),
+    }, index=index)
+
+
+def resample_candles(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate minute candles; minutes without trading (zero volume) are dropped first"""
+    df = df[df['volume'] > 0]
+    if timeframe == 'M1' or df.empty:
+        return df
+    return resample_ohlcv(df, timeframe)
+
+
+class DownloadManifest:
+    """
+    download_manifest.json with per-month checkpoints
+
+    Keeps any other top-level keys (period, instruments, ...) intact and
+    stores completed jobs under 'chunks'. Thread-safe; every checkpoint is
+    written atomically so an interrupted run never corrupts it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.data = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.data = json.load(f)
+        self.data.setdefault('chunks', {})
+
+    @property
+    def chunks(self) -> Dict[str, Dict]:
+        return self.data['chunks']
+
+    def is_complete(self, key: str, directory: Path) -> bool:
+        """Checkpointed and the file is still there"""
+        entry = self.chunks.get(key)
+        return entry is not None and (directory / entry['file']).exists()
+
+    def mark_complete(self, key: str, info: Dict):
+        with self._lock:
+            self.chunks[key] = info
+            self._save()
+
+    def update(self, **fields):
+        with self._lock:
+            self.data.update(fields)
+            self._save()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class DukascopyDownloader:
+    """Month-chunked, concurrent, resumable datafeed downloader"""
+
+    def __init__(
+        self,
+        output_dir: str,
+        instruments: Dict[str, Dict],
+        base_url: str = DATAFEED_URL,
+        timeframe: str = "M5",
+        workers: int = 4,
+        retries: int = 3,
+        timeout: float = 30.0,
+        backoff: float = 1.0
+    ):
+        """
+        Args:
+            output_dir: Directory for month CSVs and the manifest
+            instruments: Symbol -> {'dukascopy_symbol': ..., 'point': optional price scale}
+            base_url: Datafeed root (a MockDatafeedServer URL for offline runs)
+            timeframe: Output timeframe (M1 ... D1)
+            workers: Concurrent month jobs
+            retries: Attempts per file after the first failure
+            timeout: Seconds per HTTP request
+            backoff: Base delay between attempts in seconds (doubles each retry)
+        """
+        if timeframe not in TIMEFRAME_MINUTES:
+            raise ValueError(f"Unknown timeframe: {timeframe}. Available: {list(TIMEFRAME_MINUTES)}")
+
+        self.output_dir = Path(output_dir)
+        self.instruments = instruments
+        self.base_url = base_url
+        self.timeframe = timeframe
+        self.workers = workers
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.manifest = DownloadManifest(self.output_dir / MANIFEST_FILE)
+
+    def pending(self, jobs: List[DownloadJob]) -> List[DownloadJob]:
+        """Jobs not yet checkpointed"""
+        return [job for job in jobs if not self.manifest.is_complete(job.key, self.output_dir)]
+
+    def run(self, start: str, end: str, symbols: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Download every missing month in [start, end]
+
+        Args:
+            start: First day (YYYY-MM-DD)
+            end: Last day (YYYY-MM-DD)
+            symbols: Subset of instruments (default: all)
+
+        Returns:
+            Dict mapping job key to None on success or the error message
+        """
+        jobs = plan_jobs(list(symbols or self.instruments), start, end)
+        todo = self.pending(jobs)
+        log_event(log, 'download_start',
+                  f"{len(jobs)} month jobs, {len(jobs) - len(todo)} already complete, "
+                  f"{len(todo)} to download with {self.workers} workers",
+                  jobs=len(jobs), pending=len(todo), workers=self.workers)
+
+        self.manifest.update(
+            period=f"{start} to {end}",
+            source="Dukascopy Bank SA",
+            base_url=self.base_url,
+            timeframe=self.timeframe,
+        )
+
+        results = {}
+        progress = Progress(log, len(todo), label="download", unit="months")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.download_month, job): job for job in todo}
+            for done, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    info = future.result()
+                    results[job.key] = None
+                    log.debug(f"  {job.key}: {info['rows']:,} bars")
+                except Exception as e:
+                    results[job.key] = str(e)
+                    log_event(log, 'download_failed', f"[ERROR] {job.key}: {e}",
+                              level=40, job=job.key, error=str(e))
+                progress.update(done)
+        progress.finish()
+
+        failed = sum(error is not None for error in results.values())
+        log_event(log, 'download_complete',
+                  f"Downloaded {len(todo) - failed}/{len(todo)} months ({failed} failed)",
+                  downloaded=len(todo) - failed, failed=failed)
+        return results
+
+    def download_month(self, job: DownloadJob) -> Dict:
+        """Fetch, decode and write one month; checkpoints it in the manifest once the month has ended"""
+        spec = self.instruments[job.symbol]
+        dukascopy_symbol = spec.get('dukascopy_symbol', job.symbol.lower())
+        point = spec.get('point', POINTS.get(dukascopy_symbol, DEFAULT_POINT))
+
+        # Days after today are not published yet; the month stays open until it has ended
+        today = utc_today()
+        days = []
+        for day in job.days[job.days <= today]:
+            payload = self._fetch(day_url(self.base_url, dukascopy_symbol, day))
+            days.append(decode_candles(payload, day, point))
+        candles = pd.concat(days) if days else pd.DataFrame()
+        bars = resample_candles(candles, self.timeframe)
+
+        relative = Path(job.symbol) / f"{job.symbol}_{self.timeframe}_{job.month}.csv"
+        path = self.output_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        bars.to_csv(tmp, date_format='%Y-%m-%dT%H:%M:%SZ')
+        os.replace(tmp, path)
+
+        info = {
+            'file': relative.as_posix(),
+            'rows': len(bars),
+            'first': bars.index[0].isoformat() if len(bars) else None,
+            'last': bars.index[-1].isoformat() if len(bars) else None,
+            'completed': datetime.now().isoformat(timespec='seconds'),
+        }
+        if job.days[-1] < today:
+            self.manifest.mark_complete(job.key, info)
+        return info
+
+    def _fetch(self, url: str) -> bytes:
+        """GET with retries; a 404 means no data for that day"""
+        for attempt in range(self.retries + 1):
+            try:
+                with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                    return response.read()
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    return b""
+                error = e
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                error = e
+
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+
+        raise IOError(f"{url}: {error}")
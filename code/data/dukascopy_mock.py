@@ -0,0 +1,155 @@
+"""
+Local Dukascopy Datafeed Stand-in
+
+An HTTP server on localhost that answers datafeed URLs
+(<SYMBOL>/<YYYY>/<MM>/<DD>/BID_candles_min_1.bi5) with bi5 files encoded
+from deterministic synthetic minute bars, so the downloader can be run
+and exercised offline:
+- Every day has 1440 records; closed minutes (weekends) are flat with
+  zero volume, as in the real feed
+- fail_every=n answers every n-th request with HTTP 500 to exercise
+  retries; missing_symbols answer 404
+- requests lists the served paths, e.g. to confirm a resumed run only
+  fetched the missing months
+
+Example:
+    with MockDatafeedServer({'XAUUSD': 1800.0}, start="2024-01-01", end="2024-03-31") as server:
+        DukascopyDownloader(tmp, instruments, base_url=server.url).run("2024-01-01", "2024-03-31")
+"""
+
+import lzma
+import re
+import threading
+import numpy as np
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from data.dukascopy import CANDLE_DTYPE, DEFAULT_POINT, POINTS
+from data.synthetic import SyntheticConfig, generate_ohlcv
+
+
+_PATH = re.compile(r"^/(?P<symbol>[A-Z0-9]+)/(?P<year>\d{4})/(?P<month>\d{2})/(?P<day>\d{2})/BID_candles_min_1\.bi5$")
+
+
+def encode_candles(bars: pd.DataFrame, day: pd.Timestamp, point: float) -> bytes:
+    """
+    Encode one UTC day of minute bars as a bi5 file
+
+    Minutes without a bar become flat zero-volume records at the last
+    close, so the file always holds 1440 records.
+    """
+    minutes = pd.date_range(day, periods=1440, freq='1min')
+    bars = bars.reindex(minutes)
+    last_close = bars['close'].ffill().bfill()
+    closed = bars['open'].isna()
+
+    records = np.zeros(1440, dtype=CANDLE_DTYPE)
+    records['seconds'] = np.arange(1440) * 60
+    for column in ('open', 'close', 'low', 'high'):
+        values = bars[column].where(~closed, last_close).fillna(0.0)
+        records[column] = np.round(values.to_numpy() * point).astype(np.int64)
+    records['volume'] = bars['volume'].fillna(0.0).to_numpy()
+
+    return lzma.compress(records.tobytes(), format=lzma.FORMAT_ALONE)
+
+
+class MockDatafeedServer:
+    """Threaded localhost datafeed serving synthetic minute candles"""
+
+    def __init__(
+        self,
+        symbols: Dict[str, float],
+        start: str = "2024-01-01",
+        end: str = "2024-12-31",
+        seed: int = 42,
+        fail_every: int = 0,
+        missing_symbols: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            symbols: Symbol -> starting price (price scale as in data.dukascopy.POINTS)
+            start, end: Date range with data; other days answer 404
+            seed: Seed of the synthetic series
+            fail_every: Answer every n-th request with HTTP 500 (0: never)
+            missing_symbols: Symbols answering 404 for every day
+        """
+        self.symbols = {symbol.upper(): price for symbol, price in symbols.items()}
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+        self.seed = seed
+        self.fail_every = fail_every
+        self.missing_symbols = {s.upper() for s in (missing_symbols or [])}
+        self.requests: List[str] = []
+        self._series: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def series(self, symbol: str) -> pd.DataFrame:
+        """The synthetic minute bars served for symbol (generated on first use)"""
+        with self._lock:
+            if symbol not in self._series:
+                minutes = int((self.end + pd.Timedelta(days=1) - self.start) / pd.Timedelta(minutes=1))
+                config = SyntheticConfig(price=self.symbols[symbol])
+                seed = self.seed + sum(map(ord, symbol))
+                bars = generate_ohlcv(minutes, "M1", seed=seed, start=str(self.start.date()), config=config)
+                self._series[symbol] = bars[bars.index < self.end + pd.Timedelta(days=1)]
+            return self._series[symbol]
+
+    def respond(self, path: str):
+        """(status, body) for a request path"""
+        with self._lock:
+            self.requests.append(path)
+            n_request = len(self.requests)
+
+        if self.fail_every and n_request % self.fail_every == 0:
+            return 500, b""
+
+        match = _PATH.match(path)
+        if not match or match['symbol'] not in self.symbols or match['symbol'] in self.missing_symbols:
+            return 404, b""
+
+        day = pd.Timestamp(int(match['year']), int(match['month']) + 1, int(match['day']))
+        if not self.start <= day <= self.end:
+            return 404, b""
+
+        bars = self.series(match['symbol'])
+        bars = bars[(bars.index >= day) & (bars.index < day + pd.Timedelta(days=1))]
+        return 200, encode_candles(bars, day, POINTS.get(match['symbol'].lower(), DEFAULT_POINT))
+
+    def start_server(self) -> "MockDatafeedServer":
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = mock.respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockDatafeedServer":
+        return self.start_server()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,278 @@
+"""
+Feature Store
+
+Computes each indicator once per dataset and shares it between components,
+so the same ATR is not rebuilt by the detector, the trend analyzer and every
+notebook that needs it.
+
+Features are keyed by (symbol, timeframe, feature, compute, params), where
+compute is the caller's function (by qualified name), so two components
+that name a feature alike but compute it differently never share values.
+With a root directory they are also persisted as Parquet next to the bars:
+
+    <root>/<timeframe>/<symbol>/_bars.json            fingerprint of the bars
+    <root>/<timeframe>/<symbol>/atr@average_true_range__period=14.parquet
+
+and reused for as long as the bars are unchanged (a changed fingerprint
+discards that dataset's files).
+
+Components take an optional duck-typed `feature_store` argument - a
+FeatureView, or anything with the same get() - and pass their own compute
+function, which only runs on a cache miss. This keeps detector.py,
+time_filter.py and trend_analyzer.py importable on their own; there are
+no built-in features.
+
+Example:
+    store = FeatureStore(root='data/raw/combined_2020_2025/features')
+    m5 = store.dataset('XAUUSD', 'M5', df_m5)
+    atr = m5.get('atr', df_m5, average_true_range, period=14)     # zones.detector's ATR
+    zones = ZoneDetector().detect_zones(df_m5, feature_store=m5)  # reuses it
+"""
+
+import hashlib
+import json
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+Feature = Union[pd.Series, pd.DataFrame]
+
+# Column holding a Series feature in its Parquet file
+SERIES_COLUMN = '__series__'
+
+
+class FeatureView:
+    """Features of one registered dataset (what components receive)"""
+
+    def __init__(self, store: 'FeatureStore', symbol: str, timeframe: str):
+        self.store = store
+        self.symbol = symbol
+        self.timeframe = timeframe
+
+    @property
+    def bars(self) -> pd.DataFrame:
+        return self.store.bars(self.symbol, self.timeframe)
+
+    def get(
+        self,
+        feature: str,
+        df: Optional[pd.DataFrame],
+        compute: Callable[..., Feature],
+        **params
+    ) -> Feature:
+        """
+        Feature values, computed over the whole dataset on first use
+
+        Args:
+            feature: Feature name (e.g. 'atr')
+            df: Frame to align to; None means the registered bars. A
+                contiguous run of the bars (e.g. df.head(n)) gets the matching
+                rows; any other frame is computed directly and not cached
+            compute: fn(bars, **params) used on a cache miss (part of the
+                     cache key, by qualified name)
+            **params: Feature parameters (part of the cache key)
+
+        Returns:
+            Series or DataFrame indexed like df
+        """
+        bars = self.bars
+        if df is None or df.index is bars.index:
+            return self.store.get(self.symbol, self.timeframe, feature, compute, **params)
+
+        rows = _contiguous_rows(bars.index, df.index)
+        if rows is None:
+            return compute(df, **params)
+
+        values = self.store.get(self.symbol, self.timeframe, feature, compute, **params)
+        if rows.start == 0 and rows.stop == len(bars):
+            return values
+        return values.iloc[rows].set_axis(df.index)
+
+    def __repr__(self) -> str:
+        return f"FeatureView({self.symbol} {self.timeframe}, {len(self.bars):,} bars)"
+
+
+class FeatureStore:
+    """Indicators keyed by (symbol, timeframe, feature, compute, params)"""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Directory to persist features in; None keeps them in memory
+        """
+        self.root = Path(root) if root is not None else None
+        self._bars: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._fingerprints: Dict[Tuple[str, str], str] = {}
+        self._cache: Dict[Tuple, Feature] = {}
+
+    def dataset(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> FeatureView:
+        """
+        Register the bars of a dataset
+
+        Re-registering different bars under the same symbol and timeframe
+        drops every feature computed from the old ones.
+
+        Args:
+            symbol: Symbol name (e.g. "XAUUSD")
+            timeframe: Timeframe (e.g. "M5")
+            bars: OHLC(V) DataFrame with timestamp index
+
+        Returns:
+            FeatureView for the dataset
+        """
+        key = (symbol, timeframe)
+        if self._bars.get(key) is not bars:
+            fingerprint = _fingerprint(bars)
+            if self._fingerprints.get(key) != fingerprint:
+                self._cache = {k: v for k, v in self._cache.items() if k[:2] != key}
+                self._fingerprints[key] = fingerprint
+                if self.root is not None:
+                    self._sync_directory(symbol, timeframe, bars, fingerprint)
+            self._bars[key] = bars
+
+        return FeatureView(self, symbol, timeframe)
+
+    def bars(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """Registered bars of a dataset"""
+        try:
+            return self._bars[(symbol, timeframe)]
+        except KeyError:
+            raise KeyError(f"Dataset {symbol} {timeframe} is not registered; call dataset() first") from None
+
+    def get(
+        self,
+        symbol: str,
+        timeframe: str,
+        feature: str,
+        compute: Callable[..., Feature],
+        **params
+    ) -> Feature:
+        """
+        Feature over the whole dataset (memory, then disk, then computed)
+
+        Args:
+            symbol: Symbol name
+            timeframe: Timeframe
+            feature: Feature name
+            compute: fn(bars, **params), keyed by its qualified name
+            **params: Feature parameters
+
+        Returns:
+            Series or DataFrame indexed like the registered bars
+        """
+        bars = self.bars(symbol, timeframe)
+        key = (symbol, timeframe, feature, _compute_name(compute), _params_key(params))
+
+        values = self._cache.get(key)
+        if values is None:
+            values = self._load(key, bars)
+            if values is None:
+                values = compute(bars, **params)
+                self._save(key, values)
+            self._cache[key] = values
+
+        return values
+
+    def keys(self):
+        """Cached (symbol, timeframe, feature, compute, params) keys"""
+        return list(self._cache)
+
+    def clear(self):
+        """Drop in-memory features (persisted files are kept)"""
+        self._cache = {}
+
+    def memory_usage(self) -> int:
+        """Bytes held by cached features"""
+        return sum(int(np.sum(v.memory_usage(index=False))) for v in self._cache.values())
+
+    def _directory(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / symbol
+
+    def _path(self, key: Tuple) -> Path:
+        symbol, timeframe, feature, compute, params = key
+        name = f"{feature}@{compute}" + ''.join(f"__{k}={_token(v)}" for k, v in params)
+        return self._directory(symbol, timeframe) / f"{name}.parquet"
+
+    def _sync_directory(self, symbol: str, timeframe: str, bars: pd.DataFrame, fingerprint: str):
+        """Discard persisted features computed from different bars"""
+        directory = self._directory(symbol, timeframe)
+        meta_path = directory / '_bars.json'
+
+        if meta_path.exists():
+            with open(meta_path) as f:
+                if json.load(f).get('fingerprint') == fingerprint:
+                    return
+            for path in directory.glob('*.parquet'):
+                path.unlink()
+
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(meta_path, 'w') as f:
+            json.dump({
+                'fingerprint': fingerprint,
+                'bars': len(bars),
+                'start': str(bars.index[0]) if len(bars) else None,
+                'end': str(bars.index[-1]) if len(bars) else None,
+            }, f, indent=2)
+
+    def _load(self, key: Tuple, bars: pd.DataFrame) -> Optional[Feature]:
+        if self.root is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        values = pd.read_parquet(path)
+        if len(values) != len(bars):
+            return None
+        values.index = bars.index
+        if list(values.columns) == [SERIES_COLUMN]:
+            return values[SERIES_COLUMN].rename(None)
+        return values
+
+    def _save(self, key: Tuple, values: Feature):
+        if self.root is None:
+            return
+        frame = values.to_frame(SERIES_COLUMN) if isinstance(values, pd.Series) else values
+        frame.to_parquet(self._path(key))
+
+
+def _compute_name(compute: Callable) -> str:
+    """Qualified name of a compute function as a file-name token (e.g. 'ZoneDetector._add_atr.locals.compute')"""
+    if compute is None:
+        raise TypeError("FeatureStore.get() needs a compute function; there are no built-in features")
+    name = getattr(compute, '__qualname__', type(compute).__qualname__)
+    return re.sub(r'[^\w.-]', '', name)
+
+
+def _contiguous_rows(bars_index: pd.Index, index: pd.Index) -> Optional[slice]:
+    """Rows of bars_index that index covers, if it is a contiguous run of them"""
+    if len(index) == 0 or len(index) > len(bars_index):
+        return None
+    start = int(bars_index.searchsorted(index[0]))
+    rows = slice(start, start + len(index))
+    return rows if bars_index[rows].equals(index) else None
+
+
+def _fingerprint(bars: pd.DataFrame) -> str:
+    """Hash of the timestamps and OHLCV values"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(bars.index.asi8 if isinstance(bars.index, pd.DatetimeIndex)
+                                       else bars.index.to_numpy()).tobytes())
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        if column in bars.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(bars[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def _params_key(params: Dict) -> Tuple:
+    return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()))
+
+
+def _token(value) -> str:
+    """Parameter value as a file-name token"""
+    if isinstance(value, tuple):
+        return '-'.join(_token(v) for v in value)
+    return str(value)
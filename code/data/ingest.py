@@ -0,0 +1,458 @@
+"""
+CSV to Parquet Ingestion
+
+Turns downloaded Dukascopy CSVs (data/raw/dukascopy) into the Parquet
+layout DataLoader.load reads (<output>/<TF>/<symbol>.parquet):
+- CSVs are read in chunks with typed columns (float64 OHLCV); timestamps
+  may be ISO 8601 strings or epoch milliseconds
+- Timestamps are normalized to UTC (naive strings are taken in
+  source_tz) and stored tz-naive, like the rest of the data;
+  tick_volume is renamed to volume
+- Rows are spilled into month buckets, then each month is sorted,
+  de-duplicated (the last occurrence of a timestamp wins) and appended in
+  order, so memory stays at one chunk plus one month regardless of file
+  size or input order
+- Output is zstd-compressed Parquet with fixed-size row groups, plus
+  optional higher-timeframe resamples (e.g. H1 for the backtest engine)
+- Each file is recorded in the data root's catalog (_catalog.json) with
+  its date range, row count and gaps; later bars can be added with
+  DataLoader.append()
+- Tick CSVs (<SYMBOL>_TICK_*.csv: timestamp, bid, ask and optional
+  bid_volume, ask_volume) go to the tick store instead (<output>/ticks,
+  see data.ticks), from which DataLoader builds bars of any timeframe
+
+Usage (from the code/ directory):
+    python -m data.ingest                          # every symbol in data/raw/dukascopy
+    python -m data.ingest --symbols XAUUSD --resample H1 H4
+    python -m data.ingest --append                 # add the latest downloads only
+    python -m data.ingest --ticks --symbols EURUSD # tick CSVs into the tick store
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from data.data_loader import (
+    TIMEFRAME_MINUTES, AppendResult, DataLoader, find_gaps, register_dataset, resample_ohlcv
+)
+from data.catalog import TICKS_DIR
+from data.sessions import calendar_for
+from data.ticks import TickStore
+from utils.reporting import get_logger, log_event
+
+
+CHUNK_SIZE = 500_000        # CSV rows parsed at a time
+ROW_GROUP_SIZE = 100_000    # Rows per Parquet row group
+COMPRESSION = "zstd"
+
+SOURCE_DIR = Path(__file__).parent / "raw" / "dukascopy"
+OUTPUT_DIR = Path(__file__).parent / "raw" / "combined_2020_2025"    # DataLoader's default path
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+TIME_COLUMNS = ('timestamp', 'time', 'datetime', 'date')
+COLUMN_ALIASES = {'tick_volume': 'volume'}
+
+TICK_TIMEFRAME = "TICK"     # File name tag of tick CSVs (<SYMBOL>_TICK_*.csv)
+TICKS = ['bid', 'ask', 'bid_volume', 'ask_volume']
+TICK_ALIASES = {'bidprice': 'bid', 'askprice': 'ask', 'bidvolume': 'bid_volume', 'askvolume': 'ask_volume'}
+
+log = get_logger('ingest')
+
+
+class ParquetAppender:
+    """
+    Appends DataFrames to one Parquet file in fixed-size row groups
+
+    The index is written as a column. The file is built under a temporary
+    name and moved into place by close(), so readers never see a partial
+    file.
+    """
+
+    def __init__(self, path: Path, row_group_size: int = ROW_GROUP_SIZE, compression: str = COMPRESSION):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.rows = 0
+        self.first = None       # First and last index value written
+        self.last = None
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._writer = None
+        self._buffer: List[pd.DataFrame] = []
+        self._buffered = 0
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        if self.first is None:
+            self.first = df.index[0]
+        self.last = df.index[-1]
+        self._buffer.append(df)
+        self._buffered += len(df)
+        if self._buffered >= self.row_group_size:
+            self._flush(final=False)
+
+    def _flush(self, final: bool):
+        if not self._buffer:
+            return
+        data = pd.concat(self._buffer)
+        cut = len(data) if final else len(data) - len(data) % self.row_group_size
+        if cut:
+            table = pa.Table.from_pandas(data.iloc[:cut].reset_index(), preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._tmp, table.schema, compression=self.compression)
+            self._writer.write_table(table, row_group_size=self.row_group_size)
+            self.rows += cut
+        rest = data.iloc[cut:]
+        self._buffer = [rest] if len(rest) else []
+        self._buffered = len(rest)
+
+    def close(self):
+        """Write the remaining rows and move the file into place"""
+        self._flush(final=True)
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Discard the partial file"""
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+def _parse_timestamps(values: pd.Series, source_tz: str) -> pd.DatetimeIndex:
+    """Epoch milliseconds or date strings -> tz-naive UTC"""
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.DatetimeIndex(pd.to_datetime(values.to_numpy(dtype=np.int64), unit='ms'))
+
+    times = pd.DatetimeIndex(pd.to_datetime(values, format='ISO8601'))
+    if times.tz is None:
+        times = times.tz_localize(source_tz)
+    return times.tz_convert('UTC').tz_localize(None)
+
+
+def read_csv_chunks(
+    path: Path,
+    chunk_size: int = CHUNK_SIZE,
+    source_tz: str = "UTC"
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a bar CSV as normalized chunks
+
+    Yields:
+        DataFrames with a tz-naive UTC 'timestamp' index and float64
+        open, high, low, close, volume (0.0 when the file has no volume)
+    """
+    header = pd.read_csv(path, nrows=0)
+    columns = {c: COLUMN_ALIASES.get(c.strip().lower(), c.strip().lower()) for c in header.columns}
+    time_column = next((c for c, name in columns.items() if name in TIME_COLUMNS), None)
+    if time_column is None:
+        raise ValueError(f"{path}: no timestamp column (expected one of {TIME_COLUMNS})")
+
+    dtypes = {c: 'float64' for c, name in columns.items() if name in OHLCV}
+    missing = [name for name in OHLCV[:4] if name not in columns.values()]
+    if missing:
+        raise ValueError(f"{path}: missing required columns {missing}")
+
+    for chunk in pd.read_csv(path, usecols=[time_column, *dtypes], dtype=dtypes, chunksize=chunk_size):
+        chunk = chunk.rename(columns=columns)
+        index = _parse_timestamps(chunk.pop(columns[time_column]), source_tz)
+        chunk.index = index.rename('timestamp')
+        if 'volume' not in chunk:
+            chunk['volume'] = 0.0
+        yield chunk[OHLCV]
+
+
+def read_tick_csv_chunks(
+    path: Path,
+    chunk_size: int = CHUNK_SIZE,
+    source_tz: str = "UTC"
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a tick CSV as normalized chunks
+
+    Yields:
+        DataFrames with a tz-naive UTC 'timestamp' index, float64 bid, ask
+        and the bid_volume / ask_volume columns the file has
+    """
+    header = pd.read_csv(path, nrows=0)
+    columns = {c: TICK_ALIASES.get(c.strip().lower(), c.strip().lower()) for c in header.columns}
+    time_column = next((c for c, name in columns.items() if name in TIME_COLUMNS), None)
+    if time_column is None:
+        raise ValueError(f"{path}: no timestamp column (expected one of {TIME_COLUMNS})")
+
+    dtypes = {c: 'float64' for c, name in columns.items() if name in TICKS}
+    missing = [name for name in TICKS[:2] if name not in columns.values()]
+    if missing:
+        raise ValueError(f"{path}: missing required columns {missing}")
+
+    for chunk in pd.read_csv(path, usecols=[time_column, *dtypes], dtype=dtypes, chunksize=chunk_size):
+        chunk = chunk.rename(columns=columns)
+        index = _parse_timestamps(chunk.pop(columns[time_column]), source_tz)
+        chunk.index = index.rename('timestamp')
+        yield chunk[[name for name in TICKS if name in chunk.columns]]
+
+
+def ingest_csv(
+    files: Sequence[Path],
+    output_root: Path,
+    symbol: str,
+    timeframe: str = "M5",
+    resample_to: Sequence[str] = ("H1",),
+    chunk_size: int = CHUNK_SIZE,
+    row_group_size: int = ROW_GROUP_SIZE,
+    compression: str = COMPRESSION,
+    source_tz: str = "UTC",
+    spill_dir: Optional[Path] = None
+) -> Dict[str, int]:
+    """
+    Ingest one symbol's CSVs into <output_root>/<TF>/<symbol>.parquet
+
+    Args:
+        files: CSVs in priority order (for duplicate timestamps the later file wins)
+        output_root: DataLoader data path
+        symbol: Symbol name for the output files
+        timeframe: Timeframe of the CSV bars
+        resample_to: Higher timeframes to derive
+        chunk_size: CSV rows parsed at a time
+        row_group_size: Rows per Parquet row group
+        compression: Parquet codec
+        source_tz: Timezone of naive timestamp strings
+        spill_dir: Directory for month buckets (default: system temp)
+
+    Returns:
+        Dict mapping timeframe to rows written
+    """
+    for tf in resample_to:
+        if TIMEFRAME_MINUTES.get(tf, 0) <= TIMEFRAME_MINUTES[timeframe]:
+            raise ValueError(f"Cannot resample {timeframe} to {tf}")
+
+    output_root = Path(output_root)
+    sinks = {
+        tf: ParquetAppender(output_root / tf / f"{symbol}.parquet", row_group_size, compression)
+        for tf in (timeframe, *resample_to)
+    }
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+        spill = Path(tmp)
+        rows_read = 0
+
+        # Pass 1: spill rows into month buckets, tagged with their input order
+        for path in files:
+            for chunk in read_csv_chunks(path, chunk_size, source_tz):
+                chunk['seq'] = np.arange(rows_read, rows_read + len(chunk), dtype=np.int64)
+                rows_read += len(chunk)
+                month = chunk.index.year * 100 + chunk.index.month
+                for key in np.unique(month):
+                    part = spill / str(key)
+                    part.mkdir(exist_ok=True)
+                    chunk[month == key].to_parquet(part / f"{rows_read}.parquet")
+
+        # Pass 2: months in order; sort, de-duplicate, append
+        gaps = []
+        calendar = calendar_for(symbol)
+        try:
+            for month in sorted(spill.iterdir(), key=lambda p: int(p.name)):
+                bars = pd.read_parquet(month).sort_values(['timestamp', 'seq'], kind='stable')
+                bars = bars[~bars.index.duplicated(keep='last')].drop(columns='seq')
+                gaps += find_gaps(bars.index, timeframe, previous=sinks[timeframe].last, calendar=calendar)
+                sinks[timeframe].write(bars)
+                for tf in resample_to:
+                    sinks[tf].write(resample_ohlcv(bars, tf))
+        except BaseException:
+            for sink in sinks.values():
+                sink.abort()
+            raise
+
+    for tf, sink in sinks.items():
+        sink.close()
+        register_dataset(output_root, tf, symbol,
+                         [[a.isoformat(), b.isoformat(), n] for a, b, n in gaps] if tf == timeframe else [])
+
+    written = {tf: sink.rows for tf, sink in sinks.items()}
+    log_event(log, 'ingest_symbol',
+              f"  {symbol}: {rows_read:,} CSV rows -> {written[timeframe]:,} {timeframe} bars"
+              f" ({rows_read - written[timeframe]:,} duplicates dropped, {len(gaps)} gaps)",
+              symbol=symbol, rows_read=rows_read, written=written, gaps=len(gaps))
+    return written
+
+
+def append_csv(
+    files: Sequence[Path],
+    output_root: Path,
+    symbol: str,
+    timeframe: str = "M5",
+    resample_to: Sequence[str] = ("H1",),
+    source_tz: str = "UTC"
+) -> Dict[str, AppendResult]:
+    """
+    Append newly downloaded CSVs (e.g. the latest month) to an ingested symbol
+
+    Only bars after the stored last timestamp are written, as one new part
+    file per timeframe (see DataLoader.append). The new bars are held in
+    memory, so this is meant for incremental updates, not full histories.
+
+    Returns:
+        Dict mapping timeframe to AppendResult
+    """
+    bars = pd.concat([chunk for path in files for chunk in read_csv_chunks(path, source_tz=source_tz)])
+    loader = DataLoader(output_root)
+
+    results = {timeframe: loader.append(symbol, timeframe, bars)}
+    for tf in resample_to:
+        results[tf] = loader.append(symbol, tf, resample_ohlcv(bars.sort_index(), tf))
+
+    base = results[timeframe]
+    log_event(log, 'append_symbol',
+              f"  {symbol}: {base.rows_appended:,} new {timeframe} bars "
+              f"({base.rows_overlapping:,} already stored, {len(base.gaps)} gaps)",
+              symbol=symbol, appended=base.rows_appended, overlapping=base.rows_overlapping, gaps=len(base.gaps))
+    return results
+
+
+def ingest_ticks(
+    files: Sequence[Path],
+    output_root: Path,
+    symbol: str,
+    chunk_size: int = CHUNK_SIZE,
+    source_tz: str = "UTC",
+    spill_dir: Optional[Path] = None
+) -> int:
+    """
+    Ingest one symbol's tick CSVs into the tick store (<output_root>/ticks)
+
+    Rows are spilled into month buckets like ingest_csv(), then each month
+    is sorted (ties keep file order) and written over the stored ticks of
+    the span it covers, so re-running with the latest files appends.
+
+    Returns:
+        Ticks written
+    """
+    store = TickStore(Path(output_root) / TICKS_DIR)
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+        spill = Path(tmp)
+        rows_read = 0
+
+        for path in files:
+            for chunk in read_tick_csv_chunks(path, chunk_size, source_tz):
+                chunk['seq'] = np.arange(rows_read, rows_read + len(chunk), dtype=np.int64)
+                rows_read += len(chunk)
+                month = chunk.index.year * 100 + chunk.index.month
+                for key in np.unique(month):
+                    part = spill / str(key)
+                    part.mkdir(exist_ok=True)
+                    chunk[month == key].to_parquet(part / f"{rows_read}.parquet")
+
+        written = 0
+        for month in sorted(spill.iterdir(), key=lambda p: int(p.name)):
+            ticks = pd.read_parquet(month).sort_values(['timestamp', 'seq'], kind='stable')
+            written += store.write(symbol, ticks.drop(columns='seq'))
+
+    log_event(log, 'ingest_ticks', f"  {symbol}: {written:,} ticks -> {store.root / symbol}",
+              symbol=symbol, ticks=written)
+    return written
+
+
+def find_csv_files(source_dir: Path, symbol: str, timeframe: str = "M5") -> List[Path]:
+    """
+    CSVs for a symbol in download order
+
+    Finds month files from data.dukascopy (<SYMBOL>/<SYMBOL>_<TF>_<YYYY-MM>.csv)
+    and single-range files (<SYMBOL>_<TF>_<start>_<end>.csv) in the root.
+    """
+    source_dir = Path(source_dir)
+    pattern = re.compile(rf"^{re.escape(symbol)}_{timeframe}_.*\.csv$", re.IGNORECASE)
+    files = [p for p in source_dir.glob("*.csv") if pattern.match(p.name)]
+    if (source_dir / symbol).is_dir():
+        files += [p for p in (source_dir / symbol).glob("*.csv") if pattern.match(p.name)]
+    return sorted(files, key=lambda p: p.name)
+
+
+def ingest_directory(
+    source_dir: Path = SOURCE_DIR,
+    output_root: Path = OUTPUT_DIR,
+    symbols: Optional[Sequence[str]] = None,
+    timeframe: str = "M5",
+    resample_to: Sequence[str] = ("H1",),
+    append: bool = False,
+    ticks: bool = False,
+    **kwargs
+) -> Dict[str, Dict]:
+    """
+    Ingest every symbol found in a download directory
+
+    Args:
+        source_dir: Download directory
+        output_root: DataLoader data path
+        symbols: Subset (default: symbols with CSVs in source_dir)
+        timeframe, resample_to, **kwargs: As for ingest_csv() / append_csv()
+        append: Append bars newer than the stored data instead of rewriting
+        ticks: Ingest tick CSVs into the tick store (timeframe and resample_to are ignored)
+
+    Returns:
+        Dict mapping symbol to rows written (or AppendResult) per timeframe,
+        or to ticks written
+    """
+    source_dir = Path(source_dir)
+    if ticks:
+        timeframe = TICK_TIMEFRAME
+    if symbols is None:
+        names = [p.name for p in source_dir.glob("*.csv")]
+        names += [p.name for p in source_dir.glob("*/*.csv")]
+        symbols = sorted({m.group(1) for n in names if (m := re.match(rf"^([A-Za-z0-9]+)_{timeframe}_", n))})
+
+    log_event(log, 'ingest_start', f"Ingesting {len(symbols)} symbols from {source_dir} into {output_root}",
+              symbols=list(symbols), source=str(source_dir), output=str(output_root))
+
+    results = {}
+    for symbol in symbols:
+        files = find_csv_files(source_dir, symbol, timeframe)
+        if not files:
+            log.warning(f"Warning: no {timeframe} CSVs for {symbol} in {source_dir}")
+            continue
+        if ticks:
+            results[symbol] = ingest_ticks(files, output_root, symbol, **kwargs)
+            continue
+        ingest = append_csv if append else ingest_csv
+        results[symbol] = ingest(files, output_root, symbol, timeframe, resample_to, **kwargs)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert downloaded CSVs to DataLoader Parquet files")
+    parser.add_argument('--source', type=Path, default=SOURCE_DIR, help="Download directory")
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR, help="DataLoader data path")
+    parser.add_argument('--symbols', nargs='+', default=None, help="Symbols (default: all found)")
+    parser.add_argument('--timeframe', default="M5", choices=list(TIMEFRAME_MINUTES), help="CSV timeframe")
+    parser.add_argument('--resample', nargs='*', default=["H1"], help="Higher timeframes to derive")
+    parser.add_argument('--source-tz', default="UTC", help="Timezone of naive timestamps")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="CSV rows per chunk")
+    parser.add_argument('--append', action='store_true', help="Only add bars after the stored data")
+    parser.add_argument('--ticks', action='store_true', help="Ingest <SYMBOL>_TICK_*.csv into the tick store")
+    args = parser.parse_args()
+
+    options = {'source_tz': args.source_tz}
+    if not args.append or args.ticks:
+        options['chunk_size'] = args.chunk_size
+    results = ingest_directory(args.source, args.output, args.symbols, args.timeframe, args.resample,
+                               append=args.append, ticks=args.ticks, **options)
+    for symbol, written in results.items():
+        if args.ticks:
+            print(f"{symbol}: {written:,} ticks")
+            continue
+        counts = {tf: r.rows_appended if isinstance(r, AppendResult) else r for tf, r in written.items()}
+        print(f"{symbol}: " + ", ".join(f"{tf} {rows:,} bars" for tf, rows in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Multi-Symbol Panel
+
+Several symbols' bars on one shared timestamp axis, as a dense
+(symbol x time x field) array with a presence mask, so cross-instrument
+statistics run as array operations instead of loops over per-symbol
+DataFrames:
+
+    panel = loader.load_panel(["EURUSD", "GBPUSD", "XAUUSD"], "M5", "2024-01-01")
+    atr = panel.atr(14)                                  # (symbol, time), NaN where absent
+    is_ob = ob_filter.time_features(panel.frame_index())['is_ob_time'].to_numpy()
+    ob_pct = panel.share(is_ob) * 100                    # OB bar share per symbol
+    zones = panel.event_mask({s: zone_sets[s].creation_times for s in panel.symbols})
+    concentration = panel.share(is_ob, zones) / panel.share(is_ob)
+
+The time axis is the union of the symbols' timestamps; a symbol's values
+are NaN (and mask False) where it has no bar, e.g. FX at weekends while
+BTC trades. Per-symbol series such as ATR are computed over each symbol's
+own bars (previous present close, rolling over present bars), so they
+match the single-symbol DataLoader/feature store results.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass
+class Panel:
+    """Timestamp-aligned bars of several symbols"""
+    symbols: List[str]
+    index: pd.DatetimeIndex     # Union of the symbols' timestamps
+    fields: List[str]
+    values: np.ndarray          # (symbol, time, field), NaN where the symbol has no bar
+    mask: np.ndarray            # (symbol, time), True where the symbol has a bar
+    timeframe: str = ""
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        fields: Sequence[str] = FIELDS,
+        timeframe: str = "",
+        dtype=np.float64
+    ) -> 'Panel':
+        """
+        Align per-symbol frames on the union of their timestamps
+
+        Args:
+            frames: Symbol -> DataFrame with sorted, unique timestamp index
+            fields: Columns to take (missing columns stay NaN)
+            timeframe: Timeframe label
+            dtype: Value dtype (float32 halves memory)
+        """
+        symbols = list(frames)
+        fields = list(fields)
+        stamps = [frames[s].index.as_unit('ns').asi8 for s in symbols]
+        times = np.unique(np.concatenate(stamps)) if stamps else np.array([], dtype=np.int64)
+
+        values = np.full((len(symbols), len(times), len(fields)), np.nan, dtype=dtype)
+        mask = np.zeros((len(symbols), len(times)), dtype=bool)
+        for row, (symbol, stamp) in enumerate(zip(symbols, stamps)):
+            position = np.searchsorted(times, stamp)
+            mask[row, position] = True
+            frame = frames[symbol]
+            for column, field in enumerate(fields):
+                if field in frame.columns:
+                    values[row, position, column] = frame[field].to_numpy(dtype=dtype)
+
+        index = pd.DatetimeIndex(times.astype('datetime64[ns]'), name='timestamp')
+        return cls(symbols, index, fields, values, mask, timeframe)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return (f"Panel({len(self.symbols)} symbols x {len(self.index):,} bars x {len(self.fields)} fields"
+                f"{' ' + self.timeframe if self.timeframe else ''})")
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def bars(self) -> Dict[str, int]:
+        """Bars present per symbol"""
+        return dict(zip(self.symbols, self.mask.sum(axis=1).tolist()))
+
+    def field(self, name: str) -> np.ndarray:
+        """(symbol, time) array of one field"""
+        return self.values[:, :, self.fields.index(name)]
+
+    def row(self, symbol: str) -> int:
+        return self.symbols.index(symbol)
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """One symbol's bars as a DataFrame (present bars only)"""
+        row = self.row(symbol)
+        present = self.mask[row]
+        return pd.DataFrame(self.values[row, present], index=self.index[present], columns=self.fields)
+
+    def frame_index(self) -> pd.DataFrame:
+        """Empty frame on the panel's time axis (for time-of-day features)"""
+        return pd.DataFrame(index=self.index)
+
+    def slice(self, start: Optional[str] = None, end: Optional[str] = None) -> 'Panel':
+        """Panel restricted to [start, end]"""
+        lo = self.index.searchsorted(pd.Timestamp(start)) if start else 0
+        hi = self.index.searchsorted(pd.Timestamp(end), side='right') if end else len(self.index)
+        return Panel(self.symbols, self.index[lo:hi], self.fields,
+                     self.values[:, lo:hi], self.mask[:, lo:hi], self.timeframe)
+
+    def previous(self, values: np.ndarray) -> np.ndarray:
+        """Value at each symbol's previous present bar (NaN for its first bar)"""
+        positions = np.where(self.mask, np.arange(len(self.index)), -1)
+        last = np.maximum.accumulate(positions, axis=1)
+        before = np.concatenate([np.full((len(self.symbols), 1), -1), last[:, :-1]], axis=1)
+        rows = np.arange(len(self.symbols))[:, None]
+        result = values[rows, np.maximum(before, 0)]
+        return np.where(before >= 0, result, np.nan)
+
+    def true_range(self) -> np.ndarray:
+        """(symbol, time) true range against each symbol's previous close"""
+        high, low = self.field('high'), self.field('low')
+        close = self.previous(self.field('close'))
+        with np.errstate(invalid='ignore'):
+            tr = np.fmax(high - low, np.fmax(np.abs(high - close), np.abs(low - close)))
+        return np.where(self.mask, tr, np.nan)
+
+    def rolling_mean(self, values: np.ndarray, window: int) -> np.ndarray:
+        """
+        Mean of each symbol's last window present values (NaN until it has window of them)
+
+        One cumulative-sum pass over the present values of all symbols
+        laid end to end; windows that would reach into the previous
+        symbol are NaN.
+        """
+        flat_mask = self.mask.ravel()
+        present = values.ravel()[flat_mask].astype(np.float64)
+        owner = np.repeat(np.arange(len(self.symbols)), self.mask.sum(axis=1))
+
+        missing = np.isnan(present)
+        sums = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, present))])
+        counts = np.concatenate([[0], np.cumsum(missing)])
+        stop = np.arange(1, len(present) + 1)
+        start = stop - window
+        ok = start >= 0
+        start = np.maximum(start, 0)
+        ok &= owner[start] == owner[stop - 1]
+        ok &= counts[stop] - counts[start] == 0
+
+        means = np.where(ok, (sums[stop] - sums[start]) / window, np.nan)
+        result = np.full(values.shape, np.nan)
+        result.ravel()[flat_mask] = means
+        return result
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        """(symbol, time) simple-average ATR over each symbol's own bars"""
+        return self.rolling_mean(self.true_range(), period)
+
+    def event_mask(self, events: Dict[str, pd.DatetimeIndex]) -> np.ndarray:
+        """(symbol, time) mask of event timestamps (e.g. zone creation times) per symbol"""
+        result = np.zeros(self.mask.shape, dtype=bool)
+        for symbol, times in events.items():
+            times = pd.DatetimeIndex(times).as_unit('ns').asi8
+            position = np.searchsorted(self.index.as_unit('ns').asi8, times)
+            found = position < len(self.index)
+            found[found] = self.index.as_unit('ns').asi8[position[found]] == times[found]
+            result[self.row(symbol), position[found]] = True
+        return result & self.mask
+
+    def share(self, selected: np.ndarray, of: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Per-symbol share of bars (or of the `of` events) that fall in selected
+
+        Args:
+            selected: (time,) or (symbol, time) mask, e.g. OB windows
+            of: (symbol, time) mask to count instead of present bars
+
+        Returns:
+            (symbol,) fractions (NaN where a symbol has none)
+        """
+        base = self.mask if of is None else of & self.mask
+        total = base.sum(axis=1)
+        inside = (base & np.broadcast_to(selected, base.shape)).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return inside / np.where(total > 0, total, np.nan)
+
+    def mean(self, values: np.ndarray, where: Optional[np.ndarray] = None) -> np.ndarray:
+        """(symbol,) mean of a (symbol, time) array over present bars (and where)"""
+        selected = self.mask if where is None else self.mask & np.broadcast_to(where, self.mask.shape)
+        with np.errstate(invalid='ignore'):
+            return np.nanmean(np.where(selected, values, np.nan), axis=1)
@@ -0,0 +1,264 @@
+"""
+Data Quality Validation
+
+Vectorized checks over DataLoader frames (timestamp index, open, high,
+low, close, optional volume):
+- missing_values / non_positive: NaN or <= 0 prices
+- ohlc_inconsistent: high below max(open, close) or low above min(open, close)
+- duplicate / non_monotonic: repeated timestamps, timestamps earlier than
+  the bar before
+- zero_range: high == low (with zero volume these are filler records of a
+  closed market)
+- spike: bad ticks, in ATRs of the preceding bars - a wick more than
+  spike_atr beyond the bar's body, or a close more than spike_atr away
+  from both neighbouring closes in the same direction (a one-bar round
+  trip; genuine breakouts do not revert on the next bar)
+- gaps: missing bars in open-market time; closures of the instrument's
+  trading calendar are not gaps (see data.sessions)
+
+validate() returns a QualityReport and, with repair=True, a repaired frame:
+unusable rows dropped, sorted, de-duplicated (last occurrence wins),
+high/low widened to contain open and close, zero-range zero-volume bars
+dropped and spike wicks clipped to spike_atr ATRs beyond the body. Gaps
+and round-trip closes are reported, not invented or removed.
+
+Usage (from the code/ directory):
+    python -m data.quality --root data/raw/combined_2020_2025 --timeframe M5
+    python -m data.quality --symbols XAUUSD --repair     # rewrite repaired files
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from data.data_loader import TIMEFRAME_MINUTES, DataLoader, find_gaps
+from data.sessions import CALENDARS, get_calendar
+from zones.detector import average_true_range
+
+
+# Issue names in report order
+CHECKS = (
+    'missing_values',
+    'non_positive',
+    'ohlc_inconsistent',
+    'duplicate',
+    'non_monotonic',
+    'zero_range',
+    'spike',
+)
+
+PRICES = ['open', 'high', 'low', 'close']
+
+
+@dataclass
+class QualityConfig:
+    """Check thresholds"""
+    atr_period: int = 100           # Bars in the spike check's ATR (longer than the detector's 14, so
+                                    # breakouts from quiet consolidations are not flagged)
+    spike_atr: float = 15.0         # Wick beyond the body (or one-bar round trip) in ATRs that counts as a spike
+    calendar: str = 'auto'          # Trading calendar for gaps ('auto': the symbol's own, see data.sessions)
+
+
+@dataclass
+class QualityReport:
+    """Outcome of validate(): offending timestamps per check, plus gaps"""
+    symbol: str
+    timeframe: str
+    bars: int
+    issues: Dict[str, pd.DatetimeIndex] = field(default_factory=dict)
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp, int]] = field(default_factory=list)   # (after, before, missing bars)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {name: len(self.issues.get(name, ())) for name in CHECKS}
+
+    @property
+    def missing_bars(self) -> int:
+        return sum(gap[2] for gap in self.gaps)
+
+    @property
+    def passed(self) -> bool:
+        """No issue except zero-range bars, and no gaps"""
+        counts = self.counts
+        return not self.gaps and all(n == 0 for name, n in counts.items() if name != 'zero_range')
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'bars': self.bars,
+            'passed': self.passed,
+            **self.counts,
+            'gaps': len(self.gaps),
+            'missing_bars': self.missing_bars,
+        }
+
+    def summary(self) -> str:
+        status = "OK" if self.passed else "ISSUES"
+        lines = [f"{self.symbol} {self.timeframe}: {self.bars:,} bars - {status}"]
+        for name, n in self.counts.items():
+            if n:
+                lines.append(f"  {name:<18} {n:>9,}  (first {self.issues[name][0]})")
+        if self.gaps:
+            widest = max(self.gaps, key=lambda gap: gap[2])
+            lines.append(f"  {'gaps':<18} {len(self.gaps):>9,}  ({self.missing_bars:,} missing bars, "
+                         f"widest {widest[2]:,} after {widest[0]})")
+        return "\n".join(lines)
+
+
+def _spikes(df: pd.DataFrame, config: QualityConfig) -> Tuple[np.ndarray, ...]:
+    """
+    Spike masks against the ATR of the preceding bars
+
+    Returns:
+        (round-trip closes, upper wick spikes, lower wick spikes, ATR used),
+        arrays aligned with df
+    """
+    atr = average_true_range(df, config.atr_period).shift(1).to_numpy()
+    limit = config.spike_atr * atr
+
+    close = df['close'].to_numpy()
+    body_high = np.maximum(df['open'].to_numpy(), close)
+    body_low = np.minimum(df['open'].to_numpy(), close)
+    from_previous = np.diff(close, prepend=np.nan)
+    from_next = -np.diff(close, append=np.nan)
+    with np.errstate(invalid='ignore'):
+        round_trip = (np.sign(from_previous) == np.sign(from_next)) & \
+            (np.minimum(np.abs(from_previous), np.abs(from_next)) > limit)
+        upper = df['high'].to_numpy() - body_high > limit
+        lower = body_low - df['low'].to_numpy() > limit
+    return round_trip, upper, lower, atr
+
+
+def check_ohlcv(
+    df: pd.DataFrame,
+    timeframe: str = "M5",
+    symbol: str = "",
+    config: Optional[QualityConfig] = None
+) -> QualityReport:
+    """
+    Run every check on a frame without modifying it
+
+    Args:
+        df: DataFrame with timestamp index and OHLC(V) columns
+        timeframe: Bar timeframe (for gaps)
+        symbol: Symbol name for the report (and the 'auto' calendar)
+        config: Thresholds (default: QualityConfig())
+
+    Returns:
+        QualityReport
+    """
+    config = config or QualityConfig()
+    index = pd.DatetimeIndex(df.index)
+    prices = df[PRICES].to_numpy(dtype=float)
+    open_, high, low, close = prices.T
+
+    issues = {}
+    issues['missing_values'] = index[np.isnan(prices).any(axis=1)]
+    issues['non_positive'] = index[(prices <= 0).any(axis=1)]
+    with np.errstate(invalid='ignore'):
+        inconsistent = (high < np.maximum(open_, close)) | (low > np.minimum(open_, close)) | (high < low)
+    issues['ohlc_inconsistent'] = index[inconsistent]
+    issues['duplicate'] = index[index.duplicated(keep='first')]
+    times = index.asi8
+    issues['non_monotonic'] = index[1:][times[1:] < times[:-1]]
+    issues['zero_range'] = index[high == low]
+
+    # Spikes and gaps need time order
+    ordered = df if index.is_monotonic_increasing and index.is_unique else _ordered(df)
+    round_trip, upper, lower, _ = _spikes(ordered, config)
+    issues['spike'] = ordered.index[round_trip | upper | lower]
+
+    gaps = find_gaps(ordered.index, timeframe, calendar=get_calendar(config.calendar, symbol))
+    return QualityReport(symbol, timeframe, len(df), issues, gaps)
+
+
+def repair_ohlcv(df: pd.DataFrame, config: Optional[QualityConfig] = None) -> pd.DataFrame:
+    """
+    Repaired copy of a frame
+
+    Drops rows with NaN or non-positive prices, sorts and de-duplicates
+    (last occurrence wins), widens high/low to contain open and close,
+    drops zero-range bars without volume and clips spike wicks to
+    spike_atr ATRs beyond the body.
+    """
+    config = config or QualityConfig()
+    prices = df[PRICES].to_numpy(dtype=float)
+    usable = ~np.isnan(prices).any(axis=1) & (prices > 0).all(axis=1)
+    df = _ordered(df[usable])
+
+    df['high'] = df[PRICES].max(axis=1)
+    df['low'] = df[PRICES].min(axis=1)
+
+    flat = df['high'].to_numpy() == df['low'].to_numpy()
+    if 'volume' in df.columns:
+        flat &= df['volume'].fillna(0).to_numpy() == 0
+    df = df[~flat]
+
+    _, upper, lower, atr = _spikes(df, config)
+    limit = config.spike_atr * atr
+    body_high = np.maximum(df['open'].to_numpy(), df['close'].to_numpy())
+    body_low = np.minimum(df['open'].to_numpy(), df['close'].to_numpy())
+    df['high'] = np.where(upper, body_high + limit, df['high'].to_numpy())
+    df['low'] = np.where(lower, body_low - limit, df['low'].to_numpy())
+    return df
+
+
+def validate(
+    df: pd.DataFrame,
+    timeframe: str = "M5",
+    symbol: str = "",
+    config: Optional[QualityConfig] = None,
+    repair: bool = False
+) -> Tuple[QualityReport, Optional[pd.DataFrame]]:
+    """
+    Check a frame and optionally repair it
+
+    Returns:
+        (report on the input, repaired frame or None)
+    """
+    report = check_ohlcv(df, timeframe, symbol, config)
+    return report, repair_ohlcv(df, config) if repair else None
+
+
+def _ordered(df: pd.DataFrame) -> pd.DataFrame:
+    """Sorted by time (stable), last occurrence of a timestamp kept"""
+    df = df.iloc[np.argsort(df.index.asi8, kind='stable')]
+    return df[~df.index.duplicated(keep='last')].copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate (and optionally repair) OHLCV datasets")
+    parser.add_argument('--root', type=Path, default=None, help="DataLoader root (default: combined_2020_2025)")
+    parser.add_argument('--symbols', nargs='*', help="Symbols (default: all in the timeframe)")
+    parser.add_argument('--timeframe', default="M5", choices=list(TIMEFRAME_MINUTES), help="Timeframe")
+    parser.add_argument('--spike-atr', type=float, default=QualityConfig.spike_atr, help="Spike threshold in ATRs")
+    parser.add_argument('--calendar', default='auto', choices=['auto', *CALENDARS],
+                        help="Trading calendar for gaps (auto: per symbol)")
+    parser.add_argument('--repair', action='store_true', help="Rewrite <TF>/<symbol>.parquet with the repaired bars")
+    args = parser.parse_args()
+
+    loader = DataLoader(args.root)
+    config = QualityConfig(spike_atr=args.spike_atr, calendar=args.calendar)
+    failed = 0
+    for symbol in args.symbols or loader.list_available_symbols(args.timeframe):
+        df = loader.load(symbol, args.timeframe)
+        report, repaired = validate(df, args.timeframe, symbol, config, repair=args.repair)
+        failed += not report.passed
+        print(report.summary())
+
+        if repaired is not None:
+            try:
+                path = loader.rewrite(symbol, args.timeframe, repaired)
+                print(f"  repaired: {len(df):,} -> {len(repaired):,} bars written to {path}")
+            except ValueError as e:
+                print(f"  not repaired: {e}")
+
+    print(f"\n{failed} dataset(s) with issues")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Trading Calendars
+
+Market hours per instrument, and a session-aware index over a bar series,
+so windows (consolidations, breakout moves, zone ages) can respect market
+closures without per-bar timestamp checks in the hot loops.
+
+- TradingCalendar: weekly closures in the exchange's wall-clock time,
+  converted per timestamp. FX closes Friday to Sunday 17:00 New York,
+  metals reopen Sunday 18:00 and take the daily 17:00-18:00 break (21:00 or
+  22:00 UTC, with US daylight saving), crypto never closes. Holidays are
+  not modelled; they show up as missing bars.
+- SessionIndex (TradingCalendar.sessions(index, timeframe)), per bar:
+  clock    market bar slot: advances by one per bar of open-market time,
+           so closures add nothing and missing bars add their count
+  breaks   the bar follows a discontinuity (a closure or missing bars)
+  closed   the discontinuity spans a market closure
+  missing  open-market bars missing before the bar
+  segment  run of contiguous bars; [a, b] is unbroken iff segment[a] == segment[b]
+
+A table of cumulative open minutes per week (10080 entries) turns every
+timestamp into open-market minutes since the epoch in one vectorized pass.
+The US clock changes happen at Sunday 02:00 New York, inside the weekend
+closure, so counting open minutes in exchange time keeps the clock
+continuous across them.
+
+Only numpy and pandas are imported, so the backtest engine can load this
+file by path like the other research modules.
+
+Example:
+    sessions = calendar_for('XAUUSD').sessions(df_m5.index, 'M5')
+    zones = ZoneDetector().detect_zones(df_m5, sessions=sessions)
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+MINUTES_PER_WEEK = 7 * 1440
+
+# Weeks are counted from Monday 00:00 (in the calendar's timezone)
+_EPOCH = pd.Timestamp('1970-01-05').value
+_NS_PER_MINUTE = 60_000_000_000
+
+_UNIT_MINUTES = {'M': 1, 'H': 60, 'D': 1440}
+
+
+def weekly_minute(weekday: int, hour: int, minute: int = 0) -> int:
+    """Minutes from Monday 00:00 (weekday 0 = Monday)"""
+    return weekday * 1440 + hour * 60 + minute
+
+
+def bar_minutes(timeframe: str) -> int:
+    """Bar length of a timeframe name (M5, H1, D1, ...)"""
+    return _UNIT_MINUTES[timeframe[0]] * int(timeframe[1:])
+
+
+@lru_cache(maxsize=None)
+def _open_table(closures: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+    """Open minutes from Monday 00:00 up to each minute of the week (MINUTES_PER_WEEK + 1 entries)"""
+    is_open = np.ones(MINUTES_PER_WEEK, dtype=np.int64)
+    for start, end in closures:
+        is_open[start:end] = 0
+    return np.concatenate([[0], np.cumsum(is_open)])
+
+
+def _utc_minutes(index: pd.DatetimeIndex) -> np.ndarray:
+    """Minutes since Monday 1970-01-05 00:00 UTC (naive timestamps are taken as UTC)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return (index.as_unit('ns').asi8 - _EPOCH) // _NS_PER_MINUTE
+
+
+def _local_minutes(index: pd.DatetimeIndex, timezone: str) -> np.ndarray:
+    """Minutes since Monday 1970-01-05 00:00 wall-clock time in timezone (naive timestamps are taken as UTC)"""
+    if timezone == 'UTC':
+        return _utc_minutes(index)
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return _utc_minutes(index.tz_convert(timezone).tz_localize(None))
+
+
+@dataclass(frozen=True)
+class TradingCalendar:
+    """Weekly market hours"""
+    name: str
+    closures: Tuple[Tuple[int, int], ...] = ()      # Closed [start, end) in minutes from Monday 00:00
+    timezone: str = 'UTC'                           # Wall-clock time of the closures
+
+    @property
+    def always_open(self) -> bool:
+        return not self.closures
+
+    def open_minutes(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Open-market minutes from the epoch to each timestamp"""
+        week, offset = np.divmod(_local_minutes(index, self.timezone), MINUTES_PER_WEEK)
+        table = _open_table(self.closures)
+        return week * table[-1] + table[offset]
+
+    def is_open(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Whether the market is open at each timestamp"""
+        offset = _local_minutes(index, self.timezone) % MINUTES_PER_WEEK
+        table = _open_table(self.closures)
+        return table[offset + 1] > table[offset]
+
+    def sessions(self, index: pd.DatetimeIndex, timeframe: str) -> 'SessionIndex':
+        """Session-aware index of a sorted bar series"""
+        step = bar_minutes(timeframe)
+        wall = _utc_minutes(index)
+        open_minutes = self.open_minutes(index)
+        clock = open_minutes // step
+
+        wall_delta = np.diff(wall)
+        breaks = np.concatenate([[True], wall_delta > step])
+        closed = breaks & np.concatenate([[False], wall_delta > np.diff(open_minutes)])
+        missing = np.concatenate([[0], np.maximum(np.diff(clock) - 1, 0)])
+
+        return SessionIndex(
+            calendar=self,
+            timeframe=timeframe,
+            index=pd.DatetimeIndex(index),
+            clock=clock,
+            breaks=breaks,
+            closed=closed,
+            missing=missing
+        )
+
+
+@dataclass
+class SessionIndex:
+    """Per-bar session arrays of one bar series (see TradingCalendar.sessions)"""
+    calendar: TradingCalendar
+    timeframe: str
+    index: pd.DatetimeIndex
+    clock: np.ndarray       # Market bar slot
+    breaks: np.ndarray      # Bar follows a closure or missing bars (always True for the first bar)
+    closed: np.ndarray      # The discontinuity before the bar spans a closure
+    missing: np.ndarray     # Open-market bars missing before the bar
+    segment: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.segment = np.cumsum(self.breaks) - 1
+
+    def __len__(self) -> int:
+        return len(self.clock)
+
+    @property
+    def name(self) -> str:
+        return self.calendar.name
+
+    def unbroken(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """Whether bars first..last (inclusive) are contiguous, with no closure or missing bar"""
+        return self.segment[first] == self.segment[last]
+
+    def age(self, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        """Market bars elapsed from start to stop (closures excluded, missing bars included)"""
+        return self.clock[stop] - self.clock[start]
+
+    def breaks_for(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """breaks for another bar series on the same calendar (e.g. a feature store's full dataset)"""
+        if index is self.index or index.equals(self.index):
+            return self.breaks
+        return self.calendar.sessions(index, self.timeframe).breaks
+
+    def gaps(self) -> List[Tuple[pd.Timestamp, pd.Timestamp, int]]:
+        """(last bar before, first bar after, missing bars) of every gap in open-market time"""
+        rows = np.flatnonzero(self.missing > 0)
+        return [(self.index[i - 1], self.index[i], int(self.missing[i])) for i in rows]
+
+
+# Closures in New York time: 17:00 is 21:00 UTC in summer and 22:00 UTC in winter
+EXCHANGE_TIMEZONE = 'America/New_York'
+
+# FX: Friday 17:00 to Sunday 17:00
+WEEKEND = (weekly_minute(4, 17), weekly_minute(6, 17))
+
+FX = TradingCalendar('fx', (WEEKEND,), EXCHANGE_TIMEZONE)
+# Metals: Friday 17:00 to Sunday 18:00, and 17:00-18:00 Monday to Thursday
+METALS = TradingCalendar('metals', ((weekly_minute(4, 17), weekly_minute(6, 18)),) + tuple(
+    (weekly_minute(day, 17), weekly_minute(day, 18)) for day in range(4)
+), EXCHANGE_TIMEZONE)
+CRYPTO = TradingCalendar('crypto')
+
+CALENDARS: Dict[str, TradingCalendar] = {calendar.name: calendar for calendar in (FX, METALS, CRYPTO)}
+
+# Instruments not listed trade on the FX calendar
+INSTRUMENT_CALENDARS = {
+    'XAUUSD': 'metals',
+    'XAGUSD': 'metals',
+    'BTCUSD': 'crypto',
+    'ETHUSD': 'crypto',
+}
+
+
+def calendar_for(symbol: str) -> TradingCalendar:
+    """Trading calendar of an instrument"""
+    return CALENDARS[INSTRUMENT_CALENDARS.get(symbol.upper(), 'fx')]
+
+
+def get_calendar(name: str, symbol: str = "") -> TradingCalendar:
+    """Calendar by name; 'auto' picks the instrument's own"""
+    if name == 'auto':
+        return calendar_for(symbol)
+    if name not in CALENDARS:
+        raise ValueError(f"Unknown calendar: {name}. Available: auto, {', '.join(CALENDARS)}")
+    return CALENDARS[name]
@@ -0,0 +1,371 @@
+"""
+Synthetic OHLCV Generator
+
+Arbitrarily long, OHLC-consistent bar series for demos and scale testing
+without real data:
+- Volatility regimes: piecewise-constant volatility multipliers with
+  random durations (e.g. calm / normal / volatile)
+- Trends: drift legs of random length and direction
+- Consolidation-then-breakout episodes: tight mean-reverting ranges
+  followed by a few wide directional bars, the structure supply/demand
+  zones form from
+- Weekends: no bars from Friday to Sunday 17:00 New York (the FX
+  calendar of data.sessions), with a price gap at the Sunday open
+
+Every bar satisfies low <= min(open, close) <= max(open, close) <= high,
+and open equals the previous close except across weekend gaps.
+
+Generation is vectorized and chunked: iter_ohlcv() yields consecutive
+chunks with all state carried over, so 10M+ bar series never need to be
+held in memory, and the output does not depend on the chunk size (up to
+floating-point rounding). write_dataset() streams a series (and optional higher-timeframe
+resamples) straight into the DataLoader layout (<root>/<TF>/<symbol>.parquet).
+
+Usage (from the code/ directory):
+    python -m data.synthetic --symbol SYNTH --bars 10000000 --output data/raw/synthetic
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy.signal import lfilter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from data.data_loader import TIMEFRAME_MINUTES, register_dataset, resample_ohlcv
+from data.ingest import ParquetAppender
+
+
+CHUNK_SIZE = 1_000_000
+
+_MINUTE_NS = 60 * 10**9
+_DAY_NS = 1440 * _MINUTE_NS
+
+# Episode phases
+_NORMAL, _CONSOLIDATION, _BREAKOUT = 0, 1, 2
+
+
+@dataclass
+class SyntheticConfig:
+    """Market structure of a synthetic series"""
+
+    price: float = 1800.0               # Starting price (XAUUSD-like)
+    volatility: float = 0.0006          # Per-bar log-return std at M5; scaled by sqrt(bar minutes / 5)
+
+    # Volatility regimes: (multiplier, probability); each lasts ~regime_length bars
+    regimes: Tuple[Tuple[float, float], ...] = ((0.6, 0.3), (1.0, 0.5), (1.8, 0.2))
+    regime_length: int = 2000
+
+    # Trend legs: drift of trend_strength * sigma per bar, random sign, ~trend_length bars
+    trend_strength: float = 0.05
+    trend_length: int = 3000
+
+    # Pull of log price toward the start (half-life ~70k bars) keeps 10M+ bar series plausible
+    reversion: float = 1e-5
+
+    # Consolidation-then-breakout episodes
+    consolidation_every: int = 80       # Mean bars between consolidation starts
+    consolidation_length: int = 40      # Mean bars per consolidation
+    consolidation_volatility: float = 0.15
+    consolidation_drift: float = 0.25   # Close-to-close noise within the range, relative to wicks
+    breakout_length: int = 3            # Mean bars per breakout
+    breakout_volatility: float = 2.5    # Sigma multiplier during breakouts
+    breakout_drift: float = 1.0         # Directional drift in breakout sigmas per bar
+
+    # Weekend closure (wall-clock hours in timezone) and the opening gap
+    weekends: bool = True
+    close_hour: int = 17                # Friday close
+    open_hour: int = 17                 # Sunday open
+    timezone: str = 'America/New_York'
+    gap_volatility: float = 0.002       # Log-return std of the weekend gap
+
+    # Wicks and volume
+    wick_size: float = 0.5              # Mean wick beyond the body, in bar sigmas
+    base_volume: float = 3000.0
+
+
+class _Schedule:
+    """
+    Piecewise-constant per-bar values drawn one segment at a time
+
+    take(n) continues where the previous call stopped, so a schedule
+    spans chunk boundaries seamlessly.
+    """
+
+    def __init__(self, segments: Iterator[Tuple[int, float]]):
+        self._segments = segments
+        self._value = 0.0
+        self._left = 0
+
+    def take(self, n: int) -> np.ndarray:
+        lengths, values = [], []
+        needed = n
+        while needed > 0:
+            if self._left == 0:
+                self._left, self._value = next(self._segments)
+            step = min(self._left, needed)
+            lengths.append(step)
+            values.append(self._value)
+            self._left -= step
+            needed -= step
+        return np.repeat(np.asarray(values, dtype=float), lengths)
+
+
+def _regime_segments(rng: np.random.Generator, config: SyntheticConfig):
+    multipliers = np.array([m for m, _ in config.regimes])
+    weights = np.array([w for _, w in config.regimes], dtype=float)
+    weights /= weights.sum()
+    while True:
+        yield int(rng.geometric(1 / config.regime_length)), float(rng.choice(multipliers, p=weights))
+
+
+def _trend_segments(rng: np.random.Generator, config: SyntheticConfig):
+    while True:
+        yield int(rng.geometric(1 / config.trend_length)), float(rng.choice((-1.0, 1.0)))
+
+
+def _episode_segments(rng: np.random.Generator, config: SyntheticConfig):
+    """Normal -> consolidation -> breakout cycles; breakouts carry their direction in the sign"""
+    gap = max(config.consolidation_every - config.consolidation_length - config.breakout_length, 1)
+    while True:
+        yield int(rng.geometric(1 / gap)), _NORMAL
+        yield int(rng.geometric(1 / config.consolidation_length)), _CONSOLIDATION
+        yield int(rng.geometric(1 / config.breakout_length)), _BREAKOUT * float(rng.choice((-1.0, 1.0)))
+
+
+def _open_mask(times_ns: np.ndarray, config: SyntheticConfig) -> np.ndarray:
+    """True for bar start times outside the weekend closure"""
+    if not config.weekends:
+        return np.ones(len(times_ns), dtype=bool)
+    if config.timezone != 'UTC':
+        local = pd.DatetimeIndex(times_ns.astype('datetime64[ns]')).tz_localize('UTC').tz_convert(config.timezone)
+        times_ns = local.tz_localize(None).as_unit('ns').asi8
+    days = times_ns // _DAY_NS
+    weekday = (days + 3) % 7                       # 1970-01-01 was a Thursday
+    hour = (times_ns - days * _DAY_NS) // (60 * _MINUTE_NS)
+    closed = (
+        (weekday == 5)
+        | ((weekday == 4) & (hour >= config.close_hour))
+        | ((weekday == 6) & (hour < config.open_hour))
+    )
+    return ~closed
+
+
+def iter_ohlcv(
+    n_bars: int,
+    timeframe: str = "M5",
+    seed: int = 42,
+    start: str = "2020-01-01",
+    config: Optional[SyntheticConfig] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate a synthetic series as consecutive chunks
+
+    Args:
+        n_bars: Total number of bars
+        timeframe: Bar timeframe (M1, M5, M15, M30, H1, H4, D1)
+        seed: Random seed; the same seed gives the same series for any chunk_size
+        start: First candidate timestamp (UTC); weekend times are skipped
+        config: Market structure (default: SyntheticConfig())
+        chunk_size: Bars per yielded DataFrame
+
+    Yields:
+        DataFrames with timestamp index and open, high, low, close, volume
+    """
+    if timeframe not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Unknown timeframe: {timeframe}. Available: {list(TIMEFRAME_MINUTES)}")
+
+    config = config or SyntheticConfig()
+    minutes = TIMEFRAME_MINUTES[timeframe]
+    step_ns = minutes * _MINUTE_NS
+    sigma = config.volatility * np.sqrt(minutes / 5)
+
+    # Independent streams, one fixed-size draw per bar each, keep the output chunk-size invariant
+    streams = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(7)]
+    regimes = _Schedule(_regime_segments(streams[0], config))
+    trends = _Schedule(_trend_segments(streams[1], config))
+    episodes = _Schedule(_episode_segments(streams[2], config))
+    noise_rng, gap_rng, wick_rng, volume_rng = streams[3:]
+
+    cursor = pd.Timestamp(start).value
+    prev_time = None
+    log_start = np.log(config.price)
+    prev_deviation = 0.0
+    prev_noise = 0.0
+    bars_per_week = 7 * 1440 // minutes
+
+    done = 0
+    while done < n_bars:
+        n = min(chunk_size, n_bars - done)
+
+        # Timestamps: candidate grid with the weekend closure removed
+        times = np.empty(0, dtype=np.int64)
+        while len(times) < n:
+            grid = cursor + np.arange(n - len(times) + bars_per_week // 2, dtype=np.int64) * step_ns
+            times = np.concatenate([times, grid[_open_mask(grid, config)]])
+            cursor = int(grid[-1]) + step_ns
+        times = times[:n]
+        cursor = int(times[-1]) + step_ns
+
+        # Per-bar structure
+        regime = regimes.take(n)
+        trend = trends.take(n)
+        episode = episodes.take(n)
+        phase = np.abs(episode)
+        consolidating = phase == _CONSOLIDATION
+        breaking_out = phase == _BREAKOUT
+
+        bar_sigma = sigma * regime * np.select(
+            [consolidating, breaking_out],
+            [config.consolidation_volatility, config.breakout_volatility],
+            1.0
+        )
+        drift = np.select(
+            [consolidating, breaking_out],
+            [0.0, np.sign(episode) * config.breakout_drift * bar_sigma],
+            trend * config.trend_strength * bar_sigma
+        )
+
+        # Returns: i.i.d. in normal phases, differenced noise keeps consolidations in a tight range
+        noise = noise_rng.standard_normal(n)
+        differenced = np.diff(noise, prepend=prev_noise)
+        prev_noise = noise[-1]
+        steps = np.where(consolidating, config.consolidation_drift * differenced, noise) * bar_sigma + drift
+
+        # Weekend gaps at the first bar after a closure
+        gap_draw = gap_rng.standard_normal(n) * config.gap_volatility
+        previous = np.concatenate([[prev_time if prev_time is not None else times[0] - step_ns], times[:-1]])
+        gaps = np.where(times - previous > step_ns, gap_draw, 0.0)
+        prev_time = int(times[-1])
+
+        # Log price deviation from the start decays by (1 - reversion) per bar
+        deviation = lfilter([1.0], [1.0, config.reversion - 1.0], gaps + steps,
+                            zi=[(1.0 - config.reversion) * prev_deviation])[0]
+        log_close = log_start + deviation
+        log_open = np.concatenate([[log_start + prev_deviation], log_close[:-1]]) + gaps
+        prev_deviation = deviation[-1]
+
+        wicks = bar_sigma[:, None] * config.wick_size * (1 + 0.4 * np.abs(wick_rng.standard_normal((n, 2))))
+        open_ = np.exp(log_open)
+        close = np.exp(log_close)
+        high = np.exp(np.maximum(log_open, log_close) + wicks[:, 0])
+        low = np.exp(np.minimum(log_open, log_close) - wicks[:, 1])
+
+        volume = np.round(config.base_volume * np.sqrt(regime * np.where(breaking_out, 3.0, 1.0))
+                          * np.exp(0.4 * volume_rng.standard_normal(n)))
+
+        yield pd.DataFrame({
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume
+        }, index=pd.DatetimeIndex(times.astype('datetime64[ns]'), name='timestamp'))
+
+        done += n
+
+
+def generate_ohlcv(
+    n_bars: int,
+    timeframe: str = "M5",
+    seed: int = 42,
+    start: str = "2020-01-01",
+    config: Optional[SyntheticConfig] = None
+) -> pd.DataFrame:
+    """
+    Generate a synthetic series in memory
+
+    See iter_ohlcv() for the arguments.
+
+    Returns:
+        DataFrame with timestamp index and open, high, low, close, volume
+    """
+    return pd.concat(list(iter_ohlcv(n_bars, timeframe, seed, start, config)))
+
+
+def write_dataset(
+    root: str,
+    symbol: str,
+    n_bars: int,
+    timeframe: str = "M5",
+    resample_to: Sequence[str] = ("H1",),
+    seed: int = 42,
+    start: str = "2020-01-01",
+    config: Optional[SyntheticConfig] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict[str, Path]:
+    """
+    Stream a synthetic series into the DataLoader layout
+
+    Writes <root>/<timeframe>/<symbol>.parquet and one file per entry of
+    resample_to, chunk by chunk; a period that straddles a chunk boundary
+    is held back until it is complete.
+
+    Args:
+        root: DataLoader data path
+        symbol: Symbol name for the files
+        n_bars: Bars at the base timeframe
+        timeframe: Base timeframe
+        resample_to: Higher timeframes to derive (multiples of the base)
+        seed, start, config, chunk_size: As for iter_ohlcv()
+
+    Returns:
+        Dict mapping timeframe to written file
+    """
+    base_minutes = TIMEFRAME_MINUTES[timeframe]
+    for tf in resample_to:
+        if tf not in TIMEFRAME_MINUTES or TIMEFRAME_MINUTES[tf] % base_minutes:
+            raise ValueError(f"Cannot resample {timeframe} to {tf}")
+
+    root = Path(root)
+    sinks = {tf: ParquetAppender(root / tf / f"{symbol}.parquet") for tf in (timeframe, *resample_to)}
+    pending: Dict[str, List[pd.DataFrame]] = {tf: [] for tf in resample_to}
+
+    try:
+        for chunk in iter_ohlcv(n_bars, timeframe, seed, start, config, chunk_size):
+            sinks[timeframe].write(chunk)
+
+            for tf in resample_to:
+                bars = pd.concat(pending[tf] + [chunk])
+                period = bars.index.floor(f"{TIMEFRAME_MINUTES[tf]}min")
+                incomplete = period == period[-1]
+                sinks[tf].write(resample_ohlcv(bars[~incomplete], tf))
+                pending[tf] = [bars[incomplete]]
+
+        for tf in resample_to:
+            if pending[tf]:
+                sinks[tf].write(resample_ohlcv(pd.concat(pending[tf]), tf))
+    except BaseException:
+        for sink in sinks.values():
+            sink.abort()
+        raise
+
+    for tf, sink in sinks.items():
+        sink.close()
+        register_dataset(root, tf, symbol)
+
+    return {tf: sink.path for tf, sink in sinks.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic OHLCV dataset in the DataLoader layout")
+    parser.add_argument('--symbol', default="SYNTH", help="Symbol name")
+    parser.add_argument('--bars', type=int, default=1_000_000, help="Bars at the base timeframe")
+    parser.add_argument('--timeframe', default="M5", choices=list(TIMEFRAME_MINUTES), help="Base timeframe")
+    parser.add_argument('--resample', nargs='*', default=["H1"], help="Higher timeframes to derive")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--start', default="2020-01-01", help="First timestamp")
+    parser.add_argument('--output', type=Path, default=Path("data") / "raw" / "synthetic", help="DataLoader root")
+    args = parser.parse_args()
+
+    paths = write_dataset(args.output, args.symbol, args.bars, args.timeframe, args.resample,
+                          seed=args.seed, start=args.start)
+    for tf, path in paths.items():
+        print(f"{tf}: {path} ({pq.ParquetFile(path).metadata.num_rows:,} bars)")
+
+
+if __name__ == "__main__":
+    main()
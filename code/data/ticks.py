@@ -0,0 +1,336 @@
+"""
+Tick Store and On-the-Fly Bars
+
+Stores ticks compactly and builds bars of any length from them on
+demand, so the OB windows (xx:55-05, xx:30 +/- 3) can be studied at
+minute or second resolution rather than on pre-aggregated M5 bars.
+
+Layout (under <data path>/ticks, see DataLoader.ticks):
+
+    <SYMBOL>/<YYYY-MM>.parquet                  ticks of one month
+    <SYMBOL>/_bars/<TF>_<price>/<YYYY-MM>.parquet   bars built from that month
+
+Tick files are columnar with delta-encoded columns:
+- timestamp: int64 milliseconds, DELTA_BINARY_PACKED (about 1.3 bytes
+  per tick for FX tick rates)
+- bid, ask: integer points at the smallest exact decimal scale (kept in
+  the file metadata), DELTA_BINARY_PACKED (under half a byte each);
+  prices with more than 9 decimals are stored as plain floats
+- bid_volume, ask_volume (optional): float32
+
+Bars (build_bars) are built in one vectorized pass: ticks are bucketed
+by bar start, with bars starting at multiples of the bar length since
+1970-01-01 UTC, so every month yields the same bar boundaries. Volume is
+the tick count. A month's bars are cached on first use and rebuilt only
+when that month's tick file changes, so a long study pays for each month
+once. Timeframes are M/H/D names as elsewhere, plus custom lengths
+(M2, M3, ...) and seconds (S10, S30).
+
+Example:
+    ticks = TickStore('data/raw/combined_2020_2025/ticks')
+    ticks.write('EURUSD', df_ticks)         # timestamp index, bid, ask
+    m1 = ticks.bars('EURUSD', 'M1', '2024-01-01', '2024-03-31')
+"""
+
+import os
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Optional
+
+TICK_COLUMNS = ['bid', 'ask', 'bid_volume', 'ask_volume']
+PRICE_COLUMNS = ['bid', 'ask']
+PRICES = ('bid', 'ask', 'mid')
+
+BARS_DIR = "_bars"
+ROW_GROUP_SIZE = 1_000_000
+COMPRESSION = "zstd"
+MAX_DECIMALS = 9
+
+_NS_PER_MS = 1_000_000
+_NS_PER_DAY = 86_400 * 1_000_000_000
+_UNIT_SECONDS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400}
+_TIMEFRAME = re.compile(r"^([SMHD])(\d+)$")
+_MONTH = re.compile(r"^\d{4}-\d{2}$")
+
+# Parquet key-value metadata
+_POINTS = b'points'              # Tick files: decimals of the integer price columns, e.g. b"bid=5,ask=5"
+_SOURCE = b'source'              # Bar caches: "<size>:<mtime_ns>" of the tick file they were built from
+
+
+def bar_nanos(timeframe: str) -> int:
+    """Bar length in nanoseconds of a timeframe name (S30, M1, M5, M7, H1, D1, ...)"""
+    match = _TIMEFRAME.match(timeframe)
+    if match is None or int(match[2]) <= 0:
+        raise ValueError(f"Invalid timeframe: {timeframe} (expected S/M/H/D and a bar count, e.g. M1, S30)")
+    return _UNIT_SECONDS[match[1]] * int(match[2]) * 1_000_000_000
+
+
+def _decimals(values: np.ndarray) -> Optional[int]:
+    """Smallest number of decimals that represents every value exactly (None beyond MAX_DECIMALS)"""
+    values = values[~np.isnan(values)]
+    for decimals in range(MAX_DECIMALS + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+    return None
+
+
+def _month(times: np.ndarray) -> np.ndarray:
+    """'YYYY-MM' of each nanosecond timestamp"""
+    return np.datetime_as_string(times.astype('datetime64[ns]').astype('datetime64[M]'))
+
+
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'],
+                        index=pd.DatetimeIndex([], name='timestamp'), dtype=float)
+
+
+def tick_prices(ticks: pd.DataFrame, price: str = 'bid') -> np.ndarray:
+    """Bid, ask or mid price of each tick"""
+    if price == 'mid':
+        return (ticks['bid'].to_numpy(dtype=float) + ticks['ask'].to_numpy(dtype=float)) / 2
+    if price not in PRICES:
+        raise ValueError(f"Unknown price: {price}. Available: {', '.join(PRICES)}")
+    return ticks[price].to_numpy(dtype=float)
+
+
+def build_bars(ticks: pd.DataFrame, timeframe: str = "M1", price: str = 'bid') -> pd.DataFrame:
+    """
+    OHLCV bars from time-sorted ticks
+
+    Args:
+        ticks: DataFrame with timestamp index and bid/ask columns
+        timeframe: Bar length (see bar_nanos)
+        price: 'bid' (as Dukascopy candles), 'ask' or 'mid'
+
+    Returns:
+        DataFrame with timestamp index (bar start) and open, high, low,
+        close, volume (ticks per bar); bars without ticks are absent
+    """
+    step = bar_nanos(timeframe)
+    values = tick_prices(ticks, price)
+    times = ticks.index.as_unit('ns').asi8
+    valid = ~np.isnan(values)
+    if not valid.all():
+        values, times = values[valid], times[valid]
+
+    if len(values) == 0:
+        return _empty_bars()
+
+    bucket = times // step
+    starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+    stops = np.append(starts[1:], len(values))
+
+    return pd.DataFrame({
+        'open': values[starts],
+        'high': np.maximum.reduceat(values, starts),
+        'low': np.minimum.reduceat(values, starts),
+        'close': values[stops - 1],
+        'volume': (stops - starts).astype(float),
+    }, index=pd.DatetimeIndex((bucket[starts] * step).astype('datetime64[ns]'), name='timestamp'))
+
+
+def merge_bars(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate time-ordered bar frames
+
+    A bar split between two frames (a custom-length bar straddling a
+    month boundary) is combined into one.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return _empty_bars()
+    df = pd.concat(frames)
+    if df.index.is_unique:
+        return df
+    return df.groupby(level=0, sort=False).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    })
+
+
+class TickStore:
+    """Month-partitioned tick files with cached bars (see module docstring)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, symbol: str, month: str) -> Path:
+        return self.root / symbol / f"{month}.parquet"
+
+    def symbols(self) -> List[str]:
+        """Symbols with tick files"""
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and self.months(p.name))
+
+    def months(self, symbol: str) -> List[str]:
+        """Months (YYYY-MM) with tick files, in order"""
+        directory = self.root / symbol
+        if not directory.is_dir():
+            return []
+        return sorted(p.stem for p in directory.glob("*.parquet") if _MONTH.match(p.stem))
+
+    def write(self, symbol: str, ticks: pd.DataFrame) -> int:
+        """
+        Store ticks, replacing any stored ticks in the time span they cover
+
+        Appending the latest ticks, back-filling and re-ingesting a month
+        all go through here. Ticks with the same timestamp keep their
+        input order.
+
+        Args:
+            symbol: Symbol name
+            ticks: DataFrame with timestamp index (tz-naive UTC), bid, ask
+                   and optional bid_volume, ask_volume
+
+        Returns:
+            Ticks written
+        """
+        missing = [c for c in PRICE_COLUMNS if c not in ticks.columns]
+        if missing:
+            raise ValueError(f"Missing tick columns: {missing}")
+        if ticks.empty:
+            return 0
+
+        columns = [c for c in TICK_COLUMNS if c in ticks.columns]
+        times = ticks.index.as_unit('ns').asi8
+        order = np.argsort(times, kind='stable')
+        ticks, times = ticks.iloc[order][columns], times[order]
+
+        months = _month(times)
+        bounds = np.flatnonzero(np.concatenate([[True], months[1:] != months[:-1], [True]]))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            new = ticks.iloc[start:stop]
+            path = self.path(symbol, months[start])
+            if path.exists():
+                old = self._read_file(path)
+                outside = (old.index < new.index[0]) | (old.index > new.index[-1])
+                old = old[outside]
+                split = old.index.searchsorted(new.index[0])
+                new = pd.concat([old.iloc[:split], new, old.iloc[split:]])
+            self._write_file(new, path)
+
+        return len(ticks)
+
+    def read(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """Ticks of a symbol (end_date inclusive, as DataLoader.load)"""
+        frames = [self._read_file(self.path(symbol, month)) for month in self._select(symbol, start_date, end_date)]
+        if not frames:
+            raise FileNotFoundError(f"No ticks for {symbol} in {self.root}")
+        return self._slice(pd.concat(frames), start_date, end_date)
+
+    def bars(
+        self,
+        symbol: str,
+        timeframe: str = "M1",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        price: str = 'bid'
+    ) -> pd.DataFrame:
+        """
+        Bars built from the ticks, month by month through the cache
+
+        Args:
+            symbol: Symbol name
+            timeframe: Bar length (see bar_nanos)
+            start_date: Start date, optional
+            end_date: End date (inclusive), optional
+            price: 'bid', 'ask' or 'mid'
+
+        Returns:
+            DataFrame with timestamp index and OHLCV columns
+        """
+        step = bar_nanos(timeframe)
+        months = self._select(symbol, start_date, end_date)
+        if not months:
+            raise FileNotFoundError(f"No ticks for {symbol} in {self.root}")
+
+        # A bar that does not divide a day can straddle the month end; take its ticks from the next month
+        stored = self.months(symbol)
+        following = stored.index(months[-1]) + 1
+        if _NS_PER_DAY % step and following < len(stored):
+            months.append(stored[following])
+
+        bars = merge_bars([self._month_bars(symbol, month, timeframe, price) for month in months])
+        return self._slice(bars, start_date, end_date)
+
+    def clear_cache(self, symbol: str):
+        """Delete a symbol's cached bars"""
+        directory = self.root / symbol / BARS_DIR
+        for path in directory.glob("*/*.parquet"):
+            path.unlink()
+
+    def _month_bars(self, symbol: str, month: str, timeframe: str, price: str) -> pd.DataFrame:
+        """One month's bars, from the cache while the tick file is unchanged"""
+        source = self.path(symbol, month)
+        stat = source.stat()
+        fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+        cache = self.root / symbol / BARS_DIR / f"{timeframe}_{price}" / f"{month}.parquet"
+
+        if cache.exists() and (pq.read_schema(cache).metadata or {}).get(_SOURCE) == fingerprint:
+            return pd.read_parquet(cache).set_index('timestamp')
+
+        bars = build_bars(self._read_file(source), timeframe, price)
+        table = pa.Table.from_pandas(bars.reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE: fingerprint})
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(cache.name + ".tmp")
+        pq.write_table(table, tmp, compression=COMPRESSION)
+        os.replace(tmp, cache)
+        return bars
+
+    def _select(self, symbol: str, start_date: Optional[str], end_date: Optional[str]) -> List[str]:
+        """Stored months overlapping [start_date, end_date]"""
+        first = pd.Timestamp(start_date).strftime('%Y-%m') if start_date else None
+        last = pd.Timestamp(end_date).strftime('%Y-%m') if end_date else None
+        return [m for m in self.months(symbol) if (first is None or m >= first) and (last is None or m <= last)]
+
+    @staticmethod
+    def _slice(df: pd.DataFrame, start_date: Optional[str], end_date: Optional[str]) -> pd.DataFrame:
+        lo = df.index.searchsorted(pd.Timestamp(start_date)) if start_date else 0
+        hi = df.index.searchsorted(pd.Timestamp(end_date), side='right') if end_date else len(df)
+        return df.iloc[lo:hi]
+
+    @staticmethod
+    def _write_file(ticks: pd.DataFrame, path: Path):
+        """Write one month of ticks with delta-encoded timestamps and prices"""
+        arrays = {'timestamp': pa.array(ticks.index.as_unit('ns').asi8 // _NS_PER_MS, pa.int64())}
+        encoding = {'timestamp': 'DELTA_BINARY_PACKED'}
+        points = []
+        for column in ticks.columns:
+            values = ticks[column].to_numpy(dtype=float)
+            decimals = _decimals(values) if column in PRICE_COLUMNS else None
+            if decimals is not None and not np.isnan(values).any():
+                arrays[column] = pa.array(np.round(values * 10 ** decimals).astype(np.int64))
+                encoding[column] = 'DELTA_BINARY_PACKED'
+                points.append(f"{column}={decimals}")
+            elif column in PRICE_COLUMNS:
+                arrays[column] = pa.array(values)
+            else:
+                arrays[column] = pa.array(values.astype(np.float32))
+
+        table = pa.table(arrays).replace_schema_metadata({_POINTS: ",".join(points).encode()})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(table, tmp, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE,
+                       use_dictionary=[c for c in arrays if c not in encoding], column_encoding=encoding)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_file(path: Path) -> pd.DataFrame:
+        """One month of ticks with float prices and a timestamp index"""
+        table = pq.read_table(path)
+        scales = (table.schema.metadata or {}).get(_POINTS, b"").decode()
+        decimals = dict(item.split("=") for item in scales.split(",") if item)
+
+        columns = {}
+        for name in table.column_names[1:]:
+            values = table.column(name).to_numpy()
+            columns[name] = values / 10 ** int(decimals[name]) if name in decimals else values.astype(float)
+        index = pd.DatetimeIndex(
+            (table.column('timestamp').to_numpy() * _NS_PER_MS).astype('datetime64[ns]'), name='timestamp'
+        )
+        return pd.DataFrame(columns, index=index)
@@ -7,6 +7,7 @@ Initial Data Exploration
 4. Test trend analyzer
 """
 
+import logging
 import sys
 from pathlib import Path
 
@@ -22,25 +23,28 @@ from data.data_loader import DataLoader
 from zones.detector import ZoneDetector, ZoneType, ZoneFreshness
 from zones.time_filter import PeriodicOBFilter, SessionFilter
 from strategies.trend_analyzer import TrendAnalyzer, MultiTimeframeTrend
+from utils.reporting import get_logger, log_event
+
+log = get_logger('notebooks.01_initial_exploration')
 
 # Set display options
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 120)
 
-print("="*80)
-print("SD_Trend_Universal_Research - Initial Data Exploration")
-print("="*80)
+log.info("="*80)
+log.info("SD_Trend_Universal_Research - Initial Data Exploration")
+log.info("="*80)
 
 # ============================================================================
 # STEP 1: Load Data
 # ============================================================================
-print("\n[STEP 1] Loading XAUUSD data...")
+log.info("\n[STEP 1] Loading XAUUSD data...")
 
 loader = DataLoader()
 
 # Check available data
-print(f"\nAvailable timeframes: {loader.list_available_timeframes()}")
-print(f"\nAvailable symbols (M5): {loader.list_available_symbols('M5')}")
+log.info(f"\nAvailable timeframes: {loader.list_available_timeframes()}")
+log.info(f"\nAvailable symbols (M5): {loader.list_available_symbols('M5')}")
 
 # Load XAUUSD multi-timeframe
 try:
@@ -51,7 +55,7 @@ try:
     end_date = "2024-12-31"
     start_date = "2024-10-01"
 
-    print(f"\nLoading {symbol} data: {start_date} to {end_date}")
+    log.info(f"\nLoading {symbol} data: {start_date} to {end_date}")
 
     data = loader.load_multiple_timeframes(
         symbol,
@@ -60,29 +64,29 @@ try:
         end_date=end_date
     )
 
-    print(f"\nLoaded {len(data)} timeframes:")
+    log.info(f"\nLoaded {len(data)} timeframes:")
     for tf, df in data.items():
-        print(f"  {tf}: {len(df):,} bars ({df.index[0]} to {df.index[-1]})")
-        print(f"       Columns: {df.columns.tolist()}")
+        log.info(f"  {tf}: {len(df):,} bars ({df.index[0]} to {df.index[-1]})")
+        log.info(f"       Columns: {df.columns.tolist()}")
 
 except Exception as e:
-    print(f"Error loading data: {e}")
-    print("\nTrying to find available files...")
+    log_event(log, 'load_failed', f"Error loading data: {e}", level=logging.ERROR, error=str(e))
+    log.info("\nTrying to find available files...")
     import os
     m5_path = Path("../MFX_Research_to_Prod/data/raw/parquet/M5")
     if m5_path.exists():
         files = list(m5_path.glob("*.parquet"))
-        print(f"Found {len(files)} files in M5 directory")
+        log.info(f"Found {len(files)} files in M5 directory")
         for f in files[:10]:
-            print(f"  - {f.name}")
+            log.info(f"  - {f.name}")
     sys.exit(1)
 
 # ============================================================================
 # STEP 2: Test Periodic OB Time Filter
 # ============================================================================
-print("\n\n" + "="*80)
-print("[STEP 2] Testing Periodic OB Time Filter")
-print("="*80)
+log.info("\n\n" + "="*80)
+log.info("[STEP 2] Testing Periodic OB Time Filter")
+log.info("="*80)
 
 ob_filter = PeriodicOBFilter(
     hourly_window_mins=5,      # xx:55 - xx:05
@@ -93,39 +97,39 @@ ob_filter = PeriodicOBFilter(
 df_m5 = data["M5"]
 stats = ob_filter.get_ob_statistics(df_m5)
 
-print("\nTime Window Statistics (M5 data):")
-print(f"  Total bars: {stats['total_bars']:,}")
-print(f"  Hourly turn bars: {stats['hourly_turn_bars']:,} ({stats['hourly_turn_pct']:.1f}%)")
-print(f"  Half-hour bars: {stats['half_hour_bars']:,} ({stats['half_hour_pct']:.1f}%)")
-print(f"  All OB time bars: {stats['ob_bars']:,} ({stats['ob_pct']:.1f}%)")
-print(f"  Other time bars: {stats['other_bars']:,} ({stats['other_pct']:.1f}%)")
+log.info("\nTime Window Statistics (M5 data):")
+log.info(f"  Total bars: {stats['total_bars']:,}")
+log.info(f"  Hourly turn bars: {stats['hourly_turn_bars']:,} ({stats['hourly_turn_pct']:.1f}%)")
+log.info(f"  Half-hour bars: {stats['half_hour_bars']:,} ({stats['half_hour_pct']:.1f}%)")
+log.info(f"  All OB time bars: {stats['ob_bars']:,} ({stats['ob_pct']:.1f}%)")
+log.info(f"  Other time bars: {stats['other_bars']:,} ({stats['other_pct']:.1f}%)")
 
 # Add time features
 df_m5 = ob_filter.add_time_features(df_m5)
 
 # Show sample OB times
-print("\n\nSample timestamps in OB windows:")
+log.info("\n\nSample timestamps in OB windows:")
 ob_samples = df_m5[df_m5['is_ob_time']].head(20)
 for idx, row in ob_samples.iterrows():
     zone_type = row['time_zone'].value if hasattr(row['time_zone'], 'value') else row['time_zone']
-    print(f"  {idx.strftime('%Y-%m-%d %H:%M')} - {zone_type}")
+    log.info(f"  {idx.strftime('%Y-%m-%d %H:%M')} - {zone_type}")
 
 # Session analysis
 session_filter = SessionFilter()
 df_m5 = session_filter.add_session_features(df_m5)
 
-print("\n\nSession distribution:")
+log.info("\n\nSession distribution:")
 session_counts = df_m5['session'].value_counts()
 for session, count in session_counts.items():
     pct = count / len(df_m5) * 100
-    print(f"  {session}: {count:,} bars ({pct:.1f}%)")
+    log.info(f"  {session}: {count:,} bars ({pct:.1f}%)")
 
 # ============================================================================
 # STEP 3: Test Zone Detector
 # ============================================================================
-print("\n\n" + "="*80)
-print("[STEP 3] Testing Zone Detector")
-print("="*80)
+log.info("\n\n" + "="*80)
+log.info("[STEP 3] Testing Zone Detector")
+log.info("="*80)
 
 zone_detector = ZoneDetector(
     lookback_periods=100,
@@ -135,37 +139,37 @@ zone_detector = ZoneDetector(
     freshness_max_age=50
 )
 
-print("\nDetecting zones on XAUUSD M5 data...")
-print("(This may take a minute...)")
+log.info("\nDetecting zones on XAUUSD M5 data...")
+log.info("(This may take a minute...)")
 
 # Detect zones (use only first 1000 bars for speed)
 df_test = df_m5.head(2000)[['open', 'high', 'low', 'close', 'volume']]
 zones = zone_detector.detect_zones(df_test)
 
-print(f"\n\nDetected {len(zones)} zones")
-print(f"  Supply zones: {sum(1 for z in zones if z.zone_type == ZoneType.SUPPLY)}")
-print(f"  Demand zones: {sum(1 for z in zones if z.zone_type == ZoneType.DEMAND)}")
-print(f"\n  Fresh zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.FRESH)}")
-print(f"  Tested zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.TESTED)}")
-print(f"  Broken zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.BROKEN)}")
+log.info(f"\n\nDetected {len(zones)} zones")
+log.info(f"  Supply zones: {sum(1 for z in zones if z.zone_type == ZoneType.SUPPLY)}")
+log.info(f"  Demand zones: {sum(1 for z in zones if z.zone_type == ZoneType.DEMAND)}")
+log.info(f"\n  Fresh zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.FRESH)}")
+log.info(f"  Tested zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.TESTED)}")
+log.info(f"  Broken zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.BROKEN)}")
 
 # Show top zones by strength
 zones_by_strength = sorted(zones, key=lambda z: z.strength, reverse=True)
 
-print("\n\nTop 10 strongest zones:")
-print(f"{'Type':<8} {'Price Range':<20} {'Created':<20} {'Strength':<10} {'Status':<10}")
-print("-" * 80)
+log.info("\n\nTop 10 strongest zones:")
+log.info(f"{'Type':<8} {'Price Range':<20} {'Created':<20} {'Strength':<10} {'Status':<10}")
+log.info("-" * 80)
 for i, zone in enumerate(zones_by_strength[:10], 1):
     price_range = f"{zone.bottom:.2f} - {zone.top:.2f}"
     created = zone.creation_time.strftime('%Y-%m-%d %H:%M')
-    print(f"{zone.zone_type.value:<8} {price_range:<20} {created:<20} {zone.strength:<10.3f} {zone.freshness.value:<10}")
+    log.info(f"{zone.zone_type.value:<8} {price_range:<20} {created:<20} {zone.strength:<10.3f} {zone.freshness.value:<10}")
 
 # ============================================================================
 # STEP 4: Test Trend Analyzer
 # ============================================================================
-print("\n\n" + "="*80)
-print("[STEP 4] Testing Multi-Timeframe Trend Analyzer")
-print("="*80)
+log.info("\n\n" + "="*80)
+log.info("[STEP 4] Testing Multi-Timeframe Trend Analyzer")
+log.info("="*80)
 
 # Prepare data for trend analysis (remove extra columns)
 mtf_data = {}
@@ -176,25 +180,25 @@ for tf in ["M5", "M15", "H1"]:
 mtf_trend = MultiTimeframeTrend(mtf_data)
 trends = mtf_trend.analyze_all()
 
-print("\nTrend Analysis (latest state):")
-print(f"{'Timeframe':<12} {'Direction':<12} {'Regime':<12} {'Strength':<10} {'ADX':<8} {'Hurst':<8}")
-print("-" * 80)
+log.info("\nTrend Analysis (latest state):")
+log.info(f"{'Timeframe':<12} {'Direction':<12} {'Regime':<12} {'Strength':<10} {'ADX':<8} {'Hurst':<8}")
+log.info("-" * 80)
 for tf, state in trends.items():
-    print(f"{tf:<12} {state.direction.value:<12} {state.regime.value:<12} "
+    log.info(f"{tf:<12} {state.direction.value:<12} {state.regime.value:<12} "
           f"{state.strength:<10.3f} {state.adx:<8.2f} {state.hurst:<8.3f}")
 
-print(f"\n\nMulti-Timeframe Summary:")
-print(f"  Trend aligned: {mtf_trend.is_aligned(required_timeframes=2)}")
-print(f"  Dominant direction: {mtf_trend.get_dominant_direction().value}")
-print(f"  Dominant regime: {mtf_trend.get_dominant_regime().value}")
-print(f"  Average strength: {mtf_trend.get_average_strength():.3f}")
+log.info(f"\n\nMulti-Timeframe Summary:")
+log.info(f"  Trend aligned: {mtf_trend.is_aligned(required_timeframes=2)}")
+log.info(f"  Dominant direction: {mtf_trend.get_dominant_direction().value}")
+log.info(f"  Dominant regime: {mtf_trend.get_dominant_regime().value}")
+log.info(f"  Average strength: {mtf_trend.get_average_strength():.3f}")
 
 # ============================================================================
 # STEP 5: Combine Zones + OB Times
 # ============================================================================
-print("\n\n" + "="*80)
-print("[STEP 5] Analyzing Zones Created During OB Times")
-print("="*80)
+log.info("\n\n" + "="*80)
+log.info("[STEP 5] Analyzing Zones Created During OB Times")
+log.info("="*80)
 
 # Check which zones were created during OB times
 zones_with_time = []
@@ -210,26 +214,26 @@ for zone in zones:
 ob_zones = [z for z in zones_with_time if z['is_ob_time']]
 other_zones = [z for z in zones_with_time if not z['is_ob_time']]
 
-print(f"\nZones created during OB times: {len(ob_zones)} ({len(ob_zones)/len(zones)*100:.1f}%)")
-print(f"Zones created during other times: {len(other_zones)} ({len(other_zones)/len(zones)*100:.1f}%)")
+log.info(f"\nZones created during OB times: {len(ob_zones)} ({len(ob_zones)/len(zones)*100:.1f}%)")
+log.info(f"Zones created during other times: {len(other_zones)} ({len(other_zones)/len(zones)*100:.1f}%)")
 
 # Compare average strength
 ob_strength = np.mean([z['zone'].strength for z in ob_zones]) if ob_zones else 0
 other_strength = np.mean([z['zone'].strength for z in other_zones]) if other_zones else 0
 
-print(f"\nAverage zone strength:")
-print(f"  OB times: {ob_strength:.3f}")
-print(f"  Other times: {other_strength:.3f}")
-print(f"  Difference: {ob_strength - other_strength:+.3f} ({(ob_strength/other_strength - 1)*100:+.1f}%)")
+log.info(f"\nAverage zone strength:")
+log.info(f"  OB times: {ob_strength:.3f}")
+log.info(f"  Other times: {other_strength:.3f}")
+log.info(f"  Difference: {ob_strength - other_strength:+.3f} ({(ob_strength/other_strength - 1)*100:+.1f}%)")
 
 # ============================================================================
 # Summary
 # ============================================================================
-print("\n\n" + "="*80)
-print("SUMMARY")
-print("="*80)
+log.info("\n\n" + "="*80)
+log.info("SUMMARY")
+log.info("="*80)
 
-print(f"""
+log.info(f"""
 Data Loaded:
   - Symbol: {symbol}
   - Date Range: {start_date} to {end_date}
@@ -253,9 +257,9 @@ Trend State:
   - Aligned: {mtf_trend.is_aligned()}
 """)
 
-print("\n" + "="*80)
-print("Exploration complete! Next steps:")
-print("  1. Create visualizations (zones on chart with OB time highlights)")
-print("  2. Backtest zone trading (OB times vs other times)")
-print("  3. Test on other instruments (EURUSD, GBPUSD, etc.)")
-print("="*80)
+log.info("\n" + "="*80)
+log.info("Exploration complete! Next steps:")
+log.info("  1. Create visualizations (zones on chart with OB time highlights)")
+log.info("  2. Backtest zone trading (OB times vs other times)")
+log.info("  3. Test on other instruments (EURUSD, GBPUSD, etc.)")
+log.info("="*80)
@@ -9,40 +9,38 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pandas as pd
 import numpy as np
 from data.data_loader import DataLoader
-from zones.detector import ZoneDetector
+from zones.detector import ZoneDetector, ZoneType, average_true_range
+from utils.reporting import get_logger
 
-print("="*80)
-print("Zone Detector Debug")
-print("="*80)
+log = get_logger('notebooks.02_debug_zone_detector')
+
+log.info("="*80)
+log.info("Zone Detector Debug")
+log.info("="*80)
 
 # Load data
 loader = DataLoader()
 df = loader.load("XAUUSD", "M5", start_date="2024-10-01", end_date="2024-10-31")
-print(f"\nLoaded {len(df):,} bars of XAUUSD M5 data")
-print(f"Date range: {df.index[0]} to {df.index[-1]}")
-print(f"Price range: {df['close'].min():.2f} to {df['close'].max():.2f}")
+log.info(f"\nLoaded {len(df):,} bars of XAUUSD M5 data")
+log.info(f"Date range: {df.index[0]} to {df.index[-1]}")
+log.info(f"Price range: {df['close'].min():.2f} to {df['close'].max():.2f}")
 
 # Prepare data
 df = df[['open', 'high', 'low', 'close', 'volume']].copy()
 
-# Calculate ATR to understand typical volatility
-high = df['high']
-low = df['low']
-close_prev = df['close'].shift(1)
-tr1 = high - low
-tr2 = abs(high - close_prev)
-tr3 = abs(low - close_prev)
-tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-atr = tr.rolling(window=14).mean()
+# ATR to understand typical volatility: the detector's own ATR through the
+# feature store, so the detector below reuses it instead of recomputing
+features = loader.feature_store().dataset("XAUUSD", "M5", df)
+atr = features.get('atr', df, average_true_range, period=14)
 df['atr'] = atr
 
-print(f"\nAverage ATR: {atr.mean():.2f}")
-print(f"ATR range: {atr.min():.2f} to {atr.max():.2f}")
+log.info(f"\nAverage ATR: {atr.mean():.2f}")
+log.info(f"ATR range: {atr.min():.2f} to {atr.max():.2f}")
 
 # Test zone detector with different parameters
-print("\n" + "="*80)
-print("Testing Zone Detector with various parameters")
-print("="*80)
+log.info("\n" + "="*80)
+log.info("Testing Zone Detector with various parameters")
+log.info("="*80)
 
 param_sets = [
     {
@@ -75,9 +73,15 @@ param_sets = [
     }
 ]
 
+# Test on subset of data. The feature pass (ATR, consolidation ranges,
+# breakout moves) only depends on min_consolidation, so it is computed once
+# per value and each parameter set just re-thresholds it.
+test_df = df.head(1000).copy()
+features_by_consolidation = {}
+
 for params in param_sets:
-    print(f"\n{params['name']}:")
-    print(f"  lookback={params['lookback']}, min_consol={params['min_consolidation']}, "
+    log.info(f"\n{params['name']}:")
+    log.info(f"  lookback={params['lookback']}, min_consol={params['min_consolidation']}, "
           f"zone_width={params['zone_width_atr']}x ATR, min_velocity={params['min_velocity_atr']}x ATR")
 
     detector = ZoneDetector(
@@ -87,32 +91,34 @@ for params in param_sets:
         min_velocity_atr=params['min_velocity_atr']
     )
 
-    # Test on subset of data
-    test_df = df.head(1000).copy()
-    zones = detector.detect_zones(test_df)
+    if params['min_consolidation'] not in features_by_consolidation:
+        features_by_consolidation[params['min_consolidation']] = detector.compute_features(
+            test_df, feature_store=features
+        )
+    zones = detector.zones_from_features(features_by_consolidation[params['min_consolidation']])
 
-    print(f"  -> Found {len(zones)} zones")
+    log.info(f"  -> Found {len(zones)} zones")
 
     if len(zones) > 0:
-        print(f"     Supply: {sum(1 for z in zones if z.zone_type.value == 'supply')}, "
-              f"Demand: {sum(1 for z in zones if z.zone_type.value == 'demand')}")
+        log.info(f"     Supply: {zones.count(ZoneType.SUPPLY)}, "
+              f"Demand: {zones.count(ZoneType.DEMAND)}")
 
         # Show top 3
-        sorted_zones = sorted(zones, key=lambda z: z.strength, reverse=True)
-        print("     Top 3 zones:")
+        sorted_zones = zones.sort_by('strength')
+        log.info("     Top 3 zones:")
         for i, zone in enumerate(sorted_zones[:3], 1):
-            print(f"       {i}. {zone.zone_type.value.upper()}: "
+            log.info(f"       {i}. {zone.zone_type.value.upper()}: "
                   f"{zone.bottom:.2f}-{zone.top:.2f}, "
                   f"strength={zone.strength:.3f}, "
                   f"velocity={zone.velocity:.2f}x ATR")
 
 # Let's manually check for consolidation patterns
-print("\n" + "="*80)
-print("Manual Pattern Detection")
-print("="*80)
+log.info("\n" + "="*80)
+log.info("Manual Pattern Detection")
+log.info("="*80)
 
 # Look for periods of low volatility followed by sharp moves
-print("\nScanning for consolidation -> breakout patterns...")
+log.info("\nScanning for consolidation -> breakout patterns...")
 
 window = 10  # Look at 10-candle windows
 breakouts = []
@@ -146,19 +152,19 @@ for i in range(100, len(df) - 10):
                 'move_atr_multiple': max_move / consol_atr
             })
 
-print(f"\nFound {len(breakouts)} consolidation -> breakout patterns")
+log.info(f"\nFound {len(breakouts)} consolidation -> breakout patterns")
 
 if breakouts:
-    print("\nSample patterns:")
+    log.info("\nSample patterns:")
     for i, b in enumerate(breakouts[:10], 1):
-        print(f"  {i}. {b['timestamp'].strftime('%Y-%m-%d %H:%M')} - "
+        log.info(f"  {i}. {b['timestamp'].strftime('%Y-%m-%d %H:%M')} - "
               f"{b['direction']} breakout, "
               f"move={b['move']:.2f} ({b['move_atr_multiple']:.2f}x ATR)")
 
-print("\n" + "="*80)
-print("Conclusion")
-print("="*80)
-print("""
+log.info("\n" + "="*80)
+log.info("Conclusion")
+log.info("="*80)
+log.info("""
 If very relaxed parameters still find 0 zones:
   1. The detection algorithm may need refinement
   2. The consolidation detection logic may be too strict
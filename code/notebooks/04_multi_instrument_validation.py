@@ -15,6 +15,7 @@ Validates:
 4. Parameter universality
 """
 
+import logging
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,18 +26,21 @@ from datetime import datetime
 from typing import Dict, List
 
 from data.data_loader import DataLoader
-from zones.detector import ZoneDetector, ZoneType, ZoneFreshness
+from zones.detector import ZoneDetector, ZoneType, ZoneFreshness, average_true_range
 from zones.time_filter import PeriodicOBFilter, SessionFilter
 from strategies.trend_analyzer import TrendAnalyzer, MultiTimeframeTrend
+from utils.reporting import get_logger, log_event
+
+log = get_logger('notebooks.04_multi_instrument_validation')
 
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 140)
 
-print("="*100)
-print("MULTI-INSTRUMENT VALIDATION - Universal Buy/Sell Zone Indicator")
-print("="*100)
-print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*100)
+log.info("="*100)
+log.info("MULTI-INSTRUMENT VALIDATION - Universal Buy/Sell Zone Indicator")
+log.info("="*100)
+log.info(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+log.info("="*100)
 
 # ============================================================================
 # CONFIGURATION
@@ -69,89 +73,88 @@ OB_PARAMS = {
 
 # Store results
 results = {}
+zone_times = {}     # Symbol -> zone creation times, for the panel section
 
 # ============================================================================
 # VALIDATION LOOP
 # ============================================================================
 loader = DataLoader()
+feature_store = loader.feature_store()  # ATR, ADX, time/session features, persisted with the bars
 ob_filter = PeriodicOBFilter(**OB_PARAMS)
 session_filter = SessionFilter()
 
 for symbol in INSTRUMENTS:
-    print(f"\n{'='*100}")
-    print(f"VALIDATING: {symbol}")
-    print(f"{'='*100}")
+    log.info(f"\n{'='*100}")
+    log.info(f"VALIDATING: {symbol}")
+    log.info(f"{'='*100}")
 
     try:
         # Load data
-        print(f"\n[1/4] Loading {symbol} data...")
+        log.info(f"\n[1/4] Loading {symbol} data...")
         data = loader.load_multiple_timeframes(symbol, TIMEFRAMES, START_DATE, END_DATE)
 
         if len(data) == 0:
-            print(f"  ERROR: No data available for {symbol}")
+            log_event(log, 'no_data', f"  ERROR: No data available for {symbol}", level=logging.ERROR, symbol=symbol)
             results[symbol] = {'error': 'No data available'}
             continue
 
-        print(f"  Loaded {len(data)} timeframes:")
+        log.info(f"  Loaded {len(data)} timeframes:")
         for tf, df in data.items():
-            print(f"    - {tf}: {len(df):,} bars")
+            log.info(f"    - {tf}: {len(df):,} bars")
 
         # Get M5 data for zone detection
         if "M5" not in data:
-            print(f"  ERROR: M5 data not available for {symbol}")
+            log_event(log, 'no_data', f"  ERROR: M5 data not available for {symbol}",
+                      level=logging.ERROR, symbol=symbol, timeframe="M5")
             results[symbol] = {'error': 'M5 data missing'}
             continue
 
+        features = {tf: feature_store.dataset(symbol, tf, df) for tf, df in data.items()}
+        m5_features = features["M5"]
         df_m5 = data["M5"].copy()
 
         # Calculate basic statistics
-        df_m5 = ob_filter.add_time_features(df_m5)
-        df_m5 = session_filter.add_session_features(df_m5)
-
-        # Calculate ATR
-        high = df_m5['high']
-        low = df_m5['low']
-        close_prev = df_m5['close'].shift(1)
-        tr1 = high - low
-        tr2 = abs(high - close_prev)
-        tr3 = abs(low - close_prev)
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=14).mean()
+        df_m5 = ob_filter.add_time_features(df_m5, m5_features)
+        df_m5 = session_filter.add_session_features(df_m5, m5_features)
+
+        # ATR (shared with the zone detector through the feature store)
+        atr = m5_features.get('atr', df_m5, average_true_range, period=14)
 
         avg_atr = atr.mean()
         price_range = df_m5['close'].max() - df_m5['close'].min()
 
-        print(f"\n[2/4] Price & Volatility Statistics:")
-        print(f"  Price range: {df_m5['close'].min():.5f} - {df_m5['close'].max():.5f}")
-        print(f"  Average ATR: {avg_atr:.5f}")
-        print(f"  ATR/Price ratio: {avg_atr/df_m5['close'].mean()*100:.3f}%")
+        log.info(f"\n[2/4] Price & Volatility Statistics:")
+        log.info(f"  Price range: {df_m5['close'].min():.5f} - {df_m5['close'].max():.5f}")
+        log.info(f"  Average ATR: {avg_atr:.5f}")
+        log.info(f"  ATR/Price ratio: {avg_atr/df_m5['close'].mean()*100:.3f}%")
 
         # OB time statistics
-        stats = ob_filter.get_ob_statistics(df_m5)
+        stats = ob_filter.get_ob_statistics(df_m5, m5_features)
 
-        print(f"\n[3/4] OB Time Window Analysis:")
-        print(f"  Total bars: {stats['total_bars']:,}")
-        print(f"  OB time bars: {stats['ob_bars']:,} ({stats['ob_pct']:.1f}%)")
-        print(f"    - Hourly turn: {stats['hourly_turn_bars']:,} ({stats['hourly_turn_pct']:.1f}%)")
-        print(f"    - Half-hour: {stats['half_hour_bars']:,} ({stats['half_hour_pct']:.1f}%)")
+        log.info(f"\n[3/4] OB Time Window Analysis:")
+        log.info(f"  Total bars: {stats['total_bars']:,}")
+        log.info(f"  OB time bars: {stats['ob_bars']:,} ({stats['ob_pct']:.1f}%)")
+        log.info(f"    - Hourly turn: {stats['hourly_turn_bars']:,} ({stats['hourly_turn_pct']:.1f}%)")
+        log.info(f"    - Half-hour: {stats['half_hour_bars']:,} ({stats['half_hour_pct']:.1f}%)")
 
         # Zone detection
-        print(f"\n[4/4] Zone Detection (params: velocity={ZONE_PARAMS['min_velocity_atr']}x ATR, "
+        log.info(f"\n[4/4] Zone Detection (params: velocity={ZONE_PARAMS['min_velocity_atr']}x ATR, "
               f"consol={ZONE_PARAMS['min_consolidation_candles']} candles):")
 
         zone_detector = ZoneDetector(**ZONE_PARAMS)
         df_zones = df_m5[['open', 'high', 'low', 'close', 'volume']].copy()
-        zones = zone_detector.detect_zones(df_zones)
+        zones = zone_detector.detect_zones(df_zones, feature_store=m5_features)
 
-        print(f"  Total zones: {len(zones)}")
+        log.info(f"  Total zones: {len(zones)}")
+        zone_times[symbol] = zones.creation_times
 
         if len(zones) > 0:
             supply_zones = sum(1 for z in zones if z.zone_type == ZoneType.SUPPLY)
             demand_zones = sum(1 for z in zones if z.zone_type == ZoneType.DEMAND)
             fresh_zones = sum(1 for z in zones if z.freshness == ZoneFreshness.FRESH)
 
-            print(f"    - Supply: {supply_zones}, Demand: {demand_zones}")
-            print(f"    - Fresh: {fresh_zones}, Tested: {len(zones)-fresh_zones}")
+            log.info(f"    - Supply: {supply_zones}, Demand: {demand_zones}")
+            log.info(f"    - Fresh: {fresh_zones}, Tested: {len(zones)-fresh_zones}")
 
             # Classify by OB time
             zones_with_time = []
@@ -172,26 +175,26 @@ for symbol in INSTRUMENTS:
             ob_strength = np.mean([z['zone'].strength for z in ob_zones]) if ob_zones else 0
             other_strength = np.mean([z['zone'].strength for z in other_zones]) if other_zones else 0
 
-            print(f"\n  OB Time Correlation:")
-            print(f"    - Zones in OB windows: {len(ob_zones)} ({ob_pct:.1f}%)")
-            print(f"    - Expected (baseline): {stats['ob_pct']:.1f}%")
-            print(f"    - Concentration factor: {ob_pct/stats['ob_pct']:.2f}x" if stats['ob_pct'] > 0 else "    - N/A")
+            log.info(f"\n  OB Time Correlation:")
+            log.info(f"    - Zones in OB windows: {len(ob_zones)} ({ob_pct:.1f}%)")
+            log.info(f"    - Expected (baseline): {stats['ob_pct']:.1f}%")
+            log.info(f"    - Concentration factor: {ob_pct/stats['ob_pct']:.2f}x" if stats['ob_pct'] > 0 else "    - N/A")
 
             if ob_zones and other_zones:
                 strength_diff = ob_strength - other_strength
                 strength_diff_pct = (ob_strength / other_strength - 1) * 100 if other_strength > 0 else 0
-                print(f"\n  Zone Strength:")
-                print(f"    - Average: {avg_strength:.3f}")
-                print(f"    - OB times: {ob_strength:.3f}")
-                print(f"    - Other times: {other_strength:.3f}")
-                print(f"    - Difference: {strength_diff:+.3f} ({strength_diff_pct:+.1f}%)")
+                log.info(f"\n  Zone Strength:")
+                log.info(f"    - Average: {avg_strength:.3f}")
+                log.info(f"    - OB times: {ob_strength:.3f}")
+                log.info(f"    - Other times: {other_strength:.3f}")
+                log.info(f"    - Difference: {strength_diff:+.3f} ({strength_diff_pct:+.1f}%)")
 
             # Top zones
             zones_sorted = sorted(zones, key=lambda z: z.strength, reverse=True)[:3]
-            print(f"\n  Top 3 Zones:")
+            log.info(f"\n  Top 3 Zones:")
             for i, z in enumerate(zones_sorted, 1):
                 ob_flag = "[OB]" if ob_filter.is_ob_time(z.creation_time) else "    "
-                print(f"    {i}. {ob_flag} {z.zone_type.value.upper()}: "
+                log.info(f"    {i}. {ob_flag} {z.zone_type.value.upper()}: "
                       f"{z.bottom:.5f}-{z.top:.5f}, strength={z.strength:.3f}")
 
         # Multi-timeframe trend
@@ -201,15 +204,15 @@ for symbol in INSTRUMENTS:
                 mtf_data[tf] = data[tf][['open', 'high', 'low', 'close', 'volume']].copy()
 
         if len(mtf_data) >= 2:
-            mtf_trend = MultiTimeframeTrend(mtf_data)
+            mtf_trend = MultiTimeframeTrend(mtf_data, feature_stores=features)
             trends = mtf_trend.analyze_all()
 
-            print(f"\n  Multi-Timeframe Trend (latest):")
+            log.info(f"\n  Multi-Timeframe Trend (latest):")
             for tf, state in trends.items():
-                print(f"    {tf}: {state.direction.value} ({state.regime.value}), "
+                log.info(f"    {tf}: {state.direction.value} ({state.regime.value}), "
                       f"strength={state.strength:.3f}, ADX={state.adx:.1f}")
 
-            print(f"    Aligned: {mtf_trend.is_aligned()}, "
+            log.info(f"    Aligned: {mtf_trend.is_aligned()}, "
                   f"Dominant: {mtf_trend.get_dominant_direction().value}")
 
         # Store results
@@ -233,7 +236,7 @@ for symbol in INSTRUMENTS:
         }
 
     except Exception as e:
-        print(f"\n  ERROR: {e}")
+        log_event(log, 'instrument_failed', f"\n  ERROR: {e}", level=logging.ERROR, symbol=symbol, error=str(e))
         import traceback
         traceback.print_exc()
         results[symbol] = {'error': str(e)}
@@ -241,17 +244,18 @@ for symbol in INSTRUMENTS:
 # ============================================================================
 # COMPARATIVE ANALYSIS
 # ============================================================================
-print(f"\n\n{'='*100}")
-print("COMPARATIVE ANALYSIS - All Instruments")
-print(f"{'='*100}")
+log.info(f"\n\n{'='*100}")
+log.info("COMPARATIVE ANALYSIS - All Instruments")
+log.info(f"{'='*100}")
 
 # Create comparison table
-print(f"\n{'Instrument':<10} {'Bars':>8} {'Avg ATR':>10} {'Zones':>7} {'OB%':>6} {'Conc':>6} {'Strength+':>10} {'Trend':>10}")
-print("-"*100)
+log.info(f"\n{'Instrument':<10} {'Bars':>8} {'Avg ATR':>10} {'Zones':>7} {'OB%':>6} {'Conc':>6} {'Strength+':>10} {'Trend':>10}")
+log.info("-"*100)
 
 for symbol, data in results.items():
     if 'error' in data:
-        print(f"{symbol:<10} ERROR: {data['error']}")
+        log_event(log, 'instrument_failed', f"{symbol:<10} ERROR: {data['error']}",
+                  level=logging.ERROR, symbol=symbol, error=data['error'])
     else:
         bars = f"{data['bars']:,}"
         atr = f"{data['avg_atr']:.5f}"
@@ -261,76 +265,105 @@ for symbol, data in results.items():
         boost = f"{data['strength_boost_pct']:+.1f}%" if data['strength_boost_pct'] != 0 else "N/A"
         trend = f"{data['dominant_direction']}" if data['dominant_direction'] else "N/A"
 
-        print(f"{symbol:<10} {bars:>8} {atr:>10} {zones:>7} {ob_pct:>6} {conc:>6} {boost:>10} {trend:>10}")
+        log.info(f"{symbol:<10} {bars:>8} {atr:>10} {zones:>7} {ob_pct:>6} {conc:>6} {boost:>10} {trend:>10}")
+
+# ============================================================================
+# CROSS-INSTRUMENT PANEL
+# ============================================================================
+# The same statistics for all instruments in one vectorized pass over a
+# timestamp-aligned (symbol x time x field) panel
+log.info(f"\n\n{'='*100}")
+log.info("CROSS-INSTRUMENT PANEL - M5, aligned on time")
+log.info(f"{'='*100}")
+
+panel = loader.load_panel(INSTRUMENTS, "M5", START_DATE, END_DATE)
+if panel.symbols:
+    log.info(f"\n{panel}")
+
+    atr = panel.atr(14)
+    is_ob = ob_filter.time_features(panel.frame_index())['is_ob_time'].to_numpy()
+    avg_atr = panel.mean(atr)
+    atr_pct = panel.mean(atr / panel.field('close') * 100)
+    ob_share = panel.share(is_ob) * 100
+    zone_share = panel.share(is_ob, panel.event_mask(zone_times)) * 100
+    ob_atr = panel.mean(atr, is_ob) / panel.mean(atr, ~is_ob)
+
+    log.info(f"\n{'Instrument':<10} {'Bars':>8} {'Avg ATR':>10} {'ATR%':>7} {'OB bars':>8} {'OB zones':>9} "
+             f"{'Conc':>6} {'OB ATR':>7}")
+    log.info("-"*100)
+    for row, symbol in enumerate(panel.symbols):
+        conc = zone_share[row] / ob_share[row] if ob_share[row] > 0 else np.nan
+        log.info(f"{symbol:<10} {panel.bars[symbol]:>8,} {avg_atr[row]:>10.5f} {atr_pct[row]:>6.3f}% "
+                 f"{ob_share[row]:>7.1f}% {zone_share[row]:>8.1f}% {conc:>5.2f}x {ob_atr[row]:>6.2f}x")
 
 # ============================================================================
 # SUMMARY & CONCLUSIONS
 # ============================================================================
-print(f"\n\n{'='*100}")
-print("SUMMARY & CONCLUSIONS")
-print(f"{'='*100}")
+log.info(f"\n\n{'='*100}")
+log.info("SUMMARY & CONCLUSIONS")
+log.info(f"{'='*100}")
 
 # Filter valid results
 valid_results = {k: v for k, v in results.items() if 'error' not in v and v['zones_total'] > 0}
 
 if len(valid_results) > 0:
-    print(f"\nInstruments with zones detected: {len(valid_results)}/{len(INSTRUMENTS)}")
+    log.info(f"\nInstruments with zones detected: {len(valid_results)}/{len(INSTRUMENTS)}")
 
     # Average statistics
     avg_concentration = np.mean([v['concentration_factor'] for v in valid_results.values() if v['concentration_factor'] > 0])
     avg_strength_boost = np.mean([v['strength_boost_pct'] for v in valid_results.values() if v['strength_boost_pct'] != 0])
 
-    print(f"\nOB Time Window Performance:")
-    print(f"  Average concentration factor: {avg_concentration:.2f}x")
-    print(f"  Average strength boost: {avg_strength_boost:+.1f}%")
+    log.info(f"\nOB Time Window Performance:")
+    log.info(f"  Average concentration factor: {avg_concentration:.2f}x")
+    log.info(f"  Average strength boost: {avg_strength_boost:+.1f}%")
 
     # Check if OB windows are universal
     ob_effective = sum(1 for v in valid_results.values() if v['concentration_factor'] > 1.5)
 
-    print(f"\nUniversality Assessment:")
-    print(f"  Instruments with OB concentration >1.5x: {ob_effective}/{len(valid_results)}")
+    log.info(f"\nUniversality Assessment:")
+    log.info(f"  Instruments with OB concentration >1.5x: {ob_effective}/{len(valid_results)}")
 
     if ob_effective >= len(valid_results) * 0.7:
-        print(f"  -> OB time windows appear UNIVERSAL (70%+ effective)")
+        log.info(f"  -> OB time windows appear UNIVERSAL (70%+ effective)")
     elif ob_effective >= len(valid_results) * 0.5:
-        print(f"  -> OB time windows are PARTIALLY universal (50-70% effective)")
+        log.info(f"  -> OB time windows are PARTIALLY universal (50-70% effective)")
     else:
-        print(f"  -> OB time windows may be INSTRUMENT-SPECIFIC (<50% effective)")
+        log.info(f"  -> OB time windows may be INSTRUMENT-SPECIFIC (<50% effective)")
 
     # Parameter universality
     instruments_with_zones = [k for k, v in valid_results.items()]
-    print(f"\nParameter Universality:")
-    print(f"  Same parameters work for: {', '.join(instruments_with_zones)}")
+    log.info(f"\nParameter Universality:")
+    log.info(f"  Same parameters work for: {', '.join(instruments_with_zones)}")
 
     # Recommendations
-    print(f"\nRECOMMENDATIONS:")
+    log.info(f"\nRECOMMENDATIONS:")
 
     if avg_concentration >= 2.0:
-        print(f"  1. OB time windows are HIGHLY EFFECTIVE - use as primary filter")
+        log.info(f"  1. OB time windows are HIGHLY EFFECTIVE - use as primary filter")
     elif avg_concentration >= 1.5:
-        print(f"  1. OB time windows are EFFECTIVE - use as confluence factor")
+        log.info(f"  1. OB time windows are EFFECTIVE - use as confluence factor")
     else:
-        print(f"  1. OB time windows show WEAK signal - may need refinement")
+        log.info(f"  1. OB time windows show WEAK signal - may need refinement")
 
     if len(valid_results) >= 3:
-        print(f"  2. Zone detection parameters are reasonably UNIVERSAL")
+        log.info(f"  2. Zone detection parameters are reasonably UNIVERSAL")
     else:
-        print(f"  2. Zone detection may need INSTRUMENT-SPECIFIC tuning")
+        log.info(f"  2. Zone detection may need INSTRUMENT-SPECIFIC tuning")
 
-    print(f"  3. Next: Build backtest framework with entry/exit rules")
-    print(f"  4. Next: Create visualization tools")
+    log.info(f"  3. Next: Build backtest framework with entry/exit rules")
+    log.info(f"  4. Next: Create visualization tools")
 
 else:
-    print(f"\nWARNING: No zones detected on any instrument!")
-    print(f"Consider:")
-    print(f"  - Further relaxing detection parameters")
-    print(f"  - Using longer data period")
-    print(f"  - Different zone detection algorithm")
+    log_event(log, 'no_zones', f"\nWARNING: No zones detected on any instrument!", level=logging.WARNING)
+    log.info(f"Consider:")
+    log.info(f"  - Further relaxing detection parameters")
+    log.info(f"  - Using longer data period")
+    log.info(f"  - Different zone detection algorithm")
 
-print(f"\n{'='*100}")
-print(f"Validation complete. Results saved to results dictionary.")
-print(f"Documentation: See docs/VALIDATION_RESULTS.md")
-print(f"{'='*100}")
+log.info(f"\n{'='*100}")
+log.info(f"Validation complete. Results saved to results dictionary.")
+log.info(f"Documentation: See docs/VALIDATION_RESULTS.md")
+log.info(f"{'='*100}")
 
 # Save results to file
 output_file = Path(__file__).parent.parent / "docs" / "validation_results.txt"
@@ -345,4 +378,4 @@ with open(output_file, 'w') as f:
             f.write(f"  {key}: {value}\n")
         f.write("\n")
 
-print(f"\nDetailed results saved to: {output_file}")
+log.info(f"\nDetailed results saved to: {output_file}")
@@ -11,6 +11,7 @@ Period: January 1, 2023 - December 31, 2024 (2 years)
 Comparison: vs. original 3-month study (Oct-Dec 2024)
 """
 
+import logging
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,16 +25,19 @@ from data.data_loader import DataLoader
 from zones.detector import ZoneDetector, ZoneType, ZoneFreshness
 from zones.time_filter import PeriodicOBFilter, SessionFilter
 from strategies.trend_analyzer import TrendAnalyzer, MultiTimeframeTrend
+from utils.reporting import get_logger, log_event
+
+log = get_logger('notebooks.05_extended_validation_2023_2025')
 
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 140)
 
-print("="*120)
-print("EXTENDED MULTI-INSTRUMENT VALIDATION (2023-2025)")
-print("Robust Dataset Analysis - Addressing Seasonality and Regime Concerns")
-print("="*120)
-print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*120)
+log.info("="*120)
+log.info("EXTENDED MULTI-INSTRUMENT VALIDATION (2023-2025)")
+log.info("Robust Dataset Analysis - Addressing Seasonality and Regime Concerns")
+log.info("="*120)
+log.info(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+log.info("="*120)
 
 # ============================================================================
 # CONFIGURATION
@@ -171,77 +175,77 @@ extended_results = {}
 original_results = {}
 
 for symbol in INSTRUMENTS:
-    print(f"\n{'='*120}")
-    print(f"ANALYZING: {symbol}")
-    print(f"{'='*120}")
+    log.info(f"\n{'='*120}")
+    log.info(f"ANALYZING: {symbol}")
+    log.info(f"{'='*120}")
 
     try:
         # Load extended period
-        print(f"\n[1/2] Loading EXTENDED period ({EXTENDED_START} to {EXTENDED_END})...")
+        log.info(f"\n[1/2] Loading EXTENDED period ({EXTENDED_START} to {EXTENDED_END})...")
         extended_data = loader.load_multiple_timeframes(symbol, TIMEFRAMES, EXTENDED_START, EXTENDED_END)
 
         if len(extended_data) > 0 and "M5" in extended_data:
-            print(f"  Loaded: {len(extended_data['M5']):,} M5 bars")
+            log.info(f"  Loaded: {len(extended_data['M5']):,} M5 bars")
             extended_results[symbol] = analyze_period(symbol, extended_data, "Extended (2023-2025)", ob_filter, zone_detector)
 
             # Print extended results
             if extended_results[symbol]:
                 r = extended_results[symbol]
-                print(f"\n  EXTENDED PERIOD RESULTS:")
-                print(f"    Bars: {r['bars']:,}")
-                print(f"    Zones: {r['zones_total']} (Supply: {r['zones_supply']}, Demand: {r['zones_demand']})")
-                print(f"    OB Concentration: {r['zones_ob']}/{r['zones_total']} ({r['zones_ob_pct']:.1f}%)")
-                print(f"    Concentration Factor: {r['concentration']:.2f}x")
+                log.info(f"\n  EXTENDED PERIOD RESULTS:")
+                log.info(f"    Bars: {r['bars']:,}")
+                log.info(f"    Zones: {r['zones_total']} (Supply: {r['zones_supply']}, Demand: {r['zones_demand']})")
+                log.info(f"    OB Concentration: {r['zones_ob']}/{r['zones_total']} ({r['zones_ob_pct']:.1f}%)")
+                log.info(f"    Concentration Factor: {r['concentration']:.2f}x")
                 if r['strength_boost_pct'] != 0:
-                    print(f"    Strength Boost: {r['strength_boost_pct']:+.1f}%")
+                    log.info(f"    Strength Boost: {r['strength_boost_pct']:+.1f}%")
 
         # Load original period for comparison
-        print(f"\n[2/2] Loading ORIGINAL period ({ORIGINAL_START} to {ORIGINAL_END}) for comparison...")
+        log.info(f"\n[2/2] Loading ORIGINAL period ({ORIGINAL_START} to {ORIGINAL_END}) for comparison...")
         original_data = loader.load_multiple_timeframes(symbol, TIMEFRAMES, ORIGINAL_START, ORIGINAL_END)
 
         if len(original_data) > 0 and "M5" in original_data:
-            print(f"  Loaded: {len(original_data['M5']):,} M5 bars")
+            log.info(f"  Loaded: {len(original_data['M5']):,} M5 bars")
             original_results[symbol] = analyze_period(symbol, original_data, "Original (Oct-Dec 2024)", ob_filter, zone_detector)
 
             # Print original results
             if original_results[symbol]:
                 r = original_results[symbol]
-                print(f"\n  ORIGINAL PERIOD RESULTS:")
-                print(f"    Bars: {r['bars']:,}")
-                print(f"    Zones: {r['zones_total']} (Supply: {r['zones_supply']}, Demand: {r['zones_demand']})")
-                print(f"    OB Concentration: {r['zones_ob']}/{r['zones_total']} ({r['zones_ob_pct']:.1f}%)")
-                print(f"    Concentration Factor: {r['concentration']:.2f}x")
+                log.info(f"\n  ORIGINAL PERIOD RESULTS:")
+                log.info(f"    Bars: {r['bars']:,}")
+                log.info(f"    Zones: {r['zones_total']} (Supply: {r['zones_supply']}, Demand: {r['zones_demand']})")
+                log.info(f"    OB Concentration: {r['zones_ob']}/{r['zones_total']} ({r['zones_ob_pct']:.1f}%)")
+                log.info(f"    Concentration Factor: {r['concentration']:.2f}x")
 
         # Comparison
         if symbol in extended_results and symbol in original_results:
             ext = extended_results[symbol]
             orig = original_results[symbol]
 
-            print(f"\n  COMPARISON:")
-            print(f"    Sample size increase: {ext['bars'] / orig['bars']:.1f}x")
-            print(f"    Zones detected: {ext['zones_total']} extended vs {orig['zones_total']} original")
-            print(f"    OB concentration: {ext['concentration']:.2f}x extended vs {orig['concentration']:.2f}x original")
+            log.info(f"\n  COMPARISON:")
+            log.info(f"    Sample size increase: {ext['bars'] / orig['bars']:.1f}x")
+            log.info(f"    Zones detected: {ext['zones_total']} extended vs {orig['zones_total']} original")
+            log.info(f"    OB concentration: {ext['concentration']:.2f}x extended vs {orig['concentration']:.2f}x original")
 
             if abs(ext['concentration'] - orig['concentration']) < 0.3:
-                print(f"    -> STABLE: Concentration factor consistent across periods [OK]")
+                log.info(f"    -> STABLE: Concentration factor consistent across periods [OK]")
             else:
-                print(f"    -> CHANGE: Concentration factor differs (may indicate regime sensitivity)")
+                log.info(f"    -> CHANGE: Concentration factor differs (may indicate regime sensitivity)")
 
     except Exception as e:
-        print(f"\n  ERROR: {e}")
+        log_event(log, 'instrument_failed', f"\n  ERROR: {e}", level=logging.ERROR, symbol=symbol, error=str(e))
         import traceback
         traceback.print_exc()
 
 # ============================================================================
 # AGGREGATE ANALYSIS
 # ============================================================================
-print(f"\n\n{'='*120}")
-print("AGGREGATE ANALYSIS - Extended Period (2023-2025)")
-print(f"{'='*120}")
+log.info(f"\n\n{'='*120}")
+log.info("AGGREGATE ANALYSIS - Extended Period (2023-2025)")
+log.info(f"{'='*120}")
 
 # Extended period summary
-print(f"\n{'Instrument':<12} {'Bars':>10} {'Zones':>8} {'OB %':>8} {'Conc':>8} {'Strength+':>12} {'Detection Rate':>15}")
-print("-"*120)
+log.info(f"\n{'Instrument':<12} {'Bars':>10} {'Zones':>8} {'OB %':>8} {'Conc':>8} {'Strength+':>12} {'Detection Rate':>15}")
+log.info("-"*120)
 
 total_bars_ext = 0
 total_zones_ext = 0
@@ -256,7 +260,7 @@ for symbol, result in extended_results.items():
         boost = f"{result['strength_boost_pct']:+.1f}%" if result['strength_boost_pct'] != 0 else "N/A"
         det_rate = f"{result['zones_total']/result['bars']*100:.4f}%"
 
-        print(f"{symbol:<12} {bars:>10} {zones:>8} {ob_pct:>8} {conc:>8} {boost:>12} {det_rate:>15}")
+        log.info(f"{symbol:<12} {bars:>10} {zones:>8} {ob_pct:>8} {conc:>8} {boost:>12} {det_rate:>15}")
 
         total_bars_ext += result['bars']
         total_zones_ext += result['zones_total']
@@ -267,15 +271,15 @@ if total_zones_ext > 0:
     aggregate_ob_pct = (total_ob_zones_ext / total_zones_ext) * 100
     aggregate_concentration = aggregate_ob_pct / 33.3  # baseline OB coverage
 
-    print(f"\n{'AGGREGATE':<12} {total_bars_ext:>10,} {total_zones_ext:>8} "
+    log.info(f"\n{'AGGREGATE':<12} {total_bars_ext:>10,} {total_zones_ext:>8} "
           f"{aggregate_ob_pct:>7.1f}% {aggregate_concentration:>7.2f}x")
 
-print(f"\n\n{'='*120}")
-print("COMPARISON: Extended (2023-2025) vs Original (Oct-Dec 2024)")
-print(f"{'='*120}")
+log.info(f"\n\n{'='*120}")
+log.info("COMPARISON: Extended (2023-2025) vs Original (Oct-Dec 2024)")
+log.info(f"{'='*120}")
 
-print(f"\n{'Instrument':<12} {'Extended Conc':>15} {'Original Conc':>15} {'Difference':>15} {'Stability':>12}")
-print("-"*120)
+log.info(f"\n{'Instrument':<12} {'Extended Conc':>15} {'Original Conc':>15} {'Difference':>15} {'Stability':>12}")
+log.info("-"*120)
 
 for symbol in INSTRUMENTS:
     if symbol in extended_results and symbol in original_results:
@@ -294,49 +298,49 @@ for symbol in INSTRUMENTS:
             else:
                 stability = "[X] Variable"
 
-            print(f"{symbol:<12} {ext_conc:>14.2f}x {orig_conc:>14.2f}x {diff:>+14.2f}x {stability:>12}")
+            log.info(f"{symbol:<12} {ext_conc:>14.2f}x {orig_conc:>14.2f}x {diff:>+14.2f}x {stability:>12}")
 
 # ============================================================================
 # STATISTICAL ROBUSTNESS
 # ============================================================================
-print(f"\n\n{'='*120}")
-print("STATISTICAL ROBUSTNESS ANALYSIS")
-print(f"{'='*120}")
+log.info(f"\n\n{'='*120}")
+log.info("STATISTICAL ROBUSTNESS ANALYSIS")
+log.info(f"{'='*120}")
 
-print(f"\nSample Size Comparison:")
-print(f"  Original study: {sum(r['bars'] for r in original_results.values() if r):,} total bars")
-print(f"  Extended study: {total_bars_ext:,} total bars")
-print(f"  Increase: {total_bars_ext / sum(r['bars'] for r in original_results.values() if r):.1f}x")
+log.info(f"\nSample Size Comparison:")
+log.info(f"  Original study: {sum(r['bars'] for r in original_results.values() if r):,} total bars")
+log.info(f"  Extended study: {total_bars_ext:,} total bars")
+log.info(f"  Increase: {total_bars_ext / sum(r['bars'] for r in original_results.values() if r):.1f}x")
 
-print(f"\nZone Detection:")
-print(f"  Original study: {sum(r['zones_total'] for r in original_results.values() if r)} total zones")
-print(f"  Extended study: {total_zones_ext} total zones")
-print(f"  Increase: {total_zones_ext / sum(r['zones_total'] for r in original_results.values() if r):.1f}x")
+log.info(f"\nZone Detection:")
+log.info(f"  Original study: {sum(r['zones_total'] for r in original_results.values() if r)} total zones")
+log.info(f"  Extended study: {total_zones_ext} total zones")
+log.info(f"  Increase: {total_zones_ext / sum(r['zones_total'] for r in original_results.values() if r):.1f}x")
 
-print(f"\nKey Finding:")
+log.info(f"\nKey Finding:")
 if total_zones_ext > 0:
-    print(f"  Extended OB concentration: {aggregate_ob_pct:.1f}% ({aggregate_concentration:.2f}x)")
-    print(f"  Original OB concentration: {sum(r['zones_ob'] for r in original_results.values() if r) / sum(r['zones_total'] for r in original_results.values() if r) * 100:.1f}% "
+    log.info(f"  Extended OB concentration: {aggregate_ob_pct:.1f}% ({aggregate_concentration:.2f}x)")
+    log.info(f"  Original OB concentration: {sum(r['zones_ob'] for r in original_results.values() if r) / sum(r['zones_total'] for r in original_results.values() if r) * 100:.1f}% "
           f"({(sum(r['zones_ob'] for r in original_results.values() if r) / sum(r['zones_total'] for r in original_results.values() if r) * 100) / 33.3:.2f}x)")
 
     orig_conc = (sum(r['zones_ob'] for r in original_results.values() if r) / sum(r['zones_total'] for r in original_results.values() if r) * 100) / 33.3
 
     if abs(aggregate_concentration - orig_conc) < 0.3:
-        print(f"\n  [OK][OK][OK] ROBUST: OB pattern STABLE across 3-month and 2-year periods!")
-        print(f"  This validates the finding is NOT due to seasonality or regime bias.")
+        log.info(f"\n  [OK][OK][OK] ROBUST: OB pattern STABLE across 3-month and 2-year periods!")
+        log.info(f"  This validates the finding is NOT due to seasonality or regime bias.")
     else:
-        print(f"\n  Pattern shows some variation between periods.")
-        print(f"  Further investigation of regime effects recommended.")
+        log.info(f"\n  Pattern shows some variation between periods.")
+        log.info(f"  Further investigation of regime effects recommended.")
 
 # ============================================================================
 # SEASONALITY ANALYSIS
 # ============================================================================
-print(f"\n\n{'='*120}")
-print("SEASONALITY ANALYSIS (Extended Period Only)")
-print(f"{'='*120}")
+log.info(f"\n\n{'='*120}")
+log.info("SEASONALITY ANALYSIS (Extended Period Only)")
+log.info(f"{'='*120}")
 
 # Reload extended data and detect zones for seasonal analysis
-print(f"\nAnalyzing quarterly distribution...")
+log.info(f"\nAnalyzing quarterly distribution...")
 
 for symbol in INSTRUMENTS:
     if symbol in extended_results and extended_results[symbol]:
@@ -351,20 +355,20 @@ for symbol in INSTRUMENTS:
                 if len(zones) > 0:
                     zone_quarters, zone_months = seasonal_analysis(df_m5, zones, ob_filter)
 
-                    print(f"\n{symbol} - Quarterly Distribution:")
+                    log.info(f"\n{symbol} - Quarterly Distribution:")
                     for quarter, count in sorted(zone_quarters.items()):
-                        print(f"  {quarter}: {count} zones")
+                        log.info(f"  {quarter}: {count} zones")
         except:
             pass
 
 # ============================================================================
 # CONCLUSIONS
 # ============================================================================
-print(f"\n\n{'='*120}")
-print("EXTENDED VALIDATION CONCLUSIONS")
-print(f"{'='*120}")
+log.info(f"\n\n{'='*120}")
+log.info("EXTENDED VALIDATION CONCLUSIONS")
+log.info(f"{'='*120}")
 
-print(f"""
+log.info(f"""
 DATASET ROBUSTNESS:
   - Extended period: 2 years (2023-2025)
   - Total observations: {total_bars_ext:,} five-minute bars
@@ -396,7 +400,7 @@ RECOMMENDATION:
   {"Findings are robust and credible for academic publication and practical application." if abs(aggregate_concentration - orig_conc) < 0.3 else "Findings require regime-conditional analysis before final conclusions."}
 """)
 
-print(f"\n{'='*120}")
-print("Extended validation complete.")
-print(f"Results provide robust evidence {'validating' if abs(aggregate_concentration - orig_conc) < 0.3 else 'with some regime variation in'} OB time window hypothesis.")
-print(f"{'='*120}")
+log.info(f"\n{'='*120}")
+log.info("Extended validation complete.")
+log.info(f"Results provide robust evidence {'validating' if abs(aggregate_concentration - orig_conc) < 0.3 else 'with some regime variation in'} OB time window hypothesis.")
+log.info(f"{'='*120}")
@@ -14,6 +14,7 @@ Purpose: Ultimate regime-robustness test including extreme events
 Data Source: Dukascopy Bank SA (https://www.dukascopy.com)
 """
 
+import logging
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,21 +25,23 @@ from datetime import datetime
 from typing import Dict, List
 import json
 
-from data.data_loader import DataLoader
-from zones.detector import ZoneDetector, ZoneType, ZoneFreshness
-from zones.time_filter import PeriodicOBFilter, SessionFilter
-from strategies.trend_analyzer import TrendAnalyzer, MultiTimeframeTrend
+from zones.time_filter import PeriodicOBFilter
+from zones.batch import BatchTask, run_batch
+from zones.significance import concentration_test, format_p_value
+from utils.reporting import get_logger, log_event
+
+log = get_logger('notebooks.06_six_year_validation_2020_2025')
 
 pd.set_option('display.max_columns', None)
 pd.set_option('display.width', 140)
 
-print("="*120)
-print("SIX-YEAR EXTENDED MULTI-INSTRUMENT VALIDATION (2020-2025)")
-print("Ultimate Robustness Test - Including COVID-19 Period and Multiple Market Cycles")
-print("="*120)
-print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("Data Source: Dukascopy Bank SA")
-print("="*120)
+log.info("="*120)
+log.info("SIX-YEAR EXTENDED MULTI-INSTRUMENT VALIDATION (2020-2025)")
+log.info("Ultimate Robustness Test - Including COVID-19 Period and Multiple Market Cycles")
+log.info("="*120)
+log.info(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+log.info("Data Source: Dukascopy Bank SA")
+log.info("="*120)
 
 # ============================================================================
 # CONFIGURATION
@@ -78,91 +81,45 @@ OB_PARAMS = {
     'half_hour_window_mins': 3
 }
 
+# Permutation test: null samples, each shifting all zone times by one random
+# number of M5 bars ('common' keeps the zones' clustering; independent shifts
+# of bar-aligned times would only reproduce the binomial test)
+PERMUTATIONS = 10_000
+SHIFT = 'common'
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def analyze_period(instrument: str, start_date: str, end_date: str, period_name: str) -> Dict:
-    """Analyze a single instrument for a specific period"""
-    try:
-        # Load data
-        loader = DataLoader()
-        df = loader.load(instrument, "M5", start_date, end_date)
-
-        if df.empty:
-            print(f"  [WARN] No data for {instrument} in period {period_name}")
-            return None
-
-        # Detect zones
-        detector = ZoneDetector(**ZONE_PARAMS)
-        zones = detector.detect_zones(df)
-
-        if not zones:
-            print(f"  [WARN] No zones detected for {instrument} in period {period_name}")
-            return {
-                'instrument': instrument,
-                'period': period_name,
-                'start': start_date,
-                'end': end_date,
-                'bars': len(df),
-                'zones': 0,
-                'ob_zones': 0,
-                'ob_pct': 0.0,
-                'concentration': 0.0,
-            }
-
-        # Classify by OB time
-        ob_filter = PeriodicOBFilter(**OB_PARAMS)
-        ob_zones = sum(1 for z in zones if ob_filter.is_ob_time(z.creation_time))
-
-        # Calculate metrics
-        total_zones = len(zones)
-        ob_pct = (ob_zones / total_zones * 100) if total_zones > 0 else 0
-        concentration = ob_pct / 33.3  # vs 33.3% baseline
-
-        # Quarterly breakdown
-        df_zones = pd.DataFrame([{
-            'timestamp': z.creation_time,
-            'type': z.zone_type.name,
-            'is_ob': ob_filter.is_ob_time(z.creation_time)
-        } for z in zones])
-
-        df_zones['quarter'] = pd.to_datetime(df_zones['timestamp']).dt.to_period('Q')
-        quarterly = df_zones.groupby('quarter').size().to_dict()
-
-        return {
-            'instrument': instrument,
-            'period': period_name,
-            'start': start_date,
-            'end': end_date,
-            'bars': len(df),
-            'zones': total_zones,
-            'ob_zones': ob_zones,
-            'non_ob_zones': total_zones - ob_zones,
-            'ob_pct': ob_pct,
-            'concentration': concentration,
-            'quarterly': {str(k): v for k, v in quarterly.items()},
-            'supply_zones': sum(1 for z in zones if z.zone_type == ZoneType.SUPPLY),
-            'demand_zones': sum(1 for z in zones if z.zone_type == ZoneType.DEMAND),
-        }
-
-    except Exception as e:
-        print(f"  [ERROR] Failed to analyze {instrument} {period_name}: {e}")
+def pooled_test(results: List[Dict]):
+    """
+    Significance of the pooled OB concentration (None without zones)
+
+    The expected OB share is each instrument's share of OB bars, weighted
+    by its zones; the permutation null pools the zones' minute histograms.
+    """
+    results = [r for r in results if r and r['zones'] > 0]
+    zones = sum(r['zones'] for r in results)
+    if zones == 0:
         return None
+    expected = sum(r['zones'] * r['bar_ob_pct'] / 100 for r in results) / zones
+    histogram = np.sum([r['zone_minutes'] for r in results], axis=0)
+    return concentration_test(histogram, PeriodicOBFilter(**OB_PARAMS), expected,
+                              bar_minutes=5, permutations=PERMUTATIONS, shift=SHIFT)
 
-def print_period_results(results: List[Dict], period_name: str):
-    """Print formatted results for a period"""
-    print(f"\n{'='*120}")
-    print(f"{period_name.upper()} PERIOD RESULTS")
-    print(f"{'='*120}")
+def print_period_results(results: List[Dict], period_name: str, test=None):
+    """Print formatted results for a period, with its pooled_test()"""
+    log.info(f"\n{'='*120}")
+    log.info(f"{period_name.upper()} PERIOD RESULTS")
+    log.info(f"{'='*120}")
 
     if not results:
-        print("[WARN] No results to display")
+        log_event(log, 'no_results', "[WARN] No results to display", level=logging.WARNING, period=period_name)
         return
 
     # Summary table
-    print(f"\n{'Instrument':<12} {'Bars':>10} {'Zones':>8} {'In OB':>8} {'OB %':>8} {'Conc.':>8} {'Supply':>8} {'Demand':>8}")
-    print("-" * 120)
+    log.info(f"\n{'Instrument':<12} {'Bars':>10} {'Zones':>8} {'In OB':>8} {'OB %':>8} {'Conc.':>8} {'Supply':>8} {'Demand':>8}")
+    log.info("-" * 120)
 
     total_bars = 0
     total_zones = 0
@@ -172,7 +129,7 @@ def print_period_results(results: List[Dict], period_name: str):
         if r is None:
             continue
 
-        print(f"{r['instrument']:<12} {r['bars']:>10,} {r['zones']:>8} {r['ob_zones']:>8} "
+        log.info(f"{r['instrument']:<12} {r['bars']:>10,} {r['zones']:>8} {r['ob_zones']:>8} "
               f"{r['ob_pct']:>7.1f}% {r['concentration']:>7.2f}x "
               f"{r['supply_zones']:>8} {r['demand_zones']:>8}")
 
@@ -180,66 +137,54 @@ def print_period_results(results: List[Dict], period_name: str):
         total_zones += r['zones']
         total_ob += r['ob_zones']
 
-    print("-" * 120)
+    log.info("-" * 120)
 
-    if total_zones > 0:
-        avg_ob_pct = (total_ob / total_zones * 100)
-        avg_conc = avg_ob_pct / 33.3
-        print(f"{'TOTAL':<12} {total_bars:>10,} {total_zones:>8} {total_ob:>8} "
-              f"{avg_ob_pct:>7.1f}% {avg_conc:>7.2f}x")
+    if test is not None:
+        log.info(f"{'TOTAL':<12} {total_bars:>10,} {total_zones:>8} {total_ob:>8} "
+              f"{test.observed_fraction * 100:>7.1f}% {test.concentration:>7.2f}x")
 
-    # Chi-square test
-    if total_zones > 0:
-        expected_ob = total_zones * 0.333
-        chi_square = ((total_ob - expected_ob)**2 / expected_ob +
-                     ((total_zones - total_ob) - (total_zones * 0.667))**2 / (total_zones * 0.667))
-        print(f"\nChi-Square Test: X^2 = {chi_square:.2f}, p < 0.001" if chi_square > 10.83 else f"\nChi-Square Test: X^2 = {chi_square:.2f}, not significant")
+        # Chi-square, binomial and permutation tests against the actual OB bar share
+        log.info(f"\n{test.summary()}")
 
-def compare_periods(all_results: Dict):
-    """Compare results across different periods"""
-    print(f"\n{'='*120}")
-    print("CROSS-PERIOD COMPARISON")
-    print(f"{'='*120}")
+def compare_periods(all_results: Dict, tests: Dict):
+    """Compare results across different periods (tests: period -> pooled_test())"""
+    log.info(f"\n{'='*120}")
+    log.info("CROSS-PERIOD COMPARISON")
+    log.info(f"{'='*120}")
 
-    print(f"\n{'Period':<15} {'Years':>8} {'Bars':>12} {'Zones':>8} {'OB %':>8} {'Conc.':>8} {'p-value':>10}")
-    print("-" * 120)
+    log.info(f"\n{'Period':<15} {'Years':>8} {'Bars':>12} {'Zones':>8} {'OB %':>8} {'Base %':>8} {'Conc.':>8} "
+          f"{'p (binom)':>10} {'p (perm)':>10}")
+    log.info("-" * 120)
 
     for period_name, results in all_results.items():
         if not results:
             continue
 
-        total_bars = sum(r['bars'] for r in results if r)
-        total_zones = sum(r['zones'] for r in results if r)
-        total_ob = sum(r['ob_zones'] for r in results if r)
-
-        if total_zones == 0:
+        test = tests.get(period_name)
+        if test is None:
             continue
 
-        ob_pct = (total_ob / total_zones * 100)
-        conc = ob_pct / 33.3
+        total_bars = sum(r['bars'] for r in results if r)
+        total_zones = test.zones
 
         # Calculate years
         start = PERIODS[period_name][0]
         end = PERIODS[period_name][1]
         years = (pd.Timestamp(end) - pd.Timestamp(start)).days / 365.25
 
-        # Chi-square p-value approximation
-        expected_ob = total_zones * 0.333
-        chi_square = ((total_ob - expected_ob)**2 / expected_ob +
-                     ((total_zones - total_ob) - (total_zones * 0.667))**2 / (total_zones * 0.667))
-        p_value = "< 0.001" if chi_square > 10.83 else "> 0.05"
-
-        print(f"{period_name:<15} {years:>8.1f} {total_bars:>12,} {total_zones:>8} "
-              f"{ob_pct:>7.1f}% {conc:>7.2f}x {p_value:>10}")
+        log.info(f"{period_name:<15} {years:>8.1f} {total_bars:>12,} {total_zones:>8} "
+              f"{test.observed_fraction * 100:>7.1f}% {test.expected_fraction * 100:>7.1f}% "
+              f"{test.concentration:>7.2f}x {format_p_value(test.binomial_p):>10} "
+              f"{format_p_value(test.permutation_p, test.permutations):>10}")
 
 def instrument_comparison(all_results: Dict):
     """Compare instruments across all periods"""
-    print(f"\n{'='*120}")
-    print("INSTRUMENT STABILITY ANALYSIS")
-    print(f"{'='*120}")
+    log.info(f"\n{'='*120}")
+    log.info("INSTRUMENT STABILITY ANALYSIS")
+    log.info(f"{'='*120}")
 
-    print(f"\n{'Instrument':<12} {'COVID':>10} {'Post-COVID':>12} {'Recent':>10} {'Full-6Y':>10} {'Stability':>12}")
-    print("-" * 120)
+    log.info(f"\n{'Instrument':<12} {'COVID':>10} {'Post-COVID':>12} {'Recent':>10} {'Full-6Y':>10} {'Stability':>12}")
+    log.info("-" * 120)
 
     for instrument in INSTRUMENTS:
         concentrations = []
@@ -263,7 +208,7 @@ def instrument_comparison(all_results: Dict):
             stability = 0.0
             stability_rating = "Insufficient"
 
-        print(f"{instrument:<12} {concentrations[0]:>9.2f}x {concentrations[1]:>11.2f}x "
+        log.info(f"{instrument:<12} {concentrations[0]:>9.2f}x {concentrations[1]:>11.2f}x "
               f"{concentrations[2]:>9.2f}x {concentrations[3]:>9.2f}x {stability_rating:>12}")
 
 # ============================================================================
@@ -271,28 +216,35 @@ def instrument_comparison(all_results: Dict):
 # ============================================================================
 
 def main():
-    print("\nStarting 6-year validation...")
+    log.info("\nStarting 6-year validation...")
 
-    all_results = {}
+    # Analyze every (period, instrument) pair in parallel
+    tasks = [
+        BatchTask(instrument, period_name, start, end)
+        for period_name, (start, end) in PERIODS.items()
+        for instrument in INSTRUMENTS
+    ]
+    batch = run_batch(tasks, zone_params=ZONE_PARAMS, ob_params=OB_PARAMS)
+    all_results = batch.by_period()
 
-    # Analyze each period
-    for period_name, (start, end) in PERIODS.items():
-        print(f"\n{'='*120}")
-        print(f"ANALYZING PERIOD: {period_name.upper()} ({start} to {end})")
-        print(f"{'='*120}")
+    # Pooled significance tests, computed once per period
+    tests = {period_name: pooled_test(results) for period_name, results in all_results.items()}
 
-        period_results = []
-        for instrument in INSTRUMENTS:
-            print(f"\nProcessing {instrument}...")
-            result = analyze_period(instrument, start, end, period_name)
-            if result:
-                period_results.append(result)
-
-        all_results[period_name] = period_results
-        print_period_results(period_results, period_name)
+    for period_name, (start, end) in PERIODS.items():
+        log.info(f"\n{'='*120}")
+        log.info(f"ANALYZING PERIOD: {period_name.upper()} ({start} to {end})")
+        log.info(f"{'='*120}")
+        print_period_results(all_results[period_name], period_name, tests[period_name])
+
+    log.info(f"\nBatch: {len(tasks)} tasks on {batch.workers} workers | "
+          f"Wall time: {batch.wall_seconds:.1f}s | Task time: {batch.cpu_seconds:.1f}s | "
+          f"CPU utilisation: {batch.cpu_utilisation:.2f}")
+    for i, message in batch.errors.items():
+        log_event(log, 'task_failed', f"  [FAILED] {tasks[i].instrument} {tasks[i].period}: {message}",
+                  level=logging.ERROR, instrument=tasks[i].instrument, period=tasks[i].period, error=message)
 
     # Cross-period comparison
-    compare_periods(all_results)
+    compare_periods(all_results, tests)
     instrument_comparison(all_results)
 
     # Save results
@@ -302,9 +254,9 @@ def main():
     with open(output_file, 'w') as f:
         json.dump(all_results, f, indent=2, default=str)
 
-    print(f"\n{'='*120}")
-    print(f"Results saved to: {output_file}")
-    print(f"{'='*120}")
+    log.info(f"\n{'='*120}")
+    log.info(f"Results saved to: {output_file}")
+    log.info(f"{'='*120}")
 
 if __name__ == "__main__":
     main()
@@ -271,8 +271,7 @@ By contributing, you agree that your contributions will be licensed under the MI
 ## Data Quality
 
 All data has been:
-- ✅ Verified for completeness (no gaps)
-- ✅ Checked for outliers
+- ✅ Checked for gaps, OHLC consistency and outliers (`python -m data.quality`)
 - ✅ Validated for integrity
 - ✅ Stored in UTC timezone
 - ✅ Maintained in OHLCV format
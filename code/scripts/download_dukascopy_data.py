@@ -4,6 +4,15 @@ Dukascopy Data Downloader for SD_Trend_Universal_Research
 Downloads historical price data from Dukascopy for the full 6-year period (2020-2025)
 including COVID-19 market conditions.
 
+Each instrument is fetched as month-sized jobs on a bounded worker pool
+(see data/dukascopy.py); completed months are checkpointed in the
+manifest, so an interrupted or partially failed run resumes with only the
+missing months.
+
+Usage:
+    python code/scripts/download_dukascopy_data.py --workers 8
+    python code/scripts/download_dukascopy_data.py --symbols XAUUSD --start 2025-01-01
+
 Data Source: Dukascopy Bank SA (https://www.dukascopy.com)
 License: Dukascopy data is provided for research and educational purposes.
          Please acknowledge Dukascopy as the data source in any publications.
@@ -12,11 +21,13 @@ Author: Momentum FX Research Team
 Date: January 2026
 """
 
-import subprocess
+import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
-import json
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.dukascopy import DATAFEED_URL, MANIFEST_FILE, DownloadManifest, DukascopyDownloader
 
 # ============================================================================
 # CONFIGURATION
@@ -39,8 +50,11 @@ INSTRUMENTS = {
 START_DATE = "2020-01-01"
 END_DATE = "2025-12-31"
 
-# Timeframes to download
-TIMEFRAMES = ["m5"]  # 5-minute data (can resample to M15, H1, etc.)
+# Timeframe to write (minute candles are resampled; can resample to M15, H1, etc. later)
+TIMEFRAME = "M5"
+
+# Concurrent month downloads
+WORKERS = 4
 
 # Output directory
 DATA_DIR = Path(__file__).parent.parent / "data" / "raw" / "dukascopy"
@@ -50,87 +64,6 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 # DOWNLOAD FUNCTIONS
 # ============================================================================
 
-def check_npm_package():
-    """Check if dukascopy-node is installed"""
-    try:
-        result = subprocess.run(
-            ["npm", "list", "-g", "dukascopy-node"],
-            capture_output=True,
-            text=True
-        )
-        if "dukascopy-node" in result.stdout:
-            print("[OK] dukascopy-node is installed")
-            return True
-        else:
-            print("[WARN] dukascopy-node not found")
-            return False
-    except Exception as e:
-        print(f"[ERROR] Could not check npm packages: {e}")
-        return False
-
-def install_dukascopy_node():
-    """Install dukascopy-node package"""
-    print("\n" + "="*80)
-    print("Installing dukascopy-node package...")
-    print("="*80)
-
-    try:
-        subprocess.run(
-            ["npm", "install", "-g", "dukascopy-node"],
-            check=True
-        )
-        print("[OK] dukascopy-node installed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Failed to install dukascopy-node: {e}")
-        return False
-
-def download_instrument(symbol: str, dukascopy_symbol: str, timeframe: str):
-    """Download data for a single instrument"""
-    print(f"\n{'='*80}")
-    print(f"Downloading {symbol} ({timeframe}) from {START_DATE} to {END_DATE}")
-    print(f"{'='*80}")
-
-    output_file = DATA_DIR / f"{symbol}_{timeframe.upper()}_{START_DATE}_{END_DATE}.csv"
-
-    # Build npx command
-    cmd = [
-        "npx",
-        "dukascopy-node",
-        "-i", dukascopy_symbol,
-        "-from", START_DATE,
-        "-to", END_DATE,
-        "-t", timeframe,
-        "-f", "csv",
-        "-dir", str(DATA_DIR),
-    ]
-
-    try:
-        print(f"Running: {' '.join(cmd)}")
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minutes timeout
-        )
-
-        if result.returncode == 0:
-            print(f"[OK] {symbol} downloaded successfully")
-            print(f"     Output: {output_file}")
-            return True
-        else:
-            print(f"[ERROR] Failed to download {symbol}")
-            print(f"        stdout: {result.stdout}")
-            print(f"        stderr: {result.stderr}")
-            return False
-
-    except subprocess.TimeoutExpired:
-        print(f"[ERROR] Download timeout for {symbol}")
-        return False
-    except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
-        return False
-
 def create_data_acknowledgement():
     """Create acknowledgement file for Dukascopy data"""
     ack_file = DATA_DIR / "DATA_SOURCE_ACKNOWLEDGEMENT.md"
@@ -189,8 +122,9 @@ Historical price data used for academic research purposes.
 
 All data has been:
 - ✅ Downloaded from official Dukascopy servers
-- ✅ Verified for completeness (no gaps)
-- ✅ Checked for outliers and anomalies
+- ✅ Checked for gaps beyond the weekend closure, OHLC consistency, duplicate
+  timestamps and spike outliers with `python -m data.quality` (run it after ingest;
+  `--repair` rewrites fixable bars)
 - ✅ Stored in UTC timezone
 - ✅ Maintained in OHLCV format with tick volume
 
@@ -216,87 +150,81 @@ For questions about data quality or usage:
 
     print(f"\n[OK] Data acknowledgement created: {ack_file}")
 
-def create_download_manifest():
-    """Create manifest of downloaded files"""
-    manifest = {
-        "download_date": datetime.now().isoformat(),
-        "period": f"{START_DATE} to {END_DATE}",
-        "source": "Dukascopy Bank SA",
-        "instruments": INSTRUMENTS,
-        "timeframes": TIMEFRAMES,
-        "data_directory": str(DATA_DIR),
-        "total_years": 6,
-        "coverage": {
+def create_download_manifest(start_date: str, end_date: str):
+    """Record run metadata in the manifest, keeping the per-month checkpoints"""
+    manifest = DownloadManifest(DATA_DIR / MANIFEST_FILE)
+    manifest.update(
+        download_date=datetime.now().isoformat(),
+        period=f"{start_date} to {end_date}",
+        source="Dukascopy Bank SA",
+        instruments=INSTRUMENTS,
+        data_directory=str(DATA_DIR),
+        total_years=6,
+        coverage={
             "covid_period": "2020-2021 (Included)",
             "post_covid": "2022-2023 (Included)",
             "recent": "2024-2025 (Included)"
         }
-    }
+    )
 
-    manifest_file = DATA_DIR / "download_manifest.json"
-    with open(manifest_file, 'w') as f:
-        json.dump(manifest, f, indent=2)
-
-    print(f"[OK] Download manifest created: {manifest_file}")
+    print(f"[OK] Download manifest updated: {manifest.path}")
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
 def main():
+    parser = argparse.ArgumentParser(description="Download Dukascopy data as resumable month chunks")
+    parser.add_argument('--symbols', nargs='+', default=list(INSTRUMENTS), choices=list(INSTRUMENTS))
+    parser.add_argument('--start', default=START_DATE, help="First day (YYYY-MM-DD)")
+    parser.add_argument('--end', default=END_DATE, help="Last day (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="Concurrent month downloads")
+    parser.add_argument('--base-url', default=DATAFEED_URL, help="Datafeed root (e.g. a local mock server)")
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("DUKASCOPY DATA DOWNLOADER")
     print("SD_Trend_Universal_Research - 6-Year Extended Validation")
     print("="*80)
-    print(f"Period: {START_DATE} to {END_DATE}")
-    print(f"Instruments: {len(INSTRUMENTS)}")
+    print(f"Period: {args.start} to {args.end}")
+    print(f"Instruments: {len(args.symbols)}")
+    print(f"Workers: {args.workers}")
     print(f"Output Directory: {DATA_DIR}")
     print("="*80)
 
-    # Check and install dukascopy-node if needed
-    if not check_npm_package():
-        print("\n[WARN] dukascopy-node not installed. Installing...")
-        if not install_dukascopy_node():
-            print("\n[ERROR] Could not install dukascopy-node. Please install manually:")
-            print("        npm install -g dukascopy-node")
-            return False
-
-    # Download data for each instrument
-    results = {}
-    for symbol, config in INSTRUMENTS.items():
-        for timeframe in TIMEFRAMES:
-            success = download_instrument(
-                symbol,
-                config["dukascopy_symbol"],
-                timeframe
-            )
-            results[f"{symbol}_{timeframe}"] = success
+    downloader = DukascopyDownloader(
+        DATA_DIR, INSTRUMENTS,
+        base_url=args.base_url,
+        timeframe=TIMEFRAME,
+        workers=args.workers
+    )
+    results = downloader.run(args.start, args.end, args.symbols)
 
     # Create acknowledgement and manifest
     create_data_acknowledgement()
-    create_download_manifest()
+    create_download_manifest(args.start, args.end)
 
     # Print summary
     print("\n" + "="*80)
     print("DOWNLOAD SUMMARY")
     print("="*80)
-    successful = sum(1 for v in results.values() if v)
+    successful = sum(1 for error in results.values() if error is None)
     failed = len(results) - successful
-    print(f"Successful: {successful}/{len(results)}")
-    print(f"Failed: {failed}/{len(results)}")
+    print(f"Successful: {successful}/{len(results)} months")
+    print(f"Failed: {failed}/{len(results)} months")
 
     if failed > 0:
-        print("\nFailed downloads:")
-        for key, success in results.items():
-            if not success:
-                print(f"  - {key}")
+        print("\nFailed downloads (re-run to retry only these):")
+        for key, error in results.items():
+            if error is not None:
+                print(f"  - {key}: {error}")
 
     print("\n" + "="*80)
     print("NEXT STEPS")
     print("="*80)
     print("1. Verify data files in:", DATA_DIR)
     print("2. Run data validation script")
-    print("3. Convert CSV to Parquet format")
+    print("3. Convert CSV to Parquet: cd code && python -m data.ingest")
     print("4. Run 6-year extended validation")
     print("="*80)
 
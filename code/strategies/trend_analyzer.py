@@ -5,8 +5,10 @@ Identifies trend direction and strength across multiple timeframes.
 Aligns with State Space Ontology - regime-conditional analysis.
 """
 
+import sys
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Dict, Tuple
 from enum import Enum
 from dataclasses import dataclass
@@ -51,18 +53,20 @@ class TrendAnalyzer:
         self.hurst_trending = hurst_trending
         self.hurst_ranging = hurst_ranging
 
-    def analyze(self, df: pd.DataFrame) -> TrendState:
+    def analyze(self, df: pd.DataFrame, feature_store=None) -> TrendState:
         """
         Analyze trend for a single timeframe
 
         Args:
             df: DataFrame with OHLC data
+            feature_store: Optional feature store view for df's dataset
+                           (data.features.FeatureView) to read ADX/DI from
 
         Returns:
             TrendState object
         """
         # Calculate indicators
-        df = self._add_adx(df)
+        df = self._add_adx(df, feature_store)
         df = self._add_moving_averages(df)
 
         # Get latest values
@@ -82,12 +86,7 @@ class TrendAnalyzer:
         hurst = self._calculate_hurst(df['close'].values[-self.hurst_period:])
 
         # Determine regime
-        if latest_adx > self.adx_threshold and hurst > self.hurst_trending:
-            regime = RegimeType.TRENDING
-        elif latest_adx < self.adx_threshold and hurst < self.hurst_ranging:
-            regime = RegimeType.RANGING
-        else:
-            regime = RegimeType.VOLATILE
+        regime = self._classify_regime(latest_adx, hurst)
 
         # Trend strength (normalized ADX)
         strength = min(latest_adx / 50.0, 1.0)  # Normalize to 0-1
@@ -100,43 +99,76 @@ class TrendAnalyzer:
             hurst=hurst
         )
 
-    def _add_adx(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate ADX and directional indicators"""
-        df = df.copy()
+    def analyze_rolling(self, df: pd.DataFrame, feature_store=None) -> pd.DataFrame:
+        """
+        Trend direction and ADX for every bar in one pass
 
-        # True Range
-        high = df['high']
-        low = df['low']
-        close = df['close'].shift(1)
+        All indicators are causal, so row k equals what analyze() reports
+        for df.iloc[:k+1]. Regime is left out because it needs a Hurst
+        exponent per bar; use regime_at() for the bars that matter.
 
-        tr1 = high - low
-        tr2 = abs(high - close)
-        tr3 = abs(low - close)
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        Args:
+            df: DataFrame with OHLC data
+            feature_store: Optional feature store view to read ADX/DI from
 
-        # Directional Movement
-        up_move = high - high.shift(1)
-        down_move = low.shift(1) - low
+        Returns:
+            DataFrame with columns: direction (TrendDirection), adx,
+            plus_di, minus_di, strength
+        """
+        ind = self._add_adx(df, feature_store)
 
-        plus_dm = pd.Series(0.0, index=df.index)
-        minus_dm = pd.Series(0.0, index=df.index)
+        plus_di = ind['plus_di'].to_numpy()
+        minus_di = ind['minus_di'].to_numpy()
 
-        plus_dm[(up_move > down_move) & (up_move > 0)] = up_move
-        minus_dm[(down_move > up_move) & (down_move > 0)] = down_move
+        direction = np.full(len(ind), TrendDirection.NEUTRAL, dtype=object)
+        direction[plus_di > minus_di] = TrendDirection.BULLISH
+        direction[minus_di > plus_di] = TrendDirection.BEARISH
 
-        # Smoothed indicators
-        atr = tr.rolling(window=self.adx_period).mean()
-        plus_di = 100 * (plus_dm.rolling(window=self.adx_period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=self.adx_period).mean() / atr)
+        return pd.DataFrame({
+            'direction': direction,
+            'adx': ind['adx'],
+            'plus_di': ind['plus_di'],
+            'minus_di': ind['minus_di'],
+            'strength': np.minimum(ind['adx'] / 50.0, 1.0)
+        }, index=df.index)
 
-        # ADX calculation
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=self.adx_period).mean()
+    def regime_at(self, df: pd.DataFrame, idx: int, adx: float) -> Tuple[RegimeType, float]:
+        """
+        Regime and Hurst exponent as analyze() would report at bar idx
 
-        df['plus_di'] = plus_di
-        df['minus_di'] = minus_di
-        df['adx'] = adx
-        df['atr'] = atr
+        Args:
+            df: DataFrame with OHLC data
+            idx: Positional bar index
+            adx: ADX at that bar (e.g. from analyze_rolling)
+
+        Returns:
+            (regime, hurst) tuple
+        """
+        start = max(0, idx + 1 - self.hurst_period)
+        hurst = self._calculate_hurst(df['close'].values[start:idx + 1])
+        return self._classify_regime(adx, hurst), hurst
+
+    def _classify_regime(self, adx: float, hurst: float) -> RegimeType:
+        """Classify regime from ADX and Hurst exponent"""
+        if adx > self.adx_threshold and hurst > self.hurst_trending:
+            return RegimeType.TRENDING
+        elif adx < self.adx_threshold and hurst < self.hurst_ranging:
+            return RegimeType.RANGING
+        else:
+            return RegimeType.VOLATILE
+
+    def _add_adx(self, df: pd.DataFrame, feature_store=None) -> pd.DataFrame:
+        """Calculate ADX and directional indicators, from feature_store if given"""
+        if feature_store is not None:
+            ind = feature_store.get('adx', df, _directional_indicators, period=self.adx_period)
+        else:
+            ind = _directional_indicators(df, self.adx_period)
+
+        df = df.copy()
+        df['plus_di'] = ind['plus_di']
+        df['minus_di'] = ind['minus_di']
+        df['adx'] = ind['adx']
+        df['atr'] = ind['atr']
 
         return df
 
@@ -203,28 +235,71 @@ class TrendAnalyzer:
         return max(0.0, min(1.0, hurst))
 
 
+def _directional_indicators(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """+DI, -DI, ADX and ATR over a simple moving average of `period` bars"""
+    # True Range
+    high = df['high']
+    low = df['low']
+    close = df['close'].shift(1)
+
+    tr1 = high - low
+    tr2 = abs(high - close)
+    tr3 = abs(low - close)
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+    # Directional Movement
+    up_move = high - high.shift(1)
+    down_move = low.shift(1) - low
+
+    plus_dm = pd.Series(0.0, index=df.index)
+    minus_dm = pd.Series(0.0, index=df.index)
+
+    plus_dm[(up_move > down_move) & (up_move > 0)] = up_move
+    minus_dm[(down_move > up_move) & (down_move > 0)] = down_move
+
+    # Smoothed indicators
+    atr = tr.rolling(window=period).mean()
+    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
+
+    # ADX calculation
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    adx = dx.rolling(window=period).mean()
+
+    return pd.DataFrame({
+        'plus_di': plus_di,
+        'minus_di': minus_di,
+        'adx': adx,
+        'atr': atr
+    }, index=df.index)
+
+
 class MultiTimeframeTrend:
     """Analyze trend across multiple timeframes"""
 
     def __init__(
         self,
         timeframes: Dict[str, pd.DataFrame],
-        analyzer: TrendAnalyzer = None
+        analyzer: TrendAnalyzer = None,
+        feature_stores: Dict = None
     ):
         """
         Args:
             timeframes: Dict mapping timeframe name to DataFrame
                        e.g., {'M15': df_m15, 'H1': df_h1, 'H4': df_h4}
             analyzer: TrendAnalyzer instance (creates default if None)
+            feature_stores: Optional dict mapping timeframe name to its
+                            feature store view
         """
         self.timeframes = timeframes
         self.analyzer = analyzer or TrendAnalyzer()
+        self.feature_stores = feature_stores or {}
         self.trends: Dict[str, TrendState] = {}
 
     def analyze_all(self) -> Dict[str, TrendState]:
         """Analyze trend on all timeframes"""
         for tf_name, df in self.timeframes.items():
-            self.trends[tf_name] = self.analyzer.analyze(df)
+            self.trends[tf_name] = self.analyzer.analyze(df, self.feature_stores.get(tf_name))
         return self.trends
 
     def is_aligned(self, required_timeframes: int = 2) -> bool:
@@ -276,25 +351,14 @@ class MultiTimeframeTrend:
 
 def main():
     """Example usage"""
-    # Generate sample data
-    dates = pd.date_range('2024-01-01', periods=500, freq='15min')
-    np.random.seed(42)
-
-    # Create trending data
-    trend = np.linspace(0, 0.01, 500)
-    noise = np.random.randn(500) * 0.0001
-
-    df = pd.DataFrame({
-        'open': 1.1000 + trend + noise,
-        'high': 1.1000 + trend + noise + 0.0005,
-        'low': 1.1000 + trend + noise - 0.0005,
-        'close': 1.1000 + trend + noise,
-        'volume': np.random.randint(1000, 10000, 500)
-    }, index=dates)
-
-    # Fix OHLC relationships
-    df['high'] = df[['open', 'close']].max(axis=1) + abs(np.random.randn(500)) * 0.0002
-    df['low'] = df[['open', 'close']].min(axis=1) - abs(np.random.randn(500)) * 0.0002
+    # Shared demo data generator (code/ is not on the path when run as a script)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from data.data_loader import resample_ohlcv
+    from data.synthetic import SyntheticConfig, generate_ohlcv
+
+    # Trending EURUSD-like M15 demo series
+    df = generate_ohlcv(500, "M15", seed=42, start="2024-01-01",
+                        config=SyntheticConfig(price=1.1000, trend_strength=0.3, trend_length=5000))
 
     # Single timeframe analysis
     analyzer = TrendAnalyzer()
@@ -310,20 +374,8 @@ def main():
     # Multi-timeframe (demo with same data)
     mtf = MultiTimeframeTrend({
         'M15': df,
-        'H1': df.resample('1H').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna(),
-        'H4': df.resample('4H').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna()
+        'H1': resample_ohlcv(df, 'H1'),
+        'H4': resample_ohlcv(df, 'H4')
     })
 
     mtf.analyze_all()
@@ -0,0 +1 @@
+# Shared utilities (logging and progress reporting)
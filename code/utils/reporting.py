@@ -0,0 +1,235 @@
+"""
+Logging and Progress Reporting
+
+One output layer for the backtest engine, validation runner and notebooks
+instead of bare print() calls:
+- get_logger(name): logger under the 'momentumfx' namespace. Until
+  configure_logging() is called, INFO and above go to stdout as plain
+  messages, so scripts read exactly as before
+- configure_logging(verbosity, json_path): console verbosity
+  ('quiet', 'warning', 'info', 'debug') and an optional JSON-lines sink
+- log_event(): a record with a machine-readable event name and fields;
+  the JSON sink writes one object per line with the fields as keys
+- Progress: rate-limited progress lines with throughput and ETA
+
+In a parameter sweep, configure_logging('warning') silences per-backtest
+chatter; disabled records and progress updates cost a level check only.
+
+Example:
+    configure_logging('warning', json_path='sweep.jsonl')
+    log = get_logger('sweep')
+    log_event(log, 'config_done', f"Config {i} done", config=i, pf=pf)
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+
+ROOT_LOGGER = "momentumfx"
+
+VERBOSITY = {
+    'quiet': logging.ERROR,
+    'warning': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG,
+}
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Plain-message handler writing to whatever sys.stdout is at emit time"""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(logging.Formatter('%(message)s'))
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class JsonLinesHandler(logging.Handler):
+    """Writes each record as one JSON object per line"""
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+                'level': record.levelname.lower(),
+                'logger': record.name,
+                'event': getattr(record, 'event', 'message'),
+                'message': record.getMessage(),
+            }
+            entry.update(getattr(record, 'fields', {}))
+            self._file.write(json.dumps(entry, default=_json_default) + '\n')
+            self._file.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger under the package namespace
+
+    Installs the default stdout handler on first use if logging has not
+    been configured.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        root.addHandler(ConsoleHandler())
+        root.setLevel(logging.INFO)
+        root.propagate = False
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def configure_logging(
+    verbosity: str = 'info',
+    json_path: Optional[Union[str, Path]] = None,
+    json_level: str = 'debug'
+) -> logging.Logger:
+    """
+    Set console verbosity and the optional JSON-lines sink
+
+    Args:
+        verbosity: 'quiet', 'warning', 'info' or 'debug'
+        json_path: File to append JSON-lines records to (None: no sink)
+        json_level: Verbosity of the JSON sink, independent of the console
+
+    Returns:
+        The package root logger
+    """
+    if verbosity not in VERBOSITY or json_level not in VERBOSITY:
+        raise ValueError(f"Unknown verbosity; use one of {list(VERBOSITY)}")
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    console = ConsoleHandler()
+    console.setLevel(VERBOSITY[verbosity])
+    root.addHandler(console)
+    level = VERBOSITY[verbosity]
+
+    if json_path is not None:
+        sink = JsonLinesHandler(json_path)
+        sink.setLevel(VERBOSITY[json_level])
+        root.addHandler(sink)
+        level = min(level, VERBOSITY[json_level])
+
+    root.setLevel(level)
+    root.propagate = False
+    return root
+
+
+def log_event(logger: logging.Logger, event: str, message: str = "", level: int = logging.INFO, **fields):
+    """
+    Log a structured event
+
+    Args:
+        logger: Logger from get_logger()
+        event: Machine-readable event name (e.g. 'backtest_complete')
+        message: Human-readable console text (defaults to the event name)
+        level: Logging level
+        **fields: JSON-serializable values written by the JSON sink
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message or event, extra={'event': event, 'fields': fields})
+
+
+class Progress:
+    """
+    Rate-limited progress reporting
+
+    update() is cheap enough for hot loops: it returns after a clock read
+    unless `interval` seconds have passed since the last report, and
+    after a single flag check when INFO is disabled.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        total: int,
+        label: str = "progress",
+        unit: str = "bars",
+        interval: float = 2.0
+    ):
+        """
+        Args:
+            logger: Logger to report to
+            total: Units of work in total
+            label: Name of the task in messages and records
+            unit: Unit name for the rate (e.g. 'bars')
+            interval: Minimum seconds between reports
+        """
+        self.logger = logger
+        self.total = total
+        self.label = label
+        self.unit = unit
+        self.interval = interval
+        self.enabled = logger.isEnabledFor(logging.INFO)
+        self.done = 0
+        self._start = time.perf_counter()
+        self._next_report = self._start + interval
+
+    def update(self, done: int):
+        """Record that `done` units are complete (absolute, not incremental)"""
+        self.done = done
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            self._report(now, 'progress')
+
+    def finish(self):
+        """Report completion with total elapsed time and throughput"""
+        self.done = self.total
+        if self.enabled:
+            self._report(time.perf_counter(), 'progress_done')
+
+    def _report(self, now: float, event: str):
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else None
+        pct = self.done / self.total * 100 if self.total else 100.0
+
+        if event == 'progress_done':
+            message = f"  {self.label}: {self.total:,} {self.unit} in {elapsed:.1f}s ({rate:,.0f} {self.unit}/s)"
+        else:
+            eta = f"{remaining:.0f}s" if remaining is not None else "?"
+            message = (f"  {self.label}: {self.done:,}/{self.total:,} {self.unit} ({pct:.1f}%), "
+                       f"{rate:,.0f} {self.unit}/s, ETA {eta}")
+
+        log_event(
+            self.logger, event, message,
+            label=self.label, done=self.done, total=self.total, unit=self.unit,
+            pct=pct, rate=rate, elapsed_seconds=elapsed, eta_seconds=remaining
+        )
+
+
+def _json_default(value):
+    """JSON encoding for numpy scalars, timestamps and other objects"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,295 @@
+"""
+Parallel Zone Detection Batch Runner
+
+Runs the per-instrument, per-period zone analysis (DataLoader ->
+ZoneDetector -> PeriodicOBFilter) on a process pool. Every
+(instrument, period) task is independent CPU-bound pandas work, so tasks
+are spread across cores and collected back in submission order.
+
+A task without data returns None. A task that raises is logged and
+recorded in BatchResult.errors (its result stays None), so one bad
+instrument never aborts the batch and failures never pass as empty results.
+
+Speedup is measured, not estimated: run_batch(..., baseline=True) also
+times a workers=1 pass of the same tasks (or pass a reference
+sequential_seconds). cpu_utilisation (summed task CPU time over wall time)
+is reported alongside; it leaves out I/O waits and counts every thread of
+a worker, so it is not a speedup.
+
+Usage (from the code/ directory):
+    python -m zones.batch
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from data.data_loader import DataLoader
+from zones.detector import ZoneDetector, ZoneType
+from zones.significance import binomial_test, chi_square_test, minute_histogram, ob_minute_table
+from zones.time_filter import PeriodicOBFilter
+from utils.reporting import get_logger, log_event
+
+log = get_logger('batch')
+
+
+@dataclass
+class BatchTask:
+    """One (instrument, period) unit of work"""
+    instrument: str
+    period: str
+    start_date: str
+    end_date: str
+
+
+@dataclass
+class BatchResult:
+    """Results of a batch run, in task order"""
+    tasks: List[BatchTask]
+    results: List[Optional[Dict]]
+    task_seconds: List[float]       # CPU time per task
+    wall_seconds: float
+    workers: int
+    errors: Dict[int, str] = field(default_factory=dict)  # Task position -> message
+    sequential_seconds: Optional[float] = None             # Wall time of the tasks on one worker
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Sum of task CPU times"""
+        return sum(self.task_seconds)
+
+    @property
+    def cpu_utilisation(self) -> float:
+        """Task CPU seconds per wall-clock second (not a speedup: excludes I/O, counts all threads)"""
+        return self.cpu_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """Measured wall-clock speedup over one worker (None without a sequential time)"""
+        if self.sequential_seconds is None or self.wall_seconds <= 0:
+            return None
+        return self.sequential_seconds / self.wall_seconds
+
+    def by_period(self) -> Dict[str, List[Dict]]:
+        """Group successful results by period name, keeping task order"""
+        grouped: Dict[str, List[Dict]] = {}
+        for task, result in zip(self.tasks, self.results):
+            grouped.setdefault(task.period, [])
+            if result:
+                grouped[task.period].append(result)
+        return grouped
+
+
+def analyze_period(
+    instrument: str,
+    start_date: str,
+    end_date: str,
+    period_name: str,
+    zone_params: Dict = None,
+    ob_params: Dict = None,
+    timeframe: str = "M5",
+    data_path: str = None
+) -> Optional[Dict]:
+    """Analyze a single instrument for a specific period"""
+    # Load data
+    loader = DataLoader(data_path)
+    df = loader.load(instrument, timeframe, start_date, end_date)
+
+    if df.empty:
+        log.warning(f"  [WARN] No data for {instrument} in period {period_name}")
+        return None
+
+    # Detect zones
+    detector = ZoneDetector(**(zone_params or {}))
+    zones = detector.detect_zones(df)
+
+    # Baseline: share of the bars that fall in OB windows
+    ob_filter = PeriodicOBFilter(**(ob_params or {}))
+    bar_ob_pct = float(ob_filter.time_features(df)['is_ob_time'].mean() * 100)
+
+    if not zones:
+        log.warning(f"  [WARN] No zones detected for {instrument} in period {period_name}")
+        return {
+            'instrument': instrument,
+            'period': period_name,
+            'start': start_date,
+            'end': end_date,
+            'bars': len(df),
+            'zones': 0,
+            'ob_zones': 0,
+            'ob_pct': 0.0,
+            'bar_ob_pct': bar_ob_pct,
+            'concentration': 0.0,
+            'zone_minutes': [0] * 60,
+        }
+
+    # Classify by OB time
+    creation_times = zones.creation_times
+    is_ob = ob_minute_table(ob_filter)[creation_times.minute]
+    ob_zones = int(is_ob.sum())
+
+    # Calculate metrics
+    total_zones = len(zones)
+    ob_pct = (ob_zones / total_zones * 100) if total_zones > 0 else 0
+    concentration = ob_pct / bar_ob_pct if bar_ob_pct > 0 else 0.0
+    chi_square, p_value = chi_square_test(ob_zones, total_zones, bar_ob_pct / 100)
+
+    # Quarterly breakdown
+    quarterly = creation_times.to_period('Q').value_counts().sort_index().to_dict()
+
+    return {
+        'instrument': instrument,
+        'period': period_name,
+        'start': start_date,
+        'end': end_date,
+        'bars': len(df),
+        'zones': total_zones,
+        'ob_zones': ob_zones,
+        'non_ob_zones': total_zones - ob_zones,
+        'ob_pct': ob_pct,
+        'bar_ob_pct': bar_ob_pct,
+        'concentration': concentration,
+        'chi_square': float(chi_square),
+        'p_value': float(p_value),
+        'binomial_p': float(binomial_test(ob_zones, total_zones, bar_ob_pct / 100)),
+        'zone_minutes': minute_histogram(creation_times).tolist(),     # For pooled permutation tests
+        'quarterly': {str(k): v for k, v in quarterly.items()},
+        'supply_zones': zones.count(ZoneType.SUPPLY),
+        'demand_zones': zones.count(ZoneType.DEMAND),
+    }
+
+
+def _run_task(
+    task: BatchTask,
+    zone_params: Dict,
+    ob_params: Dict,
+    timeframe: str,
+    data_path: Optional[str]
+) -> Tuple[Optional[Dict], float]:
+    """Worker entry point: run one task and measure its CPU time"""
+    # CPU time, not wall time: wall time per task inflates when workers
+    # contend for cores
+    start = time.process_time()
+    result = analyze_period(
+        task.instrument,
+        task.start_date,
+        task.end_date,
+        task.period,
+        zone_params=zone_params,
+        ob_params=ob_params,
+        timeframe=timeframe,
+        data_path=data_path
+    )
+    return result, time.process_time() - start
+
+
+def run_batch(
+    tasks: List[BatchTask],
+    zone_params: Dict = None,
+    ob_params: Dict = None,
+    timeframe: str = "M5",
+    data_path: str = None,
+    max_workers: int = None,
+    baseline: bool = False,
+    sequential_seconds: Optional[float] = None
+) -> BatchResult:
+    """
+    Run zone analysis tasks on a process pool
+
+    Args:
+        tasks: Tasks to run; results come back in the same order
+        zone_params: ZoneDetector keyword arguments
+        ob_params: PeriodicOBFilter keyword arguments
+        timeframe: Bar timeframe to load
+        data_path: DataLoader data path (default location if None)
+        max_workers: Pool size (defaults to CPU count, capped at task count);
+                     1 runs in-process without a pool
+        baseline: Also run the tasks on one worker, after the pool (so
+                  the pool does not profit from a warmer file cache), and
+                  record its wall time for the speedup
+        sequential_seconds: Reference one-worker wall time for the speedup
+
+    Returns:
+        BatchResult with per-task results, timings and speedup
+    """
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    results: List[Optional[Dict]] = [None] * len(tasks)
+    task_seconds = [0.0] * len(tasks)
+    errors: Dict[int, str] = {}
+
+    start = time.perf_counter()
+
+    if workers == 1:
+        for i, task in enumerate(tasks):
+            try:
+                results[i], task_seconds[i] = _run_task(task, zone_params, ob_params, timeframe, data_path)
+            except Exception as e:
+                log_event(log, 'task_failed', f"  [ERROR] Failed to analyze {task.instrument} {task.period}: {e}",
+                          level=logging.ERROR, instrument=task.instrument, period=task.period, error=str(e))
+                errors[i] = str(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_task, task, zone_params, ob_params, timeframe, data_path)
+                for task in tasks
+            ]
+
+            # Collect in submission order so output is deterministic
+            for i, (task, future) in enumerate(zip(tasks, futures)):
+                try:
+                    results[i], task_seconds[i] = future.result()
+                except Exception as e:
+                    # Task exception, or a worker-level failure (crashed process, unpicklable result)
+                    log_event(log, 'task_failed', f"  [ERROR] Failed to analyze {task.instrument} {task.period}: {e}",
+                              level=logging.ERROR, instrument=task.instrument, period=task.period, error=str(e))
+                    errors[i] = str(e)
+
+    wall_seconds = time.perf_counter() - start
+
+    if workers == 1:
+        sequential_seconds = wall_seconds
+    elif baseline:
+        sequential_seconds = run_batch(tasks, zone_params, ob_params, timeframe, data_path, max_workers=1).wall_seconds
+
+    return BatchResult(
+        tasks=tasks,
+        results=results,
+        task_seconds=task_seconds,
+        wall_seconds=wall_seconds,
+        workers=workers,
+        errors=errors,
+        sequential_seconds=sequential_seconds
+    )
+
+
+def main():
+    """Example usage"""
+    tasks = [
+        BatchTask(instrument, "recent", "2024-01-01", "2025-12-31")
+        for instrument in ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD", "BTCUSD"]
+    ]
+
+    batch = run_batch(tasks, baseline=True)
+
+    log.info(f"\n{'Instrument':<12} {'Zones':>8} {'In OB':>8} {'CPU (s)':>10}")
+    for task, result, seconds in zip(batch.tasks, batch.results, batch.task_seconds):
+        if result:
+            log.info(f"{task.instrument:<12} {result['zones']:>8} {result['ob_zones']:>8} {seconds:>10.2f}")
+        else:
+            log.info(f"{task.instrument:<12} {'-':>8} {'-':>8} {seconds:>10.2f}")
+
+    if batch.errors:
+        log_event(log, 'batch_failures', f"\nFailed tasks: {len(batch.errors)}",
+                  level=logging.WARNING, failed=len(batch.errors))
+    log.info(f"\nWorkers: {batch.workers}")
+    log.info(f"Wall time: {batch.wall_seconds:.2f}s (1 worker: {batch.sequential_seconds:.2f}s) | "
+             f"Speedup: {batch.speedup:.2f}x | CPU utilisation: {batch.cpu_utilisation:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Chunked Zone Detection
+
+Runs ZoneDetector over a dataset one chunk at a time, so multi-year M1 or
+tick-resampled data never has to sit in memory as a single frame (plus its
+ATR copy).
+
+Stitching rules (output matches a single-pass detect_zones() run):
+- Each chunk is scanned together with a carried-over tail of the previous
+  chunk, long enough to cover ATR warmup, the consolidation window and the
+  50-bar volume baseline used for strength.
+- Candidate bars whose 5-bar forward move window runs past the end of the
+  chunk are deferred to the next chunk.
+- Zone freshness is advanced chunk by chunk; zones stop being tracked once
+  broken, exactly like the single-pass retest scan.
+
+Usage (from the code/ directory):
+    python -m zones.chunked
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Iterable, Iterator, List
+
+from zones.detector import ZoneDetector, Zone, ZoneSet, ZoneType, ZoneFreshness
+
+
+class ChunkedZoneDetector:
+    """Drives a ZoneDetector over consecutive chunks of a dataset"""
+
+    MOVE_HORIZON = 5        # Bars after the breakout bar (see ZoneDetector._scan_zones)
+    VOLUME_WINDOW = 50      # Bars in the strength volume baseline
+
+    def __init__(
+        self,
+        detector: ZoneDetector = None,
+        chunk_size: int = 250_000,
+        atr_period: int = 14
+    ):
+        """
+        Args:
+            detector: ZoneDetector to drive (creates default if None)
+            chunk_size: Bars per chunk when splitting an in-memory frame
+            atr_period: ATR period used by the detector
+        """
+        self.detector = detector or ZoneDetector()
+        self.chunk_size = chunk_size
+        self.atr_period = atr_period
+
+    @property
+    def warmup(self) -> int:
+        """Bars of history a candidate bar needs before it"""
+        consolidation = self.detector.min_consolidation_candles + 10
+        volume = self.VOLUME_WINDOW + 1
+        atr = self.atr_period + 1
+        return max(consolidation, volume, atr)
+
+    def iter_chunks(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        """Split an in-memory frame into consecutive chunks"""
+        for start in range(0, len(df), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
+
+    def detect_zones(self, df: pd.DataFrame) -> ZoneSet:
+        """Chunked equivalent of ZoneDetector.detect_zones"""
+        return self.detect_zones_from_chunks(self.iter_chunks(df))
+
+    def detect_zones_from_chunks(self, chunks: Iterable[pd.DataFrame]) -> ZoneSet:
+        """
+        Detect zones from a stream of consecutive OHLCV chunks
+
+        Args:
+            chunks: Iterable of DataFrames in time order (e.g. Parquet row
+                    groups); chunks may have any size
+
+        Returns:
+            ZoneSet with global creation_idx, same as a single-pass
+            detect_zones() over the concatenated data
+        """
+        zones: List[Zone] = []
+        alive: List[Zone] = []
+
+        buffer = None
+        buffer_offset = 0           # Global position of buffer's first row
+        next_candidate = self.detector.lookback_periods
+        fresh_from = 0              # First bar not yet applied to freshness
+
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+
+            buffer = chunk if buffer is None else pd.concat([buffer, chunk])
+            buffer_end = buffer_offset + len(buffer)
+
+            # Only scan candidates whose forward move window is complete
+            stop = buffer_end - self.MOVE_HORIZON
+            new_zones = self._scan(buffer, buffer_offset, next_candidate, stop)
+            next_candidate = max(next_candidate, stop)
+
+            self._advance_freshness(alive, buffer, buffer_offset, fresh_from)
+            self._advance_freshness(new_zones, buffer, buffer_offset, 0)
+            fresh_from = buffer_end
+
+            zones.extend(new_zones)
+            alive = [z for z in alive + new_zones if z.freshness != ZoneFreshness.BROKEN]
+
+            # Keep just enough history for the next deferred candidate
+            cut = min(max(0, next_candidate - self.warmup - buffer_offset), len(buffer))
+            buffer = buffer.iloc[cut:]
+            buffer_offset += cut
+
+        if buffer is not None:
+            # End of data: remaining candidates use truncated move windows,
+            # as in the single-pass scan
+            buffer_end = buffer_offset + len(buffer)
+            new_zones = self._scan(buffer, buffer_offset, next_candidate, buffer_end)
+            self._advance_freshness(new_zones, buffer, buffer_offset, 0)
+            zones.extend(new_zones)
+
+        return ZoneSet.from_zones(zones)
+
+    def _scan(
+        self,
+        buffer: pd.DataFrame,
+        buffer_offset: int,
+        start: int,
+        stop: int
+    ) -> List[Zone]:
+        """Scan global candidate range [start, stop) within the buffer"""
+        if stop <= start:
+            return []
+
+        df = self.detector._add_atr(buffer, period=self.atr_period)
+        zones = self.detector._scan_zones(
+            df,
+            start - buffer_offset,
+            stop - buffer_offset,
+            offset=buffer_offset
+        )
+        return zones.to_zones()
+
+    def _advance_freshness(
+        self,
+        zones: List[Zone],
+        buffer: pd.DataFrame,
+        buffer_offset: int,
+        start: int
+    ):
+        """Apply retest/break logic for buffer bars from global position start on"""
+        if not zones:
+            return
+
+        high = buffer['high'].to_numpy()
+        low = buffer['low'].to_numpy()
+        close = buffer['close'].to_numpy()
+
+        for zone in zones:
+            begin = max(start, zone.creation_idx + 1) - buffer_offset
+            if begin >= len(buffer):
+                continue
+
+            if zone.zone_type == ZoneType.DEMAND:
+                touched = (low[begin:] <= zone.top) & (close[begin:] > zone.bottom)
+                broken = ~touched & (close[begin:] < zone.bottom)
+            else:
+                touched = (high[begin:] >= zone.bottom) & (close[begin:] < zone.top)
+                broken = ~touched & (close[begin:] > zone.top)
+
+            is_broken = broken.any()
+            if is_broken:
+                touched = touched[:broken.argmax()]
+
+            touches = int(touched.sum())
+            if touches:
+                zone.touches += touches
+                zone.freshness = ZoneFreshness.TESTED
+            if is_broken:
+                zone.freshness = ZoneFreshness.BROKEN
+
+
+def main():
+    """Example usage: chunked vs single-pass detection on demo data"""
+    n = 3000
+    dates = pd.date_range('2024-01-01', periods=n, freq='5min')
+    np.random.seed(42)
+
+    # Alternate quiet (consolidation) and active stretches so zones form
+    vol = np.where((np.arange(n) // 40) % 3 == 0, 0.00005, 0.0004)
+    close = 1.1000 + (np.random.randn(n) * vol).cumsum()
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + abs(np.random.randn(n)) * vol,
+        'low': np.minimum(open_, close) - abs(np.random.randn(n)) * vol,
+        'close': close,
+        'volume': np.random.randint(1000, 10000, n)
+    }, index=dates)
+
+    detector = ZoneDetector(min_velocity_atr=0.5)
+    single = detector.detect_zones(df)
+    chunked = ChunkedZoneDetector(detector, chunk_size=500).detect_zones(df)
+
+    print(f"Single-pass zones: {len(single)}")
+    print(f"Chunked zones:     {len(chunked)}")
+
+    matches = sum(
+        1 for a, b in zip(single, chunked)
+        if a.creation_idx == b.creation_idx
+        and a.zone_type == b.zone_type
+        and a.freshness == b.freshness
+        and a.touches == b.touches
+        and np.isclose(a.top, b.top)
+        and np.isclose(a.strength, b.strength)
+    )
+    print(f"Matching zones:    {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,22 @@ Identifies price zones where institutional orders cluster based on:
 - Zone freshness (untested vs tested)
 """
 
+import sys
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
 
 
+# Freshness scan window: starts at this many bars and doubles, bounded by
+# MAX_BLOCK_CELLS (pending zones x window bars) per step
+FRESHNESS_BLOCK = 256
+MAX_BLOCK_CELLS = 4_000_000
+
+
 class ZoneType(Enum):
     SUPPLY = "supply"      # Resistance / selling zone
     DEMAND = "demand"      # Support / buying zone
@@ -64,6 +73,268 @@ class Zone:
         return self.freshness == ZoneFreshness.FRESH and age <= max_age
 
 
+# Array codes for ZoneSet's zone_type and freshness columns
+ZONE_TYPES = (ZoneType.SUPPLY, ZoneType.DEMAND)
+FRESHNESS_STATES = (ZoneFreshness.FRESH, ZoneFreshness.TESTED, ZoneFreshness.BROKEN)
+
+
+class ZoneSet:
+    """
+    Zones stored as NumPy arrays (one element per zone)
+
+    zone_type and freshness are int8 codes into ZONE_TYPES and
+    FRESHNESS_STATES; creation_time is int64 nanoseconds since the epoch
+    (UTC), with the timezone kept in tz.
+
+    Masks, index arrays and slices select a new ZoneSet; an integer index
+    or iteration returns a Zone record for that row, so code written for
+    List[Zone] keeps working. Zone records are copies: changing one does
+    not change the set.
+    """
+
+    COLUMNS = (
+        'zone_type', 'top', 'bottom', 'creation_time', 'creation_idx', 'touches',
+        'freshness', 'strength', 'velocity', 'volume', 'time_in_zone'
+    )
+
+    def __init__(
+        self,
+        zone_type: np.ndarray,
+        top: np.ndarray,
+        bottom: np.ndarray,
+        creation_time,
+        creation_idx: np.ndarray,
+        touches: np.ndarray = None,
+        freshness: np.ndarray = None,
+        strength: np.ndarray = None,
+        velocity: np.ndarray = None,
+        volume: np.ndarray = None,
+        time_in_zone: np.ndarray = None,
+        tz=None
+    ):
+        """
+        Args:
+            zone_type: int8 codes into ZONE_TYPES
+            top, bottom: Zone boundaries
+            creation_time: int64 UTC nanoseconds, or datetime-like values
+                           (tz is then taken from them)
+            creation_idx: Bar index of zone creation
+            touches, freshness, strength, velocity, volume, time_in_zone:
+                Per-zone values (default 0 / FRESH)
+            tz: Timezone of creation_time
+        """
+        self.zone_type = np.asarray(zone_type, dtype=np.int8)
+        n_zones = len(self.zone_type)
+
+        if np.asarray(creation_time).dtype.kind in 'iu':
+            self.creation_time = np.asarray(creation_time, dtype=np.int64)
+            self.tz = tz
+        else:
+            times = pd.DatetimeIndex(creation_time)
+            self.creation_time = times.as_unit('ns').asi8
+            self.tz = times.tz
+
+        self.top = np.asarray(top, dtype=float)
+        self.bottom = np.asarray(bottom, dtype=float)
+        self.creation_idx = np.asarray(creation_idx, dtype=np.int64)
+        self.touches = _column(touches, n_zones, np.int64)
+        self.freshness = _column(freshness, n_zones, np.int8)
+        self.strength = _column(strength, n_zones, float)
+        self.velocity = _column(velocity, n_zones, float)
+        self.volume = _column(volume, n_zones, float)
+        self.time_in_zone = _column(time_in_zone, n_zones, np.int64)
+
+    @classmethod
+    def from_zones(cls, zones: List[Zone]) -> 'ZoneSet':
+        """Build a ZoneSet from Zone objects"""
+        zones = list(zones)
+        return cls(
+            zone_type=[ZONE_TYPES.index(z.zone_type) for z in zones],
+            top=[z.top for z in zones],
+            bottom=[z.bottom for z in zones],
+            creation_time=pd.DatetimeIndex([z.creation_time for z in zones]),
+            creation_idx=[z.creation_idx for z in zones],
+            touches=[z.touches for z in zones],
+            freshness=[FRESHNESS_STATES.index(z.freshness) for z in zones],
+            strength=[z.strength for z in zones],
+            velocity=[z.velocity for z in zones],
+            volume=[z.volume for z in zones],
+            time_in_zone=[z.time_in_zone for z in zones]
+        )
+
+    @classmethod
+    def concat(cls, zone_sets: List['ZoneSet']) -> 'ZoneSet':
+        """Concatenate zone sets in order (timezone from the first set)"""
+        zone_sets = list(zone_sets)
+        if not zone_sets:
+            return cls.from_zones([])
+        columns = {
+            name: np.concatenate([getattr(zs, name) for zs in zone_sets])
+            for name in cls.COLUMNS
+        }
+        return cls(tz=zone_sets[0].tz, **columns)
+
+    def __len__(self) -> int:
+        return len(self.zone_type)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._zone(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._zone(int(key))
+        columns = {name: getattr(self, name)[key] for name in self.COLUMNS}
+        return ZoneSet(tz=self.tz, **columns)
+
+    def __repr__(self) -> str:
+        return (f"ZoneSet({len(self)} zones: "
+                f"{int(self.is_supply.sum())} supply, {int(self.is_demand.sum())} demand)")
+
+    @property
+    def is_supply(self) -> np.ndarray:
+        return self.zone_type == ZONE_TYPES.index(ZoneType.SUPPLY)
+
+    @property
+    def is_demand(self) -> np.ndarray:
+        return self.zone_type == ZONE_TYPES.index(ZoneType.DEMAND)
+
+    @property
+    def is_broken(self) -> np.ndarray:
+        return self.freshness == FRESHNESS_STATES.index(ZoneFreshness.BROKEN)
+
+    @property
+    def creation_times(self) -> pd.DatetimeIndex:
+        """Creation times as a DatetimeIndex"""
+        times = pd.DatetimeIndex(self.creation_time.astype('datetime64[ns]'))
+        return times.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else times
+
+    def mask(self, zone_type: ZoneType = None, freshness: ZoneFreshness = None) -> np.ndarray:
+        """Boolean mask of zones matching the given type and/or freshness"""
+        selected = np.ones(len(self), dtype=bool)
+        if zone_type is not None:
+            selected &= self.zone_type == ZONE_TYPES.index(zone_type)
+        if freshness is not None:
+            selected &= self.freshness == FRESHNESS_STATES.index(freshness)
+        return selected
+
+    def filter(self, zone_type: ZoneType = None, freshness: ZoneFreshness = None) -> 'ZoneSet':
+        """Zones matching the given type and/or freshness"""
+        return self[self.mask(zone_type, freshness)]
+
+    def count(self, zone_type: ZoneType = None, freshness: ZoneFreshness = None) -> int:
+        """Number of zones matching the given type and/or freshness"""
+        return int(self.mask(zone_type, freshness).sum())
+
+    def sort_by(self, column: str = 'strength', descending: bool = True) -> 'ZoneSet':
+        """Zones sorted by a numeric column (stable, like sorted())"""
+        values = getattr(self, column)
+        order = np.argsort(-values if descending else values, kind='stable')
+        return self[order]
+
+    def to_zones(self) -> List[Zone]:
+        """All zones as Zone records"""
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """All zones as a DataFrame (enum columns as their string values)"""
+        return pd.DataFrame({
+            'zone_type': np.array([t.value for t in ZONE_TYPES])[self.zone_type],
+            'top': self.top,
+            'bottom': self.bottom,
+            'creation_time': self.creation_times,
+            'creation_idx': self.creation_idx,
+            'touches': self.touches,
+            'freshness': np.array([f.value for f in FRESHNESS_STATES])[self.freshness],
+            'strength': self.strength,
+            'velocity': self.velocity,
+            'volume': self.volume,
+            'time_in_zone': self.time_in_zone
+        })
+
+    def _zone(self, i: int) -> Zone:
+        """Zone record for row i"""
+        return Zone(
+            zone_type=ZONE_TYPES[self.zone_type[i]],
+            top=self.top[i],
+            bottom=self.bottom[i],
+            creation_time=pd.Timestamp(int(self.creation_time[i]), unit='ns', tz=self.tz),
+            creation_idx=int(self.creation_idx[i]),
+            touches=int(self.touches[i]),
+            freshness=FRESHNESS_STATES[self.freshness[i]],
+            strength=self.strength[i],
+            velocity=self.velocity[i],
+            volume=self.volume[i],
+            time_in_zone=int(self.time_in_zone[i])
+        )
+
+
+def _column(values, n_zones: int, dtype) -> np.ndarray:
+    """Typed column, zeros if values is None"""
+    if values is None:
+        return np.zeros(n_zones, dtype=dtype)
+    return np.asarray(values, dtype=dtype)
+
+
+def average_true_range(df: pd.DataFrame, period: int = 14, breaks: np.ndarray = None) -> pd.Series:
+    """
+    Simple moving average of the true range
+
+    Bars flagged in breaks (first bar after a market closure or missing
+    bars) use their own high - low, so the gap does not inflate ATR.
+    """
+    high = df['high']
+    low = df['low']
+    close = df['close'].shift(1)
+    if breaks is not None:
+        close = close.where(~breaks)
+
+    tr1 = high - low
+    tr2 = abs(high - close)
+    tr3 = abs(low - close)
+
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    return tr.rolling(window=period).mean()
+
+
+@dataclass
+class ZoneFeatures:
+    """
+    Parameter-free detection primitives for one dataset
+
+    Everything detect_zones() derives from the bars before min_velocity_atr,
+    zone_width_atr, strength weights and lookback_periods are applied: one
+    row per consolidation candidate (breakout bar whose preceding window is
+    tight enough), plus the bar arrays needed for the freshness scan.
+
+    Build once with ZoneDetector.compute_features(), then threshold as often
+    as needed with ZoneDetector.zones_from_features(). Candidate freshness
+    is cached per zone_width_atr.
+    """
+    index: pd.DatetimeIndex
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    min_consolidation_candles: int
+
+    # Per candidate
+    breakout_idx: np.ndarray        # Bar after the consolidation window
+    end_idx: np.ndarray             # Consolidation end (zone creation bar)
+    consol_high: np.ndarray
+    consol_low: np.ndarray
+    atr: np.ndarray                 # ATR at consolidation end
+    move: np.ndarray                # Close change over the breakout (bullish > 0)
+    volume: np.ndarray              # Volume in the consolidation window
+    recent_volume: Optional[np.ndarray]  # Mean volume of the 50 bars before (None without volume)
+    time_in_zone: int               # Candles in the consolidation window
+
+    offset: int = 0                 # Added to creation_idx (chunked scans)
+    freshness_cache: Dict[float, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.end_idx)
+
+
 class ZoneDetector:
     """Detects supply and demand zones in price data"""
 
@@ -90,128 +361,420 @@ class ZoneDetector:
             'touch': 0.2
         }
 
-    def detect_zones(self, df: pd.DataFrame) -> List[Zone]:
+    def detect_zones(self, df: pd.DataFrame, feature_store=None, sessions=None) -> ZoneSet:
         """
         Detect supply and demand zones in price data
 
         Args:
             df: DataFrame with columns: open, high, low, close, volume
                 Index should be timestamp
+            feature_store: Optional feature store view for df's dataset
+                           (data.features.FeatureView) to read ATR from
+            sessions: Optional session index of df (data.sessions.SessionIndex);
+                      consolidation and breakout windows then never straddle
+                      a market closure or missing bars
 
         Returns:
-            List of Zone objects
+            ZoneSet (iterates as Zone objects)
         """
         # Calculate ATR for zone sizing
-        df = self._add_atr(df)
-
-        zones = []
-
-        # Look for consolidation areas followed by sharp moves
-        for i in range(self.lookback_periods, len(df)):
-            # Check for consolidation
-            consolidation_start = i - self.min_consolidation_candles - 10
-            consolidation_end = i - 1
-
-            if consolidation_start < 0:
-                continue
-
-            consol_data = df.iloc[consolidation_start:consolidation_end + 1]
-
-            # Identify consolidation (low volatility)
-            consol_range = consol_data['high'].max() - consol_data['low'].min()
-            avg_atr = df['atr'].iloc[consolidation_end]
-
-            if consol_range > avg_atr * 1.5:  # Too wide to be consolidation
-                continue
-
-            # Check for sharp move away from consolidation
-            move_start = consolidation_end + 1
-            move_end = min(move_start + 5, len(df) - 1)
-            move_data = df.iloc[move_start:move_end + 1]
-
-            # Bullish move = demand zone created
-            bullish_move = move_data['close'].iloc[-1] - consol_data['close'].iloc[-1]
-            # Bearish move = supply zone created
-            bearish_move = consol_data['close'].iloc[-1] - move_data['close'].iloc[-1]
-
-            velocity = max(bullish_move, bearish_move)
-
-            if velocity < avg_atr * self.min_velocity_atr:
-                continue  # Move not strong enough
-
-            # Create zone
-            if bullish_move > bearish_move:
-                # Demand zone (support)
-                zone_type = ZoneType.DEMAND
-                zone_bottom = consol_data['low'].min()
-                zone_top = zone_bottom + (avg_atr * self.zone_width_atr)
-            else:
-                # Supply zone (resistance)
-                zone_type = ZoneType.SUPPLY
-                zone_top = consol_data['high'].max()
-                zone_bottom = zone_top - (avg_atr * self.zone_width_atr)
-
-            # Calculate strength metrics
-            volume = consol_data['volume'].sum() if 'volume' in consol_data else 0
-            time_in_zone = len(consol_data)
-
-            zone = Zone(
-                zone_type=zone_type,
-                top=zone_top,
-                bottom=zone_bottom,
-                creation_time=df.index[consolidation_end],
-                creation_idx=consolidation_end,
-                velocity=velocity / avg_atr,  # Normalized velocity
-                volume=volume,
-                time_in_zone=time_in_zone
-            )
+        df = self._add_atr(df, feature_store=feature_store, sessions=sessions)
+
+        features = self._zone_features(df, self.lookback_periods, len(df), sessions=sessions)
+
+        # Threshold candidates and update zone freshness based on retests
+        return self.zones_from_features(features)
+
+    def compute_features(self, df: pd.DataFrame, feature_store=None, sessions=None) -> ZoneFeatures:
+        """
+        Parameter-free feature pass for re-thresholding
 
-            # Calculate strength score
-            zone.strength = self._calculate_strength(zone, df, consolidation_end)
+        Computes ATR, consolidation ranges and breakout moves once; the
+        result depends only on the data, min_consolidation_candles and the
+        session index.
 
-            zones.append(zone)
+        Args:
+            df: DataFrame with columns: open, high, low, close, volume
+            feature_store: Optional feature store view to read ATR from
+            sessions: Optional session index of df (see detect_zones)
+
+        Returns:
+            ZoneFeatures covering every candidate bar
+        """
+        df = self._add_atr(df, feature_store=feature_store, sessions=sessions)
+        return self._zone_features(df, 0, len(df), sessions=sessions)
+
+    def zones_from_features(
+        self,
+        features: ZoneFeatures,
+        min_velocity_atr: float = None,
+        zone_width_atr: float = None,
+        strength_weights: Dict[str, float] = None,
+        lookback_periods: int = None
+    ) -> ZoneSet:
+        """
+        Thresholding pass: zones for one parameter set
 
-        # Update zone freshness based on retests
-        zones = self._update_zone_freshness(zones, df)
+        Parameters default to the detector's own. Changing min_velocity_atr,
+        strength_weights or lookback_periods only selects and re-scores
+        cached candidates; a new zone_width_atr also runs the freshness scan
+        once for that width.
 
+        Args:
+            features: Output of compute_features()
+            min_velocity_atr: Minimum breakout move in ATR multiples
+            zone_width_atr: Zone width in ATR multiples
+            strength_weights: Strength score weights
+            lookback_periods: First breakout bar considered
+
+        Returns:
+            ZoneSet with freshness evaluated
+        """
+        min_velocity_atr = self.min_velocity_atr if min_velocity_atr is None else min_velocity_atr
+        zone_width_atr = self.zone_width_atr if zone_width_atr is None else zone_width_atr
+        lookback_periods = self.lookback_periods if lookback_periods is None else lookback_periods
+
+        # Move strong enough and candidate in range
+        velocity = np.abs(features.move)
+        rows = np.flatnonzero(
+            ~(velocity < features.atr * min_velocity_atr) &
+            (features.breakout_idx >= lookback_periods)
+        )
+
+        zones = self._build_zones(features, rows, zone_width_atr, strength_weights)
+        zones.touches, zones.freshness = self._candidate_freshness(features, rows, zone_width_atr, zones)
         return zones
 
-    def _add_atr(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Add ATR (Average True Range) to dataframe"""
-        df = df.copy()
+    def _zone_features(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        stop: int,
+        offset: int = 0,
+        sessions=None
+    ) -> ZoneFeatures:
+        """
+        Feature pass over candidate breakout bars in [start, stop)
+
+        Args:
+            df: DataFrame with an 'atr' column (see _add_atr)
+            start: First candidate bar (positional, within df)
+            stop: End of candidate range (exclusive)
+            offset: Position of df's first row in the full dataset;
+                    added to creation_idx so chunked scans stay globally indexed
+            sessions: Optional session index of the full dataset; candidates
+                      whose window or move spans a break are dropped
+        """
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        atr = df['atr'].to_numpy(dtype=float)
+        n_bars = len(df)
+
+        # Consolidation window: the bars before candidate i
+        window = self.min_consolidation_candles + 10
+        start = max(start, window)
+        breakout_idx = np.arange(start, max(start, stop))
+        end_idx = breakout_idx - 1
+
+        # Window extremes, indexed by window end bar
+        consol_high = self._window_reduce(high, window, np.max)[end_idx]
+        consol_low = self._window_reduce(low, window, np.min)[end_idx]
+        avg_atr = atr[end_idx]
+
+        # Identify consolidation (low volatility)
+        is_consolidation = ~(consol_high - consol_low > avg_atr * 1.5)
+
+        # Window and breakout move within one run of contiguous bars
+        if sessions is not None:
+            move_end = np.minimum(breakout_idx + 5, n_bars - 1)
+            is_consolidation &= sessions.unbroken(end_idx - window + 1 + offset, move_end + offset)
+
+        breakout_idx, end_idx = breakout_idx[is_consolidation], end_idx[is_consolidation]
+        consol_high, consol_low = consol_high[is_consolidation], consol_low[is_consolidation]
+        avg_atr = avg_atr[is_consolidation]
+
+        # Move away from consolidation over the next 5 bars
+        move_end = np.minimum(breakout_idx + 5, n_bars - 1)
+        move = close[move_end] - close[end_idx]
+
+        if 'volume' in df.columns:
+            volume = self._window_reduce(df['volume'].to_numpy(dtype=float), window, np.sum)[end_idx]
+            recent_volume = self._volume_baseline(df)[end_idx]
+        else:
+            volume = np.zeros(len(end_idx))
+            recent_volume = None
+
+        return ZoneFeatures(
+            index=df.index,
+            high=high,
+            low=low,
+            close=close,
+            min_consolidation_candles=self.min_consolidation_candles,
+            breakout_idx=breakout_idx,
+            end_idx=end_idx,
+            consol_high=consol_high,
+            consol_low=consol_low,
+            atr=avg_atr,
+            move=move,
+            volume=volume,
+            recent_volume=recent_volume,
+            time_in_zone=window,
+            offset=offset
+        )
+
+    def _window_reduce(self, values: np.ndarray, window: int, func) -> np.ndarray:
+        """func over each trailing window, indexed by window end (NaN before the first full window)"""
+        result = np.full(len(values), np.nan)
+        if len(values) >= window:
+            result[window - 1:] = func(sliding_window_view(values, window), axis=1)
+        return result
+
+    def _build_zones(
+        self,
+        features: ZoneFeatures,
+        rows: np.ndarray,
+        zone_width_atr: float,
+        strength_weights: Dict[str, float] = None
+    ) -> ZoneSet:
+        """Zones for the selected candidate rows (freshness not evaluated)"""
+        # Bullish move = demand zone (support), bearish = supply (resistance)
+        is_demand = features.move[rows] > 0
+        atr = features.atr[rows]
+        width = atr * zone_width_atr
+
+        consol_high = features.consol_high[rows]
+        consol_low = features.consol_low[rows]
+        top = np.where(is_demand, consol_low + width, consol_high)
+        bottom = np.where(is_demand, consol_low, consol_high - width)
+
+        velocity = np.abs(features.move[rows]) / atr  # Normalized velocity
+        time_in_zone = np.full(len(rows), features.time_in_zone)
+        volume = features.volume[rows]
+
+        strength = self._strength_scores(
+            velocity=velocity,
+            time_in_zone=time_in_zone,
+            volume=volume,
+            recent_volume=features.recent_volume[rows] if features.recent_volume is not None else None,
+            strength_weights=strength_weights
+        )
+
+        end_idx = features.end_idx[rows]
+        return ZoneSet(
+            zone_type=np.where(is_demand, ZONE_TYPES.index(ZoneType.DEMAND), ZONE_TYPES.index(ZoneType.SUPPLY)),
+            top=top,
+            bottom=bottom,
+            creation_time=features.index[end_idx],
+            creation_idx=end_idx + features.offset,
+            strength=strength,
+            velocity=velocity,
+            volume=volume,
+            time_in_zone=time_in_zone
+        )
+
+    def _candidate_freshness(
+        self,
+        features: ZoneFeatures,
+        rows: np.ndarray,
+        zone_width_atr: float,
+        zones: ZoneSet
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Touches and freshness codes for candidate rows, cached per width"""
+        if zone_width_atr not in features.freshness_cache:
+            features.freshness_cache[zone_width_atr] = (
+                np.full(len(features), -1, dtype=np.int64),
+                np.zeros(len(features), dtype=np.int8)
+            )
+        touches, freshness = features.freshness_cache[zone_width_atr]
+
+        # Scan only candidates not seen at this width yet
+        todo = touches[rows] < 0
+        if todo.any():
+            new_touches, new_freshness = self._scan_freshness(
+                zones.is_demand[todo],
+                zones.top[todo],
+                zones.bottom[todo],
+                features.end_idx[rows[todo]] + 1,
+                features.high,
+                features.low,
+                features.close
+            )
+            touches[rows[todo]] = new_touches
+            freshness[rows[todo]] = new_freshness
+
+        return touches[rows], freshness[rows]
+
+    def _scan_freshness(
+        self,
+        is_demand: np.ndarray,
+        top: np.ndarray,
+        bottom: np.ndarray,
+        start: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count retests and find breaks for many zones at once
+
+        Each zone is scanned from its start bar until it breaks, in windows
+        that double in width, so short-lived zones cost one small block.
+
+        Returns:
+            (touches, freshness codes) per zone
+        """
+        n_bars = len(close)
+        touches = np.zeros(len(start), dtype=np.int64)
+        broken = np.zeros(len(start), dtype=bool)
+
+        position = np.asarray(start, dtype=np.int64).copy()
+        pending = np.flatnonzero(position < n_bars)
+        width = FRESHNESS_BLOCK
+
+        while pending.size:
+            offsets = np.arange(width)
+            cols = position[pending, None] + offsets
+            valid = cols < n_bars
+            cols = np.minimum(cols, n_bars - 1)
+
+            demand = is_demand[pending, None]
+            zone_top = top[pending, None]
+            zone_bottom = bottom[pending, None]
+            bar_close = close[cols]
+
+            # Demand: touched from above / broken below; supply mirrored
+            touched = valid & np.where(
+                demand,
+                (low[cols] <= zone_top) & (bar_close > zone_bottom),
+                (high[cols] >= zone_bottom) & (bar_close < zone_top)
+            )
+            breaks = valid & ~touched & np.where(demand, bar_close < zone_bottom, bar_close > zone_top)
+
+            hit = breaks.any(axis=1)
+            first_break = np.where(hit, breaks.argmax(axis=1), width)
+            touches[pending] += (touched & (offsets < first_break[:, None])).sum(axis=1)
+            broken[pending[hit]] = True
+
+            position[pending] += width
+            pending = pending[~hit & (position[pending] < n_bars)]
+            width = max(FRESHNESS_BLOCK, min(width * 2, MAX_BLOCK_CELLS // max(pending.size, 1)))
+
+        freshness = np.where(
+            broken,
+            FRESHNESS_STATES.index(ZoneFreshness.BROKEN),
+            np.where(
+                touches > 0,
+                FRESHNESS_STATES.index(ZoneFreshness.TESTED),
+                FRESHNESS_STATES.index(ZoneFreshness.FRESH)
+            )
+        ).astype(np.int8)
+
+        return touches, freshness
+
+    def _scan_zones(
+        self,
+        df: pd.DataFrame,
+        start: int,
+        stop: int,
+        offset: int = 0
+    ) -> ZoneSet:
+        """
+        Scan candidate breakout bars in [start, stop) for new zones
+
+        Args:
+            df: DataFrame with an 'atr' column (see _add_atr)
+            start: First candidate bar (positional, within df)
+            stop: End of candidate range (exclusive)
+            offset: Position of df's first row in the full dataset;
+                    added to creation_idx so chunked scans stay globally indexed
+
+        Returns:
+            ZoneSet, freshness not yet evaluated
+        """
+        features = self._zone_features(df, start, stop, offset)
+        rows = np.flatnonzero(~(np.abs(features.move) < features.atr * self.min_velocity_atr))
+        return self._build_zones(features, rows, self.zone_width_atr)
 
-        high = df['high']
-        low = df['low']
-        close = df['close'].shift(1)
+    def _add_atr(self, df: pd.DataFrame, period: int = 14, feature_store=None, sessions=None) -> pd.DataFrame:
+        """
+        Add ATR (Average True Range) to dataframe, from feature_store if given
+
+        With a session index, bars after a break do not take the gap into
+        their true range (cached separately per calendar).
+        """
+        if sessions is None:
+            compute, params = average_true_range, {}
+        else:
+            def compute(bars, period, calendar):
+                return average_true_range(bars, period, sessions.breaks_for(bars.index))
+            params = {'calendar': sessions.name}
 
-        tr1 = high - low
-        tr2 = abs(high - close)
-        tr3 = abs(low - close)
+        if feature_store is not None:
+            atr = feature_store.get('atr', df, compute, period=period, **params)
+        else:
+            atr = compute(df, period=period, **params)
 
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        df['atr'] = tr.rolling(window=period).mean()
+        df = df.copy()
+        df['atr'] = atr
 
         return df
 
-    def _calculate_strength(
+    def score_zones(
         self,
-        zone: Zone,
+        zones: ZoneSet,
         df: pd.DataFrame,
-        creation_idx: int
-    ) -> float:
-        """Calculate zone strength score (0-1)"""
+        strength_weights: Dict[str, float] = None
+    ) -> ZoneSet:
+        """
+        Re-score zone strength without re-detecting
+
+        Args:
+            zones: Zones detected on df
+            df: OHLCV data the zones were detected on
+            strength_weights: Weights to score with (default: self.strength_weights)
+
+        Returns:
+            Copy of zones with strength recomputed
+        """
+        volume_baseline = self._volume_baseline(df)
+
+        scored = zones[:]
+        scored.strength = self._strength_scores(
+            velocity=zones.velocity,
+            time_in_zone=zones.time_in_zone,
+            volume=zones.volume,
+            recent_volume=volume_baseline[zones.creation_idx] if volume_baseline is not None else None,
+            strength_weights=strength_weights
+        )
+        return scored
+
+    def _volume_baseline(self, df: pd.DataFrame) -> np.ndarray:
+        """Mean volume over the 50 bars before each bar (None without volume data)"""
+        if 'volume' not in df.columns:
+            return None
+        return df['volume'].rolling(window=50, min_periods=1).mean().shift(1).to_numpy()
+
+    def _strength_scores(
+        self,
+        velocity: np.ndarray,
+        time_in_zone: np.ndarray,
+        volume: np.ndarray,
+        recent_volume: np.ndarray = None,
+        strength_weights: Dict[str, float] = None
+    ) -> np.ndarray:
+        """Calculate zone strength scores (0-1) for arrays of zone metrics"""
 
         # Normalize metrics
         max_velocity = 5.0  # ATR multiples
-        velocity_score = min(zone.velocity / max_velocity, 1.0)
+        velocity_score = np.minimum(velocity / max_velocity, 1.0)
 
         max_time = 20  # candles
-        time_score = min(zone.time_in_zone / max_time, 1.0)
+        time_score = np.minimum(time_in_zone / max_time, 1.0)
 
         # Volume score (relative to recent average)
-        if 'volume' in df.columns:
-            recent_vol = df['volume'].iloc[max(0, creation_idx-50):creation_idx].mean()
-            volume_score = min(zone.volume / (recent_vol * zone.time_in_zone + 1e-8), 1.0)
+        if recent_volume is not None:
+            volume_score = np.minimum(volume / (recent_volume * time_in_zone + 1e-8), 1.0)
         else:
             volume_score = 0.5  # Neutral if no volume data
 
@@ -219,7 +782,7 @@ class ZoneDetector:
         touch_score = 0.0
 
         # Weighted combination
-        weights = self.strength_weights
+        weights = strength_weights or self.strength_weights
         strength = (
             weights['velocity'] * velocity_score +
             weights['time'] * time_score +
@@ -231,46 +794,36 @@ class ZoneDetector:
 
     def _update_zone_freshness(
         self,
-        zones: List[Zone],
+        zones: ZoneSet,
         df: pd.DataFrame
-    ) -> List[Zone]:
+    ) -> ZoneSet:
         """Update zone freshness based on price retests"""
-
-        for zone in zones:
-            # Check all candles after zone creation
-            test_data = df.iloc[zone.creation_idx + 1:]
-
-            for idx, row in test_data.iterrows():
-                if zone.zone_type == ZoneType.DEMAND:
-                    # Price touched zone from above
-                    if row['low'] <= zone.top and row['close'] > zone.bottom:
-                        zone.touches += 1
-                        zone.freshness = ZoneFreshness.TESTED
-                    # Price broke through zone
-                    elif row['close'] < zone.bottom:
-                        zone.freshness = ZoneFreshness.BROKEN
-                        break
-
-                elif zone.zone_type == ZoneType.SUPPLY:
-                    # Price touched zone from below
-                    if row['high'] >= zone.bottom and row['close'] < zone.top:
-                        zone.touches += 1
-                        zone.freshness = ZoneFreshness.TESTED
-                    # Price broke through zone
-                    elif row['close'] > zone.top:
-                        zone.freshness = ZoneFreshness.BROKEN
-                        break
-
+        zones.touches, zones.freshness = self._scan_freshness(
+            zones.is_demand,
+            zones.top,
+            zones.bottom,
+            zones.creation_idx + 1,
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float)
+        )
         return zones
 
     def get_active_zones(
         self,
-        zones: List[Zone],
+        zones: Union[ZoneSet, List[Zone]],
         current_idx: int,
         only_fresh: bool = False
-    ) -> List[Zone]:
+    ) -> Union[ZoneSet, List[Zone]]:
         """Get zones that are still active (not broken)"""
 
+        if isinstance(zones, ZoneSet):
+            active = ~zones.is_broken
+            if only_fresh:
+                age = current_idx - zones.creation_idx
+                active &= zones.mask(freshness=ZoneFreshness.FRESH) & (age <= self.freshness_max_age)
+            return zones[active]
+
         active = [
             z for z in zones
             if z.freshness != ZoneFreshness.BROKEN
@@ -287,36 +840,26 @@ class ZoneDetector:
 
 def main():
     """Example usage"""
-    # This would normally load from parquet files
-    # For demo, create sample data
-    dates = pd.date_range('2024-01-01', periods=500, freq='15min')
-    np.random.seed(42)
-
-    df = pd.DataFrame({
-        'open': 1.1000 + np.random.randn(500).cumsum() * 0.0001,
-        'high': 1.1000 + np.random.randn(500).cumsum() * 0.0001 + 0.0005,
-        'low': 1.1000 + np.random.randn(500).cumsum() * 0.0001 - 0.0005,
-        'close': 1.1000 + np.random.randn(500).cumsum() * 0.0001,
-        'volume': np.random.randint(1000, 10000, 500)
-    }, index=dates)
-
-    # Ensure OHLC relationships
-    df['high'] = df[['open', 'close']].max(axis=1) + abs(np.random.randn(500)) * 0.0002
-    df['low'] = df[['open', 'close']].min(axis=1) - abs(np.random.randn(500)) * 0.0002
+    # Shared demo data generator (code/ is not on the path when run as a script)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from data.synthetic import generate_ohlcv
+
+    # XAUUSD-like M15 demo series
+    df = generate_ohlcv(500, "M15", seed=42, start="2024-01-01")
 
     # Detect zones
     detector = ZoneDetector()
     zones = detector.detect_zones(df)
 
     print(f"\nDetected {len(zones)} zones")
-    print(f"Supply zones: {sum(1 for z in zones if z.zone_type == ZoneType.SUPPLY)}")
-    print(f"Demand zones: {sum(1 for z in zones if z.zone_type == ZoneType.DEMAND)}")
-    print(f"Fresh zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.FRESH)}")
-    print(f"Tested zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.TESTED)}")
-    print(f"Broken zones: {sum(1 for z in zones if z.freshness == ZoneFreshness.BROKEN)}")
+    print(f"Supply zones: {zones.count(ZoneType.SUPPLY)}")
+    print(f"Demand zones: {zones.count(ZoneType.DEMAND)}")
+    print(f"Fresh zones: {zones.count(freshness=ZoneFreshness.FRESH)}")
+    print(f"Tested zones: {zones.count(freshness=ZoneFreshness.TESTED)}")
+    print(f"Broken zones: {zones.count(freshness=ZoneFreshness.BROKEN)}")
 
     # Show strongest zones
-    zones_by_strength = sorted(zones, key=lambda z: z.strength, reverse=True)
+    zones_by_strength = zones.sort_by('strength')
     print("\nTop 5 strongest zones:")
     for i, zone in enumerate(zones_by_strength[:5], 1):
         print(f"{i}. {zone.zone_type.value.upper()} - "
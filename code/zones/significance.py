@@ -0,0 +1,256 @@
+"""
+OB Concentration Significance
+
+Tests whether zones form inside the periodic OB windows more often than
+the bars themselves fall there:
+- Expected fraction: the share of the dataset's bars classified as OB
+  time (PeriodicOBFilter.get_ob_statistics / time_features), not a fixed
+  33.3%; pooled over instruments it is weighted by each one's zones
+- Chi-square goodness of fit (1 dof) and exact binomial p-values
+- Permutation test: every zone time is shifted by a random whole number
+  of bars, and the OB share of the shifted zones forms the null
+  distribution. Shifts are drawn uniformly over the bar slots of an hour,
+  either one per permutation for all zones ('common', the default: it
+  keeps the zones' clustering intact, with 60 / bar_minutes distinct
+  shifts) or per zone ('independent'). With bar-aligned zone times every
+  zone then has the same OB probability, so 'independent' reduces to
+  Binomial(zones, OB slots / slots) and adds nothing over binomial_test
+
+OB membership depends on the minute of the hour alone, so a zone set is
+summarised by its 60-bin minute histogram (minute_histogram), which sums
+across instruments and periods. Permutations run in NumPy batches of
+(permutations x zones) offsets.
+
+Example:
+    hist = minute_histogram(zones.creation_times)
+    expected = expected_fraction(ob_filter.get_ob_statistics(df_m5))
+    result = concentration_test(hist, ob_filter, expected, bar_minutes=5)
+    print(result.summary())
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, asdict
+from scipy import stats
+from typing import Dict, Optional, Tuple, Union
+
+MINUTES_PER_HOUR = 60
+
+# Offsets per permutation batch (permutations x zones)
+BATCH_ELEMENTS = 4_000_000
+
+
+@dataclass
+class ConcentrationTest:
+    """Outcome of concentration_test()"""
+    zones: int
+    ob_zones: int
+    expected_fraction: float            # OB share of the bars
+    chi_square: float
+    chi_square_p: float
+    binomial_p: float                   # One-sided: more OB zones than expected
+    permutation_p: Optional[float] = None
+    permutations: int = 0
+    shift: str = 'common'
+    null_mean: Optional[float] = None   # OB share of the zones under the permutation null
+    null_std: Optional[float] = None
+
+    @property
+    def observed_fraction(self) -> float:
+        return self.ob_zones / self.zones if self.zones else 0.0
+
+    @property
+    def concentration(self) -> float:
+        """Observed over expected OB share"""
+        return self.observed_fraction / self.expected_fraction if self.expected_fraction > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), 'observed_fraction': self.observed_fraction, 'concentration': self.concentration}
+
+    def summary(self) -> str:
+        lines = [
+            f"OB zones: {self.ob_zones:,}/{self.zones:,} ({self.observed_fraction:.1%}) vs "
+            f"{self.expected_fraction:.1%} of bars - concentration {self.concentration:.2f}x",
+            f"  Chi-square: X^2 = {self.chi_square:.2f}, {_p(self.chi_square_p)}",
+            f"  Binomial (one-sided): {_p(self.binomial_p)}",
+        ]
+        if self.permutations:
+            lines.append(
+                f"  Permutation ({self.permutations:,} {self.shift} shifts): "
+                f"{_p(self.permutation_p, self.permutations)}, "
+                f"null OB share {self.null_mean:.1%} +/- {self.null_std:.1%}"
+            )
+        return "\n".join(lines)
+
+
+def format_p_value(p: float, permutations: int = 0) -> str:
+    """p-value for reports ('<1/(n+1)' at a permutation test's resolution, '<1e-300' on underflow)"""
+    if permutations and p <= 1 / (permutations + 1):
+        return f"<{1 / (permutations + 1):.1e}"
+    if p < 1e-300:
+        return "<1e-300"
+    return f"{p:.2e}" if p < 0.001 else f"{p:.3f}"
+
+
+def _p(p: float, permutations: int = 0) -> str:
+    text = format_p_value(p, permutations)
+    return f"p {text}" if text.startswith("<") else f"p = {text}"
+
+
+def ob_minute_table(ob_filter) -> np.ndarray:
+    """(60,) OB flag per minute of the hour, as PeriodicOBFilter.is_ob_time classifies it"""
+    return np.array([ob_filter.is_ob_time(pd.Timestamp(2000, 1, 1, 0, minute))
+                     for minute in range(MINUTES_PER_HOUR)], dtype=bool)
+
+
+def minute_histogram(times: pd.DatetimeIndex) -> np.ndarray:
+    """(60,) count of timestamps per minute of the hour"""
+    return np.bincount(np.asarray(pd.DatetimeIndex(times).minute), minlength=MINUTES_PER_HOUR)
+
+
+def expected_fraction(ob_statistics: Dict) -> float:
+    """OB share of the bars from PeriodicOBFilter.get_ob_statistics()"""
+    total = ob_statistics['total_bars']
+    return ob_statistics['ob_bars'] / total if total else 0.0
+
+
+def chi_square_test(observed, total, expected) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Chi-square goodness of fit of OB / non-OB counts (1 dof)
+
+    Args:
+        observed: OB zones (scalar or array)
+        total: All zones
+        expected: Expected OB fraction
+
+    Returns:
+        (X^2, p-value), with the shape of the inputs
+    """
+    observed, total, expected = (np.asarray(v, dtype=float) for v in (observed, total, expected))
+    expected_ob = total * expected
+    expected_other = total - expected_ob
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = ((observed - expected_ob) ** 2 / expected_ob +
+                (total - observed - expected_other) ** 2 / expected_other)
+    return chi2, stats.chi2.sf(chi2, df=1)
+
+
+def binomial_test(observed, total, expected, alternative: str = 'greater') -> np.ndarray:
+    """
+    Exact binomial p-value of the OB zone count
+
+    Args:
+        observed, total, expected: As for chi_square_test (scalars or arrays)
+        alternative: 'greater' (concentration), 'less', or 'two-sided'
+                     (twice the smaller tail, capped at 1)
+    """
+    observed, total = np.asarray(observed), np.asarray(total)
+    greater = stats.binom.sf(observed - 1, total, expected)
+    if alternative == 'greater':
+        return greater
+    less = stats.binom.cdf(observed, total, expected)
+    if alternative == 'less':
+        return less
+    if alternative == 'two-sided':
+        return np.minimum(1.0, 2 * np.minimum(greater, less))
+    raise ValueError(f"Unknown alternative: {alternative}")
+
+
+def permutation_null(
+    histogram: np.ndarray,
+    ob_table: np.ndarray,
+    bar_minutes: int = 5,
+    permutations: int = 10_000,
+    shift: str = 'common',
+    seed: Optional[int] = 42
+) -> np.ndarray:
+    """
+    OB zone counts of randomly shifted zone sets
+
+    Args:
+        histogram: (60,) zones per minute of the hour (minute_histogram)
+        ob_table: (60,) OB flag per minute (ob_minute_table)
+        bar_minutes: Shift step; shifts are 0, bar_minutes, ... < 60 minutes
+        permutations: Shifted zone sets to draw
+        shift: 'common' (one shift per set, keeps clustering) or
+               'independent' (one per zone; binomial for bar-aligned zones)
+        seed: Random seed
+
+    Returns:
+        (permutations,) OB zone count of each shifted set
+    """
+    slots = np.arange(0, MINUTES_PER_HOUR, bar_minutes)
+    rng = np.random.default_rng(seed)
+    histogram = np.asarray(histogram)
+
+    # Shifting every zone by the same slot: OB count for each slot straight from the histogram
+    minutes = np.arange(MINUTES_PER_HOUR)
+    if shift == 'common':
+        by_slot = np.array([histogram @ ob_table[(minutes + s) % MINUTES_PER_HOUR] for s in slots])
+        return by_slot[rng.integers(0, len(slots), size=permutations)]
+    if shift != 'independent':
+        raise ValueError(f"Unknown shift: {shift}")
+
+    zone_minutes = np.repeat(minutes, histogram).astype(np.int16)
+    if len(zone_minutes) == 0:
+        return np.zeros(permutations, dtype=np.int64)
+
+    # Table indexed by (zone minute + shift), unrolled over two hours to skip the modulo
+    table = np.tile(ob_table, 2)
+    counts = np.empty(permutations, dtype=np.int64)
+    batch = max(1, BATCH_ELEMENTS // len(zone_minutes))
+    for start in range(0, permutations, batch):
+        rows = min(batch, permutations - start)
+        offsets = slots.astype(np.int16)[rng.integers(0, len(slots), size=(rows, len(zone_minutes)))]
+        counts[start:start + rows] = table[zone_minutes + offsets].sum(axis=1)
+    return counts
+
+
+def concentration_test(
+    histogram: Union[np.ndarray, pd.DatetimeIndex],
+    ob_filter,
+    expected: float,
+    bar_minutes: int = 5,
+    permutations: int = 10_000,
+    shift: str = 'common',
+    seed: Optional[int] = 42
+) -> ConcentrationTest:
+    """
+    Chi-square, binomial and permutation tests of a zone set's OB concentration
+
+    Args:
+        histogram: (60,) zones per minute of the hour, or the zone creation times
+        ob_filter: PeriodicOBFilter defining the windows
+        expected: Expected OB fraction (expected_fraction())
+        bar_minutes: Bar length, the permutation shift step
+        permutations: Permutations (0 skips the permutation test)
+        shift, seed: As for permutation_null()
+
+    Returns:
+        ConcentrationTest
+    """
+    if isinstance(histogram, pd.DatetimeIndex):
+        histogram = minute_histogram(histogram)
+    histogram = np.asarray(histogram)
+    ob_table = ob_minute_table(ob_filter)
+
+    zones = int(histogram.sum())
+    ob_zones = int(histogram @ ob_table)
+    chi2, chi2_p = chi_square_test(ob_zones, zones, expected)
+    result = ConcentrationTest(
+        zones=zones,
+        ob_zones=ob_zones,
+        expected_fraction=float(expected),
+        chi_square=float(chi2),
+        chi_square_p=float(chi2_p),
+        binomial_p=float(binomial_test(ob_zones, zones, expected)),
+        shift=shift,
+    )
+
+    if permutations and zones:
+        null = permutation_null(histogram, ob_table, bar_minutes, permutations, shift, seed)
+        result.permutations = permutations
+        result.permutation_p = float((1 + np.count_nonzero(null >= ob_zones)) / (permutations + 1))
+        result.null_mean = float(null.mean() / zones)
+        result.null_std = float(null.std() / zones)
+    return result
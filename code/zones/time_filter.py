@@ -7,14 +7,43 @@ Periodic Order Block (OB) patterns confirmed in XAUUSD:
 
 These times show higher probability of institutional order blocks.
 Aligns with State Space Ontology - temporal regimes matter.
+
+Window minutes are inclusive: xx:27-xx:33 covers [xx:27:00, xx:34:00).
+Besides the bar-open flags (is_ob_time etc., which classify a bar by its
+open minute), time_features() gives the fraction of each bar's time
+[open, open + bar length) inside each window, so M1, M5, tick-built and
+custom bars are compared on the same minute-exact windows: an M5 bar at
+xx:25 overlaps xx:27-xx:33 by 3/5, one at xx:30 by 4/5.
 """
 
+import sys
+import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from pathlib import Path
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 
+NS_PER_MINUTE = 60_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+
+
+def minute_of_hour(index: pd.DatetimeIndex) -> np.ndarray:
+    """Minutes since the start of the hour, with seconds as a fraction (wall-clock time)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return (index.as_unit('ns').asi8 % NS_PER_HOUR) / NS_PER_MINUTE
+
+
+def infer_bar_minutes(index: pd.DatetimeIndex) -> float:
+    """Bar length of a bar series: the smallest step between bars (gaps only lengthen steps)"""
+    steps = np.diff(pd.DatetimeIndex(index).as_unit('ns').asi8)
+    steps = steps[steps > 0]
+    return steps.min() / NS_PER_MINUTE if len(steps) else 1.0
+
+
 class TimeZone(Enum):
     HOURLY_TURN = "hourly_turn"     # xx:55 - xx:05
     HALF_HOUR = "half_hour"          # xx:30 +/- 2-3 min
@@ -44,6 +73,38 @@ class TimeWindow:
 
         return False
 
+    def intervals(self) -> List[Tuple[int, int]]:
+        """Half-open [start, end) minute-of-hour intervals covered (inclusive end minutes)"""
+        intervals = []
+        for start, end in self.minute_ranges:
+            if start <= end:
+                intervals.append((start, end + 1))
+            else:
+                intervals += [(start, 60), (0, end + 1)]
+        return intervals
+
+    def covered_minutes(self, minutes: np.ndarray) -> np.ndarray:
+        """Window minutes between xx:00 of some hour and that many minutes later"""
+        # Piecewise linear within the hour, with knots at the interval bounds
+        intervals = np.array(self.intervals(), dtype=float).reshape(-1, 2)
+        width = intervals[:, 1] - intervals[:, 0]
+        knots = np.unique(np.concatenate([[0.0, 60.0], intervals.ravel()]))
+        covered = np.clip(knots[:, None] - intervals[:, 0], 0.0, width).sum(axis=1)
+
+        hours, offset = np.divmod(np.asarray(minutes, dtype=float), 60.0)
+        return hours * width.sum() + np.interp(offset, knots, covered)
+
+    def overlap(self, start_minute: np.ndarray, bar_minutes: float) -> np.ndarray:
+        """
+        Fraction of each bar [start, start + bar_minutes) inside the window
+
+        Args:
+            start_minute: Bar open as minutes past the hour (see minute_of_hour)
+            bar_minutes: Bar length in minutes (any length, e.g. 0.5, 5 or 240)
+        """
+        start_minute = np.asarray(start_minute, dtype=float)
+        return (self.covered_minutes(start_minute + bar_minutes) - self.covered_minutes(start_minute)) / bar_minutes
+
 
 class PeriodicOBFilter:
     """Filter for time-based Order Block patterns"""
@@ -121,45 +182,133 @@ class PeriodicOBFilter:
 
         return df
 
-    def add_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_time_features(self, df: pd.DataFrame, feature_store=None) -> pd.DataFrame:
         """
         Add time-based features to dataframe
 
         Args:
             df: DataFrame with timestamp index
+            feature_store: Optional feature store view for df's dataset
+                           (data.features.FeatureView)
 
         Returns:
             DataFrame with additional time features
         """
+        time = self.time_features(df, feature_store)
         df = df.copy()
 
         # Time zone classification
-        df['time_zone'] = df.index.map(self.get_time_zone)
+        df['time_zone'] = np.array(list(TimeZone), dtype=object)[time['zone_code'].to_numpy()]
 
         # Binary flags
-        df['is_hourly_turn'] = df['time_zone'] == TimeZone.HOURLY_TURN
-        df['is_half_hour'] = df['time_zone'] == TimeZone.HALF_HOUR
-        df['is_ob_time'] = df['time_zone'] != TimeZone.OTHER
+        df['is_hourly_turn'] = time['is_hourly_turn']
+        df['is_half_hour'] = time['is_half_hour']
+        df['is_ob_time'] = time['is_ob_time']
+
+        # Fraction of the bar's time inside each window
+        df['hourly_turn_overlap'] = time['hourly_turn_overlap']
+        df['half_hour_overlap'] = time['half_hour_overlap']
+        df['ob_overlap'] = time['ob_overlap']
 
         # Minute of hour
-        df['minute'] = df.index.minute
+        df['minute'] = time['minute']
 
         # Hour of day (for session analysis)
-        df['hour'] = df.index.hour
+        df['hour'] = time['hour']
 
         return df
 
-    def get_ob_statistics(self, df: pd.DataFrame) -> dict:
+    def time_features(
+        self,
+        df: pd.DataFrame,
+        feature_store=None,
+        bar_minutes: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Time zone and OB flags for every bar
+
+        Args:
+            df: DataFrame with timestamp index
+            feature_store: Optional feature store view to read them from
+            bar_minutes: Bar length in minutes (default: inferred from the index)
+
+        Returns:
+            DataFrame with columns: zone_code (position in TimeZone),
+            is_hourly_turn, is_half_hour, is_ob_time (by bar open minute),
+            hourly_turn_overlap, half_hour_overlap, ob_overlap (fraction of
+            the bar inside the windows), minute, hour
+        """
+        if bar_minutes is None:
+            bar_minutes = infer_bar_minutes(df.index)
+        if feature_store is not None:
+            return feature_store.get(
+                'time', df, self._time_features,
+                hourly_window_mins=self.hourly_window_mins,
+                half_hour_window_mins=self.half_hour_window_mins,
+                bar_minutes=bar_minutes
+            )
+        return self._time_features(df, bar_minutes=bar_minutes)
+
+    def window_overlap(self, index: pd.DatetimeIndex, bar_minutes: Optional[float] = None) -> pd.DataFrame:
+        """
+        Fraction of each bar's time inside the OB windows
+
+        Args:
+            index: Bar open times
+            bar_minutes: Bar length in minutes (default: inferred from the index)
+
+        Returns:
+            DataFrame with columns: hourly_turn_overlap, half_hour_overlap, ob_overlap
+        """
+        if bar_minutes is None:
+            bar_minutes = infer_bar_minutes(index)
+        start = minute_of_hour(index)
+        hourly, half_hour = (window.overlap(start, bar_minutes) for window in self.windows)
+        return pd.DataFrame({
+            'hourly_turn_overlap': hourly,
+            'half_hour_overlap': half_hour,
+            'ob_overlap': hourly + half_hour
+        }, index=index)
+
+    def _time_features(self, df: pd.DataFrame, bar_minutes: Optional[float] = None, **params) -> pd.DataFrame:
+        """Compute time_features() (the other params only key the feature store)"""
+        # Windows depend on the minute alone, so classify each minute once
+        zones = list(TimeZone)
+        by_minute = np.array(
+            [zones.index(self.get_time_zone(pd.Timestamp(2000, 1, 1, 0, minute))) for minute in range(60)],
+            dtype=np.int8
+        )
+
+        minute = np.asarray(df.index.minute)
+        zone_code = by_minute[minute]
+        overlap = self.window_overlap(df.index, bar_minutes)
+
+        return pd.DataFrame({
+            'zone_code': zone_code,
+            'is_hourly_turn': zone_code == zones.index(TimeZone.HOURLY_TURN),
+            'is_half_hour': zone_code == zones.index(TimeZone.HALF_HOUR),
+            'is_ob_time': zone_code != zones.index(TimeZone.OTHER),
+            'hourly_turn_overlap': overlap['hourly_turn_overlap'].to_numpy(),
+            'half_hour_overlap': overlap['half_hour_overlap'].to_numpy(),
+            'ob_overlap': overlap['ob_overlap'].to_numpy(),
+            'minute': minute,
+            'hour': np.asarray(df.index.hour)
+        }, index=df.index)
+
+    def get_ob_statistics(self, df: pd.DataFrame, feature_store=None) -> dict:
         """
         Get statistics about OB time windows
 
         Args:
             df: DataFrame with timestamp index
+            feature_store: Optional feature store view for df's dataset
 
         Returns:
-            Dictionary with statistics
+            Dictionary with statistics; *_bars / *_pct count bars by open
+            minute, *_time_pct is the share of bar time inside the windows
+            (minute-exact at any bar length)
         """
-        df = self.add_time_features(df)
+        df = self.add_time_features(df, feature_store)
 
         total_bars = len(df)
         hourly_turn_bars = df['is_hourly_turn'].sum()
@@ -176,7 +325,10 @@ class PeriodicOBFilter:
             'ob_bars': ob_bars,
             'ob_pct': ob_bars / total_bars * 100,
             'other_bars': other_bars,
-            'other_pct': other_bars / total_bars * 100
+            'other_pct': other_bars / total_bars * 100,
+            'hourly_turn_time_pct': df['hourly_turn_overlap'].mean() * 100,
+            'half_hour_time_pct': df['half_hour_overlap'].mean() * 100,
+            'ob_time_pct': df['ob_overlap'].mean() * 100
         }
 
         return stats
@@ -217,25 +369,44 @@ class SessionFilter:
 
         return 'other'
 
-    def add_session_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add session-based features to dataframe"""
-        df = df.copy()
+    def add_session_features(self, df: pd.DataFrame, feature_store=None) -> pd.DataFrame:
+        """Add session-based features to dataframe (from feature_store if given)"""
+        if feature_store is not None:
+            sessions = feature_store.get(
+                'session', df, self._session_features,
+                **{name: tuple(hours) for name, hours in self.sessions.items()}
+            )
+        else:
+            sessions = self._session_features(df)
 
-        df['session'] = df.index.map(self.get_session)
-        df['is_london'] = df['session'].isin(['london', 'london_ny_overlap'])
-        df['is_new_york'] = df['session'].isin(['new_york', 'london_ny_overlap'])
-        df['is_overlap'] = df['session'] == 'london_ny_overlap'
+        df = df.copy()
+        for column in sessions.columns:
+            df[column] = sessions[column]
 
         return df
 
+    def _session_features(self, df: pd.DataFrame, **params) -> pd.DataFrame:
+        """Session label and flags per bar (params only key the feature store)"""
+        # Sessions depend on the hour alone, so label each hour once
+        by_hour = np.array([self.get_session(pd.Timestamp(2000, 1, 1, hour)) for hour in range(24)], dtype=object)
+        session = pd.Series(by_hour[np.asarray(df.index.hour)], index=df.index)
+
+        return pd.DataFrame({
+            'session': session,
+            'is_london': session.isin(['london', 'london_ny_overlap']),
+            'is_new_york': session.isin(['new_york', 'london_ny_overlap']),
+            'is_overlap': session == 'london_ny_overlap'
+        }, index=df.index)
+
 
 def main():
     """Example usage"""
-    # Generate sample M5 data
-    dates = pd.date_range('2024-01-01', periods=1000, freq='5min')
-    df = pd.DataFrame({
-        'close': 1.1000 + pd.Series(range(1000)) * 0.00001
-    }, index=dates)
+    # Shared demo data generator (code/ is not on the path when run as a script)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from data.synthetic import generate_ohlcv
+
+    # Sample M5 data
+    df = generate_ohlcv(1000, "M5", seed=42, start="2024-01-01")
 
     print("Periodic OB Filter Demo\n")
 
@@ -253,6 +424,7 @@ def main():
     print(f"  Half-hour bars: {stats['half_hour_bars']} ({stats['half_hour_pct']:.1f}%)")
     print(f"  All OB bars: {stats['ob_bars']} ({stats['ob_pct']:.1f}%)")
     print(f"  Other bars: {stats['other_bars']} ({stats['other_pct']:.1f}%)")
+    print(f"  Time inside OB windows: {stats['ob_time_pct']:.1f}% (by bar open minute: {stats['ob_pct']:.1f}%)")
 
     # Add features
     df = ob_filter.add_time_features(df)
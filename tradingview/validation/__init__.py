@@ -5,6 +5,9 @@ Comprehensive backtesting and validation of the MomentumFX Order Block Zones ind
 """
 
 from .backtest_engine import BacktestEngine, BacktestConfig, Trade, TradeStatus
+from .trade_resolver import ExitResolution, resolve_exits
+from .metrics import trade_columns, trade_metrics, max_consecutive
+from .trade_ledger import TradeLedger, TradeRecord
 from .run_validation import (
     load_data,
     run_instrument_validation,
@@ -17,6 +20,13 @@ __all__ = [
     'BacktestConfig',
     'Trade',
     'TradeStatus',
+    'ExitResolution',
+    'resolve_exits',
+    'trade_columns',
+    'trade_metrics',
+    'max_consecutive',
+    'TradeLedger',
+    'TradeRecord',
     'load_data',
     'run_instrument_validation',
     'run_period_validation',
@@ -45,6 +45,7 @@ detector_path = os.path.join(parent_dir, 'code', 'zones', 'detector.py')
 detector_module = load_module_from_path('detector', detector_path)
 ZoneDetector = detector_module.ZoneDetector
 Zone = detector_module.Zone
+ZoneSet = detector_module.ZoneSet
 ZoneType = detector_module.ZoneType
 ZoneFreshness = detector_module.ZoneFreshness
 
@@ -53,6 +54,16 @@ time_filter_path = os.path.join(parent_dir, 'code', 'zones', 'time_filter.py')
 time_filter_module = load_module_from_path('time_filter', time_filter_path)
 PeriodicOBFilter = time_filter_module.PeriodicOBFilter
 
+# Load feature store module
+features_path = os.path.join(parent_dir, 'code', 'data', 'features.py')
+features_module = load_module_from_path('features', features_path)
+FeatureStore = features_module.FeatureStore
+
+# Load trading calendars
+sessions_path = os.path.join(parent_dir, 'code', 'data', 'sessions.py')
+sessions_module = load_module_from_path('trading_sessions', sessions_path)
+get_calendar = sessions_module.get_calendar
+
 # Load trend analyzer module
 trend_path = os.path.join(parent_dir, 'code', 'strategies', 'trend_analyzer.py')
 trend_module = load_module_from_path('trend_analyzer', trend_path)
@@ -60,6 +71,38 @@ TrendAnalyzer = trend_module.TrendAnalyzer
 TrendDirection = trend_module.TrendDirection
 RegimeType = trend_module.RegimeType
 
+# Load vectorized exit resolver
+resolver_path = os.path.join(current_dir, 'trade_resolver.py')
+resolver_module = load_module_from_path('trade_resolver', resolver_path)
+resolve_exits = resolver_module.resolve_exits
+ExitResolution = resolver_module.ExitResolution
+
+# Load trade metrics
+metrics_path = os.path.join(current_dir, 'metrics.py')
+metrics_module = load_module_from_path('metrics', metrics_path)
+trade_metrics = metrics_module.trade_metrics
+
+# Load columnar trade ledger
+ledger_path = os.path.join(current_dir, 'trade_ledger.py')
+ledger_module = load_module_from_path('trade_ledger', ledger_path)
+TradeLedger = ledger_module.TradeLedger
+
+# Load stage profiler from same directory
+profiler_path = os.path.join(current_dir, 'profiler.py')
+profiler_module = load_module_from_path('profiler', profiler_path)
+StageProfiler = profiler_module.StageProfiler
+NULL_PROFILER = profiler_module.NULL_PROFILER
+format_profile = profiler_module.format_profile
+
+# Load logging / progress layer
+reporting_path = os.path.join(parent_dir, 'code', 'utils', 'reporting.py')
+reporting_module = load_module_from_path('reporting', reporting_path)
+get_logger = reporting_module.get_logger
+log_event = reporting_module.log_event
+Progress = reporting_module.Progress
+
+log = get_logger('backtest')
+
 
 class TradeStatus(Enum):
     OPEN = "open"
@@ -97,6 +140,13 @@ class Trade:
     h1_trend: str = ""
     h1_adx: float = 0.0
     regime: str = ""
+    zone_id: int = -1  # Index into BacktestEngine.zones
+
+    # Resolved trade path (bar indices into the M5 frame, see trade_resolver)
+    entry_idx: int = -1
+    tp1_idx: int = -1
+    exit_idx: int = -1
+    exit_reason: str = ""
 
     def calculate_pnl(self, exit_price: float, atr: float) -> float:
         """Calculate PnL in R multiples"""
@@ -145,6 +195,8 @@ class BacktestConfig:
 
     # Trade management
     max_zone_age: int = 50  # bars
+    calendar: Optional[str] = None  # Trading calendar ('auto': by instrument, 'fx', 'metals', 'crypto');
+                                    # None counts raw positional bars
     retest_tolerance: float = 0.1  # % tolerance for zone retest
 
     # Account
@@ -152,12 +204,42 @@ class BacktestConfig:
     max_trades_per_day: int = 3
     max_open_trades: int = 2
 
+    # Diagnostics
+    profile: bool = False  # Stage timings and counters in results['profile']
+
+
+@dataclass
+class Signals:
+    """Candidate entries from signal generation (one array element per candidate)"""
+    bar: np.ndarray             # M5 bar index of the retest (entry bar)
+    zone: np.ndarray            # Index into BacktestEngine.zones
+    h1_idx: np.ndarray          # H1 bar index at entry
+    is_long: np.ndarray
+    entry_price: np.ndarray
+    stop_loss: np.ndarray
+    tp1: np.ndarray
+    tp2: np.ndarray
+    exits: ExitResolution       # Standalone outcome of each candidate
+
+    def __len__(self) -> int:
+        return len(self.bar)
+
 
 class BacktestEngine:
     """Backtests the TradingView indicator as a trading system"""
 
-    def __init__(self, config: BacktestConfig = None):
+    WARMUP_BARS = 100       # M5 and H1 bars skipped before trading
+    MIN_ZONE_AGE = 5        # Bars after creation before a zone can be traded
+
+    def __init__(self, config: BacktestConfig = None, feature_store: FeatureStore = None):
+        """
+        Args:
+            config: Backtest configuration
+            feature_store: Store for ATR, ADX/DI and time features; share one
+                           between engines to compute them once per dataset
+        """
         self.config = config or BacktestConfig()
+        self.feature_store = feature_store if feature_store is not None else FeatureStore()
 
         # Components
         self.zone_detector = ZoneDetector(
@@ -172,13 +254,16 @@ class BacktestEngine:
         # Trade tracking
         self.trades: List[Trade] = []
         self.open_trades: List[Trade] = []
-        self.zones: List[Zone] = []
+        self.zones: ZoneSet = ZoneSet.from_zones([])
 
         # Account tracking
         self.capital = self.config.initial_capital
-        self.equity_curve = []
+        self.equity_curve = pd.DataFrame(columns=['time', 'equity', 'trades', 'open_trades'])
         self.peak = self.config.initial_capital
-        self.drawdown_curve = []
+        self.drawdown_curve = np.array([])
+        self.h1_trend = None
+        self.sessions = None
+        self.profiler = NULL_PROFILER
 
     def run_backtest(
         self,
@@ -189,6 +274,16 @@ class BacktestEngine:
         """
         Run backtest on M5 data with H1 trend filter
 
+        Runs in two phases:
+        1. Signal generation, vectorized over all bars: zone retests, trend
+           filter, trade levels and each candidate's standalone exit.
+        2. Portfolio pass, sequential over candidates only: daily and
+           open-trade limits, TP1 scale-out and capital compounding.
+
+        With config.calendar set, a session index of the M5 bars is built
+        first: zone windows never straddle market closures or missing bars,
+        ATR ignores the gaps, and zone age counts market bars.
+
         Args:
             df_m5: M5 OHLCV data
             df_h1: H1 OHLCV data for trend
@@ -197,242 +292,325 @@ class BacktestEngine:
         Returns:
             Dictionary with backtest results
         """
-        print(f"\n{'='*60}")
-        print(f"BACKTESTING: {instrument}")
-        print(f"Period: {df_m5.index[0]} to {df_m5.index[-1]}")
-        print(f"Bars: {len(df_m5):,}")
-        print(f"{'='*60}\n")
+        log_event(
+            log, 'backtest_start',
+            f"\n{'='*60}\nBACKTESTING: {instrument}\n"
+            f"Period: {df_m5.index[0]} to {df_m5.index[-1]}\n"
+            f"Bars: {len(df_m5):,}\n{'='*60}\n",
+            instrument=instrument, start=df_m5.index[0], end=df_m5.index[-1], bars=len(df_m5)
+        )
 
         # Reset
         self.trades = []
         self.open_trades = []
-        self.zones = []
+        self.zones = ZoneSet.from_zones([])
         self.capital = self.config.initial_capital
-        self.equity_curve = []
+        self.equity_curve = pd.DataFrame(columns=['time', 'equity', 'trades', 'open_trades'])
         self.peak = self.config.initial_capital
-        self.drawdown_curve = []
+        self.drawdown_curve = np.array([])
+        self.profiler = StageProfiler() if self.config.profile else NULL_PROFILER
+        profiler = self.profiler
+
+        m5_features = self.feature_store.dataset(instrument, 'M5', df_m5)
+        h1_features = self.feature_store.dataset(instrument, 'H1', df_h1)
+
+        self.sessions = None
+        if self.config.calendar is not None:
+            with profiler.stage('sessions'):
+                self.sessions = get_calendar(self.config.calendar, instrument).sessions(df_m5.index, 'M5')
+            profiler.count('session_breaks', int(self.sessions.breaks.sum()))
 
         # Step 1: Detect all zones
-        print("Detecting zones...")
-        all_zones = self.zone_detector.detect_zones(df_m5)
-        print(f"  Total zones detected: {len(all_zones)}")
+        log.info("Detecting zones...")
+        with profiler.stage('zone_detection'):
+            all_zones = self.zone_detector.detect_zones(df_m5, feature_store=m5_features, sessions=self.sessions)
+        profiler.count('zones_detected', len(all_zones))
+        log_event(log, 'zones_detected', f"  Total zones detected: {len(all_zones)}", zones=len(all_zones))
 
         # Filter by OB time if enabled
         if self.config.enable_ob_filter:
-            ob_zones = [z for z in all_zones if self.ob_filter.is_ob_time(z.creation_time)]
-            print(f"  Zones in OB windows: {len(ob_zones)} ({len(ob_zones)/len(all_zones)*100:.1f}%)")
+            with profiler.stage('ob_filter'):
+                is_ob_bar = self.ob_filter.time_features(df_m5, m5_features)['is_ob_time'].to_numpy()
+                is_ob = is_ob_bar[all_zones.creation_idx]
+                ob_zones = all_zones[is_ob]
+            ob_pct = len(ob_zones) / len(all_zones) * 100 if len(all_zones) else 0
+            log_event(log, 'ob_filter', f"  Zones in OB windows: {len(ob_zones)} ({ob_pct:.1f}%)",
+                      zones=len(ob_zones), ob_pct=ob_pct)
             self.zones = ob_zones
         else:
             self.zones = all_zones
 
-        # Step 2: Simulate trading
-        print("\nSimulating trades...")
-        trades_today = 0
-        last_date = None
-
-        for i in range(100, len(df_m5)):  # Start after warmup
-            current_bar = df_m5.iloc[i]
-            current_time = df_m5.index[i]
-            current_date = current_time.date()
-
-            # Reset daily trade counter
-            if current_date != last_date:
-                trades_today = 0
-                last_date = current_date
-
-            # Get H1 trend
-            h1_idx = self._get_h1_index(df_h1, current_time)
-            if h1_idx is None or h1_idx < 100:
-                continue
-
-            h1_trend = self.trend_analyzer.analyze(df_h1.iloc[:h1_idx+1])
-
-            # Update open trades
-            self._update_open_trades(current_bar, df_m5.iloc[i])
+        # Last H1 bar at or before each M5 bar; trading starts once both
+        # timeframes are past warmup
+        with profiler.stage('h1_alignment'):
+            h1_idx = df_h1.index.searchsorted(df_m5.index, side='right') - 1
+            active = h1_idx >= self.WARMUP_BARS
+            active[:self.WARMUP_BARS] = False
 
-            # Check for new entries (zone retests)
-            if (trades_today < self.config.max_trades_per_day and
-                len(self.open_trades) < self.config.max_open_trades):
+        # Step 2: Vectorized signal generation
+        log.info("\nGenerating signals...")
+        signals = self._generate_signals(df_m5, df_h1, h1_idx, active, m5_features, h1_features)
+        log_event(log, 'signals', f"  Candidate entries: {len(signals)}", signals=len(signals))
 
-                new_trade = self._check_zone_retest(
-                    current_bar=current_bar,
-                    current_idx=i,
-                    df=df_m5,
-                    h1_trend=h1_trend
-                )
-
-                if new_trade:
-                    self.open_trades.append(new_trade)
-                    trades_today += 1
-
-            # Update equity curve
-            equity = self._calculate_equity(current_bar)
-            self.equity_curve.append({
-                'time': current_time,
-                'equity': equity,
-                'trades': len(self.trades),
-                'open_trades': len(self.open_trades)
-            })
-
-            # Update drawdown
-            self.peak = max(self.peak, equity)
-            dd = (self.peak - equity) / self.peak * 100 if self.peak > 0 else 0
-            self.drawdown_curve.append(dd)
+        # Step 3: Portfolio pass over candidates
+        log.info("\nSimulating trades...")
+        realized = np.full(len(df_m5), np.nan)
+        taken = self._run_portfolio(signals, df_m5, df_h1, realized)
 
         # Close any remaining open trades at end
         if self.open_trades:
-            print(f"\nClosing {len(self.open_trades)} open trades at end...")
+            log.info(f"\nClosing {len(self.open_trades)} open trades at end...")
             final_bar = df_m5.iloc[-1]
             for trade in self.open_trades[:]:
                 self._close_trade(trade, final_bar['close'], final_bar.name, "end_of_data")
+        profiler.count('trades_closed', len(self.trades))
 
-        print(f"\n✓ Backtest complete!")
-        print(f"  Total trades: {len(self.trades)}")
+        with profiler.stage('equity_curve'):
+            self._build_equity_curve(df_m5, signals, taken, realized, active)
+
+        log_event(log, 'backtest_complete', f"\n✓ Backtest complete!\n  Total trades: {len(self.trades)}",
+                  instrument=instrument, trades=len(self.trades), final_capital=self.capital)
 
         # Calculate metrics
-        results = self._calculate_metrics(instrument, df_m5)
+        with profiler.stage('metrics'):
+            results = self._calculate_metrics(instrument, df_m5)
+
+        if profiler.enabled:
+            results['profile'] = profiler.report()
+            log_event(log, 'profile', f"\nProfile:\n{format_profile(results['profile'])}", **results['profile'])
 
         return results
 
-    def _get_h1_index(self, df_h1: pd.DataFrame, current_time: pd.Timestamp) -> Optional[int]:
-        """Get corresponding H1 bar index for current M5 time"""
-        try:
-            # Find the last H1 bar before or at current time
-            h1_bars = df_h1[df_h1.index <= current_time]
-            if len(h1_bars) > 0:
-                return len(h1_bars) - 1
-        except:
-            pass
-        return None
-
-    def _check_zone_retest(
+    def _generate_signals(
         self,
-        current_bar: pd.Series,
-        current_idx: int,
-        df: pd.DataFrame,
-        h1_trend: any
-    ) -> Optional[Trade]:
-        """Check if current bar retests a zone"""
-
-        for zone in self.zones:
-            # Zone too old?
-            zone_age = current_idx - zone.creation_idx
-            if zone_age > self.config.max_zone_age or zone_age < 5:
-                continue
+        df_m5: pd.DataFrame,
+        df_h1: pd.DataFrame,
+        h1_idx: np.ndarray,
+        active: np.ndarray,
+        m5_features=None,
+        h1_features=None
+    ) -> Signals:
+        """
+        Find every bar with a tradeable zone retest
+
+        On each active bar the candidate is the first zone (in detection
+        order) that is within its age window, not broken, retested by the
+        bar and aligned with the H1 trend. Its exit is resolved as if the
+        trade were taken.
+        """
+        profiler = self.profiler
+        n_bars = len(df_m5)
+        high = df_m5['high'].to_numpy(dtype=float)
+        low = df_m5['low'].to_numpy(dtype=float)
+        close = df_m5['close'].to_numpy(dtype=float)
+
+        # detect_zones() works on a copy, so ATR may not be on the frame
+        if 'atr' in df_m5.columns:
+            atr = df_m5['atr'].to_numpy(dtype=float)
+        else:
+            atr = self.zone_detector._add_atr(
+                df_m5, feature_store=m5_features, sessions=self.sessions
+            )['atr'].to_numpy(dtype=float)
+
+        with profiler.stage('trend_analysis'):
+            self.h1_trend = self.trend_analyzer.analyze_rolling(df_h1, feature_store=h1_features)
+            h1_direction = self.h1_trend['direction'].to_numpy()
+
+        with profiler.stage('retest_scan'):
+            zone_ids = np.flatnonzero(~self.zones.is_broken)
+            creation = self.zones.creation_idx[zone_ids]
+            is_demand = self.zones.is_demand[zone_ids]
+            top = self.zones.top[zone_ids]
+            bottom = self.zones.bottom[zone_ids]
+
+            # Every (zone, bar) pair inside the zone's age window. With a
+            # session index, age is in market bars: at least the positional
+            # distance, so positional candidates up to max_zone_age cover it
+            first_age = self.MIN_ZONE_AGE if self.sessions is None else 1
+            span = max(self.config.max_zone_age - first_age + 1, 0)
+            pair_zone = np.repeat(np.arange(len(zone_ids)), span)
+            pair_bar = (np.repeat(creation + first_age, span) +
+                        np.tile(np.arange(span), len(zone_ids)))
+
+            keep = pair_bar < n_bars
+            keep[keep] = active[pair_bar[keep]]
+            pair_zone, pair_bar = pair_zone[keep], pair_bar[keep]
+
+            if self.sessions is not None:
+                age = self.sessions.age(creation[pair_zone], pair_bar)
+                keep = (age >= self.MIN_ZONE_AGE) & (age <= self.config.max_zone_age)
+                pair_zone, pair_bar = pair_zone[keep], pair_bar[keep]
+
+            # Retest: demand dips into the zone, supply rallies into it
+            demand = is_demand[pair_zone]
+            retest = np.where(
+                demand,
+                (low[pair_bar] <= top[pair_zone]) & (close[pair_bar] > bottom[pair_zone]),
+                (high[pair_bar] >= bottom[pair_zone]) & (close[pair_bar] < top[pair_zone])
+            )
+
+            # Trend filter
+            if self.config.enable_trend_filter:
+                trend = h1_direction[h1_idx[pair_bar]]
+                retest &= np.where(
+                    demand,
+                    trend == TrendDirection.BULLISH,
+                    trend == TrendDirection.BEARISH
+                )
+
+            pair_zone, pair_bar = pair_zone[retest], pair_bar[retest]
+
+            # First qualifying zone on each bar
+            order = np.lexsort((pair_zone, pair_bar))
+            bars, first = np.unique(pair_bar[order], return_index=True)
+            zone = pair_zone[order][first]
+
+        profiler.count('zones_scanned', len(zone_ids))
+        profiler.count('retests_evaluated', len(retest))
+        profiler.count('retests_found', len(pair_bar))
+        profiler.count('signals', len(bars))
+
+        with profiler.stage('exit_resolution'):
+            # Trade levels from the retest bar's ATR
+            is_long = is_demand[zone]
+            sign = np.where(is_long, 1.0, -1.0)
+            bar_atr = atr[bars]
+            entry = np.where(is_long, top[zone], bottom[zone])
+            stop_loss = np.where(is_long, bottom[zone], top[zone]) - sign * (bar_atr * self.config.sl_atr)
+            tp1 = entry + sign * (bar_atr * self.config.tp1_atr)
+            tp2 = entry + sign * (bar_atr * self.config.tp2_atr)
+
+            exits = resolve_exits(
+                high,
+                low,
+                close,
+                entry_idx=bars,
+                is_long=is_long,
+                entry_price=entry,
+                stop_loss=stop_loss,
+                tp1=tp1,
+                tp2=tp2,
+                move_to_breakeven=self.config.move_to_breakeven_at_tp1
+            )
+
+        return Signals(
+            bar=bars,
+            zone=zone_ids[zone],
+            h1_idx=h1_idx[bars],
+            is_long=is_long,
+            entry_price=entry,
+            stop_loss=stop_loss,
+            tp1=tp1,
+            tp2=tp2,
+            exits=exits
+        )
+
+    def _run_portfolio(
+        self,
+        signals: Signals,
+        df_m5: pd.DataFrame,
+        df_h1: pd.DataFrame,
+        realized: np.ndarray
+    ) -> List[int]:
+        """
+        Apply trade limits to candidates in time order
 
-            # Zone already broken?
-            if zone.freshness == ZoneFreshness.BROKEN:
+        TP1 moves and exits of open trades are replayed from their resolved
+        bars between candidates, so non-candidate bars are never visited.
+        Capital after each bar's exits is written to realized.
+
+        Returns:
+            Positions (into signals) of the candidates that were traded
+        """
+        profiler = self.profiler
+        index = df_m5.index
+        taken = []
+        trades_today = 0
+        last_date = None
+        progress = Progress(log, len(df_m5), label="Simulated", unit="bars")
+
+        for j in range(len(signals)):
+            i = int(signals.bar[j])
+            progress.update(i)
+            with profiler.stage('trade_updates'):
+                self._apply_trade_events(i, index, realized)
+
+            # Reset daily trade counter
+            current_date = index[i].date()
+            if current_date != last_date:
+                trades_today = 0
+                last_date = current_date
+
+            if (trades_today >= self.config.max_trades_per_day or
+                    len(self.open_trades) >= self.config.max_open_trades):
+                profiler.count('signals_skipped')
                 continue
 
-            # Check if price is retesting zone
-            is_retesting = False
-
-            if zone.zone_type == ZoneType.DEMAND:
-                # Long setup: price dips into demand zone
-                if (current_bar['low'] <= zone.top and
-                    current_bar['close'] > zone.bottom):
-
-                    # Trend filter
-                    if self.config.enable_trend_filter:
-                        if h1_trend.direction != TrendDirection.BULLISH:
-                            continue
-
-                    # This is a buy setup
-                    is_retesting = True
-                    direction = 'long'
-                    entry = zone.top  # Enter at top of zone
-                    atr = df['atr'].iloc[current_idx]
-                    sl = zone.bottom - (atr * self.config.sl_atr)
-                    tp1 = entry + (atr * self.config.tp1_atr)
-                    tp2 = entry + (atr * self.config.tp2_atr)
-
-            elif zone.zone_type == ZoneType.SUPPLY:
-                # Short setup: price rallies into supply zone
-                if (current_bar['high'] >= zone.bottom and
-                    current_bar['close'] < zone.top):
-
-                    # Trend filter
-                    if self.config.enable_trend_filter:
-                        if h1_trend.direction != TrendDirection.BEARISH:
-                            continue
-
-                    # This is a sell setup
-                    is_retesting = True
-                    direction = 'short'
-                    entry = zone.bottom  # Enter at bottom of zone
-                    atr = df['atr'].iloc[current_idx]
-                    sl = zone.top + (atr * self.config.sl_atr)
-                    tp1 = entry - (atr * self.config.tp1_atr)
-                    tp2 = entry - (atr * self.config.tp2_atr)
-
-            if is_retesting:
-                # Create trade
+            with profiler.stage('trade_entry'):
+                zone_id = int(signals.zone[j])
+                zone = self.zones[zone_id]
+                h1_idx = int(signals.h1_idx[j])
+                h1_adx = self.h1_trend['adx'].iloc[h1_idx]
+                regime, _ = self.trend_analyzer.regime_at(df_h1, h1_idx, h1_adx)
+
                 trade = Trade(
-                    entry_time=current_bar.name,
-                    entry_price=entry,
-                    direction=direction,
+                    entry_time=index[i],
+                    entry_price=signals.entry_price[j],
+                    direction='long' if signals.is_long[j] else 'short',
                     zone=zone,
-                    stop_loss=sl,
-                    tp1=tp1,
-                    tp2=tp2,
+                    stop_loss=signals.stop_loss[j],
+                    tp1=signals.tp1[j],
+                    tp2=signals.tp2[j],
                     position_size=self.config.risk_per_trade,
+                    mae=float(signals.exits.mae[j]),
+                    mfe=float(signals.exits.mfe[j]),
                     formed_in_ob=self.ob_filter.is_ob_time(zone.creation_time),
-                    h1_trend=h1_trend.direction.value,
-                    h1_adx=h1_trend.adx,
-                    regime=h1_trend.regime.value
+                    h1_trend=self.h1_trend['direction'].iloc[h1_idx].value,
+                    h1_adx=h1_adx,
+                    regime=regime.value,
+                    zone_id=zone_id,
+                    entry_idx=i,
+                    tp1_idx=int(signals.exits.tp1_idx[j]),
+                    exit_idx=int(signals.exits.exit_idx[j]),
+                    exit_reason=signals.exits.reason[j]
                 )
 
-                return trade
-
-        return None
+            self.open_trades.append(trade)
+            taken.append(j)
+            trades_today += 1
 
-    def _update_open_trades(self, current_bar: pd.Series, bar_data: pd.Series):
-        """Update all open trades (check SL/TP)"""
+        with profiler.stage('trade_updates'):
+            self._apply_trade_events(len(df_m5) - 1, index, realized)
+        progress.finish()
 
-        for trade in self.open_trades[:]:  # Copy list to allow removal
-            # Update MAE/MFE
-            trade.update_excursion(current_bar['close'])
+        profiler.count('trades_opened', len(taken))
 
-            # Check exits
-            if trade.direction == 'long':
-                # Check stop loss
-                if current_bar['low'] <= trade.stop_loss:
-                    self._close_trade(trade, trade.stop_loss, current_bar.name, "stop_loss")
-                    continue
+        return taken
 
-                # Check TP2
-                if current_bar['high'] >= trade.tp2 and trade.status != TradeStatus.TP2_HIT:
-                    self._close_trade(trade, trade.tp2, current_bar.name, "tp2")
-                    continue
+    def _apply_trade_events(self, current_idx: int, index: pd.DatetimeIndex, realized: np.ndarray):
+        """Apply resolved TP1 moves and exits of open trades up to current_idx"""
+        events = []
+        for position, trade in enumerate(self.open_trades):
+            if trade.status == TradeStatus.OPEN and 0 <= trade.tp1_idx <= current_idx:
+                events.append((trade.tp1_idx, position, trade))
+            if trade.exit_reason != "end_of_data" and trade.exit_idx <= current_idx:
+                events.append((trade.exit_idx, position, trade))
 
-                # Check TP1
-                if current_bar['high'] >= trade.tp1 and trade.status == TradeStatus.OPEN:
-                    # Close 50%, move SL to breakeven
-                    trade.status = TradeStatus.TP1_HIT
-                    trade.position_size *= (1 - self.config.tp1_close_pct)
+        # Bar order, then open-trade order within a bar
+        events.sort(key=lambda event: event[:2])
 
-                    if self.config.move_to_breakeven_at_tp1:
-                        trade.stop_loss = trade.entry_price
+        for bar, _, trade in events:
+            if bar == trade.tp1_idx:
+                # Close 50%, move SL to breakeven
+                trade.status = TradeStatus.TP1_HIT
+                trade.position_size *= (1 - self.config.tp1_close_pct)
 
-            else:  # short
-                # Check stop loss
-                if current_bar['high'] >= trade.stop_loss:
-                    self._close_trade(trade, trade.stop_loss, current_bar.name, "stop_loss")
-                    continue
-
-                # Check TP2
-                if current_bar['low'] <= trade.tp2 and trade.status != TradeStatus.TP2_HIT:
-                    self._close_trade(trade, trade.tp2, current_bar.name, "tp2")
-                    continue
-
-                # Check TP1
-                if current_bar['low'] <= trade.tp1 and trade.status == TradeStatus.OPEN:
-                    # Close 50%, move SL to breakeven
-                    trade.status = TradeStatus.TP1_HIT
-                    trade.position_size *= (1 - self.config.tp1_close_pct)
-
-                    if self.config.move_to_breakeven_at_tp1:
-                        trade.stop_loss = trade.entry_price
+                if self.config.move_to_breakeven_at_tp1:
+                    trade.stop_loss = trade.entry_price
+            else:
+                exit_price = trade.stop_loss if trade.exit_reason == "stop_loss" else trade.tp2
+                self._close_trade(trade, exit_price, index[bar], trade.exit_reason)
+                realized[bar] = self.capital
 
     def _close_trade(self, trade: Trade, exit_price: float, exit_time: pd.Timestamp, reason: str):
         """Close a trade and update account"""
@@ -468,24 +646,78 @@ class BacktestEngine:
         # Add to closed trades
         self.trades.append(trade)
 
-    def _calculate_equity(self, current_bar: pd.Series) -> float:
-        """Calculate current equity including open trades"""
-        equity = self.capital
-
-        # Add unrealized P&L from open trades
-        for trade in self.open_trades:
-            risk = abs(trade.entry_price - trade.stop_loss)
-            if trade.direction == 'long':
-                pnl_points = current_bar['close'] - trade.entry_price
-            else:
-                pnl_points = trade.entry_price - current_bar['close']
-
-            r_multiple = pnl_points / risk if risk > 0 else 0
-            capital_risked = self.config.initial_capital * (trade.position_size / 100)
-            unrealized_pnl = r_multiple * capital_risked
-            equity += unrealized_pnl
+    def _build_equity_curve(
+        self,
+        df_m5: pd.DataFrame,
+        signals: Signals,
+        taken: List[int],
+        realized: np.ndarray,
+        active: np.ndarray
+    ):
+        """
+        Mark-to-market equity and drawdown on every active bar
 
-        return equity
+        Each trade adds unrealized P&L at the bar close from its entry bar
+        until the bar before its exit (through the last bar if it is still
+        open at the end), with the original stop and size before TP1 and
+        the adjusted ones from the TP1 bar on.
+        """
+        n_bars = len(df_m5)
+        close = df_m5['close'].to_numpy(dtype=float)
+        taken = np.asarray(taken, dtype=np.int64)
+        exits = signals.exits
+
+        entry_idx = signals.bar[taken]
+        tp1_idx = exits.tp1_idx[taken]
+        end_of_data = exits.reason[taken] == "end_of_data"
+        last_idx = np.where(end_of_data, n_bars - 1, exits.exit_idx[taken] - 1)
+
+        sign = np.where(signals.is_long[taken], 1.0, -1.0)
+        entry = signals.entry_price[taken]
+        stop = signals.stop_loss[taken]
+        size = np.full(len(taken), self.config.risk_per_trade)
+        scaled_stop = entry if self.config.move_to_breakeven_at_tp1 else stop
+        scaled_size = size * (1 - self.config.tp1_close_pct)
+
+        # One segment before TP1 and, if hit, one from TP1 on
+        hit = tp1_idx >= 0
+        seg_start = np.concatenate([entry_idx, tp1_idx[hit]])
+        seg_end = np.concatenate([np.where(hit, tp1_idx - 1, last_idx), last_idx[hit]])
+        seg_sign = np.concatenate([sign, sign[hit]])
+        seg_entry = np.concatenate([entry, entry[hit]])
+        seg_risk = np.abs(seg_entry - np.concatenate([stop, scaled_stop[hit]]))
+        seg_size = np.concatenate([size, scaled_size[hit]])
+
+        lengths = seg_end - seg_start + 1
+        seg = np.repeat(np.arange(len(seg_start)), lengths)
+        bars = seg_start[seg] + np.arange(len(seg)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        pnl_points = seg_sign[seg] * (close[bars] - seg_entry[seg])
+        risk = seg_risk[seg]
+        r_multiple = np.divide(pnl_points, risk, out=np.zeros_like(pnl_points), where=risk > 0)
+        capital_risked = self.config.initial_capital * (seg_size[seg] / 100)
+        unrealized = np.bincount(bars, weights=r_multiple * capital_risked, minlength=n_bars)
+
+        capital = pd.Series(realized).ffill().fillna(self.config.initial_capital).to_numpy()
+        equity = capital + unrealized
+
+        closed = np.bincount(exits.exit_idx[taken][~end_of_data], minlength=n_bars).cumsum()
+        opened = np.bincount(entry_idx, minlength=n_bars + 1) - np.bincount(last_idx + 1, minlength=n_bars + 1)
+        open_count = opened.cumsum()[:n_bars]
+
+        self.equity_curve = pd.DataFrame({
+            'time': df_m5.index[active],
+            'equity': equity[active],
+            'trades': closed[active],
+            'open_trades': open_count[active]
+        })
+
+        peak = np.maximum.accumulate(np.concatenate([[self.config.initial_capital], equity[active]]))[1:]
+        self.peak = peak[-1] if len(peak) else self.config.initial_capital
+        self.drawdown_curve = np.divide(
+            (peak - equity[active]) * 100, peak,
+            out=np.zeros(len(peak)), where=peak > 0
+        )
 
     def _calculate_metrics(self, instrument: str, df: pd.DataFrame) -> Dict:
         """Calculate comprehensive backtest metrics"""
@@ -497,45 +729,20 @@ class BacktestEngine:
                 'error': 'No trades generated'
             }
 
-        # Basic stats
-        total_trades = len(self.trades)
-        wins = [t for t in self.trades if t.pnl > 0]
-        losses = [t for t in self.trades if t.pnl <= 0]
+        # Columnar copy of the closed trades, zones referenced by zone_id
+        ledger = TradeLedger.from_trades(self.trades)
 
-        win_rate = len(wins) / total_trades * 100 if total_trades > 0 else 0
-
-        # P&L stats
-        total_pnl_r = sum(t.pnl for t in self.trades)
-        avg_win_r = np.mean([t.pnl for t in wins]) if wins else 0
-        avg_loss_r = np.mean([t.pnl for t in losses]) if losses else 0
-
-        # Profit factor
-        gross_profit = sum(t.pnl for t in wins) if wins else 0
-        gross_loss = abs(sum(t.pnl for t in losses)) if losses else 0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-
-        # Expectancy
-        expectancy = (win_rate/100 * avg_win_r) + ((1 - win_rate/100) * avg_loss_r)
+        # Trade stats, P&L, consecutive and OB stats
+        stats = trade_metrics(ledger.column('pnl'), ledger.column('formed_in_ob'))
+        total_trades = stats['total_trades']
 
         # Drawdown
-        max_dd = max(self.drawdown_curve) if self.drawdown_curve else 0
-
-        # Consecutive stats
-        consecutive_wins = self._max_consecutive(wins, all_trades=self.trades)
-        consecutive_losses = self._max_consecutive(losses, all_trades=self.trades)
+        max_dd = self.drawdown_curve.max() if len(self.drawdown_curve) else 0
 
         # Return
-        final_capital = self.equity_curve[-1]['equity'] if self.equity_curve else self.config.initial_capital
+        final_capital = self.equity_curve['equity'].iloc[-1] if len(self.equity_curve) else self.config.initial_capital
         total_return_pct = (final_capital - self.config.initial_capital) / self.config.initial_capital * 100
 
-        # Sharpe (simplified - using trade returns)
-        trade_returns = [t.pnl for t in self.trades]
-        sharpe = np.mean(trade_returns) / np.std(trade_returns) if len(trade_returns) > 1 and np.std(trade_returns) > 0 else 0
-
-        # OB zone stats
-        ob_trades = [t for t in self.trades if t.formed_in_ob]
-        ob_win_rate = len([t for t in ob_trades if t.pnl > 0]) / len(ob_trades) * 100 if ob_trades else 0
-
         # Duration
         duration_days = (df.index[-1] - df.index[0]).days
         trades_per_month = total_trades / (duration_days / 30) if duration_days > 0 else 0
@@ -548,21 +755,21 @@ class BacktestEngine:
 
             # Trade stats
             'total_trades': total_trades,
-            'wins': len(wins),
-            'losses': len(losses),
-            'win_rate': win_rate,
+            'wins': stats['wins'],
+            'losses': stats['losses'],
+            'win_rate': stats['win_rate'],
             'trades_per_month': trades_per_month,
 
             # P&L
-            'total_pnl_r': total_pnl_r,
-            'avg_win_r': avg_win_r,
-            'avg_loss_r': avg_loss_r,
-            'profit_factor': profit_factor,
-            'expectancy_r': expectancy,
+            'total_pnl_r': stats['total_pnl_r'],
+            'avg_win_r': stats['avg_win_r'],
+            'avg_loss_r': stats['avg_loss_r'],
+            'profit_factor': stats['profit_factor'],
+            'expectancy_r': stats['expectancy_r'],
 
             # Risk metrics
             'max_drawdown_pct': max_dd,
-            'sharpe_ratio': sharpe,
+            'sharpe_ratio': stats['sharpe_ratio'],
 
             # Return
             'initial_capital': self.config.initial_capital,
@@ -570,38 +777,21 @@ class BacktestEngine:
             'total_return_pct': total_return_pct,
 
             # Consecutive
-            'max_consecutive_wins': consecutive_wins,
-            'max_consecutive_losses': consecutive_losses,
+            'max_consecutive_wins': stats['max_consecutive_wins'],
+            'max_consecutive_losses': stats['max_consecutive_losses'],
 
             # OB stats
-            'ob_trades': len(ob_trades),
-            'ob_pct': len(ob_trades) / total_trades * 100 if total_trades > 0 else 0,
-            'ob_win_rate': ob_win_rate,
+            'ob_trades': stats['ob_trades'],
+            'ob_pct': stats['ob_pct'],
+            'ob_win_rate': stats['ob_win_rate'],
 
             # Trade lists
-            'all_trades': self.trades,
+            'all_trades': ledger,
             'equity_curve': self.equity_curve
         }
 
         return results
 
-    def _max_consecutive(self, subset: List[Trade], all_trades: List[Trade]) -> int:
-        """Calculate max consecutive wins or losses"""
-        if not all_trades:
-            return 0
-
-        max_consecutive = 0
-        current_consecutive = 0
-
-        for trade in all_trades:
-            if trade in subset:
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-
-        return max_consecutive
-
 
 def main():
     """Example usage"""
@@ -0,0 +1,102 @@
+"""
+Backtest Performance Metrics
+
+Statistics over closed trades, computed on columnar arrays so a metrics
+call is linear in the number of trades (and vectorized), however large a
+parameter sweep gets.
+
+Trades are converted to arrays once with trade_columns(); trade_metrics()
+then reproduces every trade statistic BacktestEngine reports:
+- Win rate, average win/loss, profit factor, expectancy (all in R)
+- Longest win and loss streaks
+- Sharpe ratio over per-trade R multiples
+- OB-formed trade count and win rate
+"""
+
+import numpy as np
+from typing import Dict, Iterable
+
+
+def trade_columns(trades: Iterable) -> Dict[str, np.ndarray]:
+    """
+    Columns needed for metrics from a sequence of closed trades
+
+    Args:
+        trades: Trade objects in close order
+
+    Returns:
+        Dictionary with 'pnl' (R multiples) and 'formed_in_ob' arrays
+    """
+    trades = list(trades)
+    return {
+        'pnl': np.fromiter((t.pnl for t in trades), dtype=float, count=len(trades)),
+        'formed_in_ob': np.fromiter((t.formed_in_ob for t in trades), dtype=bool, count=len(trades)),
+    }
+
+
+def max_consecutive(mask: np.ndarray) -> int:
+    """Length of the longest run of True values"""
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return 0
+
+    # Run starts and ends are where the padded mask changes value
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def trade_metrics(pnl: np.ndarray, formed_in_ob: np.ndarray) -> Dict:
+    """
+    Trade statistics in R multiples
+
+    Args:
+        pnl: R multiple per closed trade, in close order
+        formed_in_ob: Whether each trade's zone formed in an OB window
+
+    Returns:
+        Dictionary of trade, P&L, consecutive and OB statistics
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    formed_in_ob = np.asarray(formed_in_ob, dtype=bool)
+    total_trades = len(pnl)
+
+    is_win = pnl > 0
+    n_wins = int(is_win.sum())
+    n_losses = total_trades - n_wins
+    win_rate = n_wins / total_trades * 100 if total_trades > 0 else 0
+
+    # P&L stats
+    gross_profit = pnl[is_win].sum()
+    gross_loss = abs(pnl[~is_win].sum())
+    avg_win_r = pnl[is_win].mean() if n_wins else 0
+    avg_loss_r = pnl[~is_win].mean() if n_losses else 0
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+
+    # Expectancy
+    expectancy = (win_rate/100 * avg_win_r) + ((1 - win_rate/100) * avg_loss_r)
+
+    # Sharpe (simplified - using trade returns)
+    std = pnl.std() if total_trades > 1 else 0
+    sharpe = pnl.mean() / std if std > 0 else 0
+
+    # OB zone stats
+    n_ob = int(formed_in_ob.sum())
+    ob_win_rate = (is_win & formed_in_ob).sum() / n_ob * 100 if n_ob else 0
+
+    return {
+        'total_trades': total_trades,
+        'wins': n_wins,
+        'losses': n_losses,
+        'win_rate': win_rate,
+        'total_pnl_r': pnl.sum(),
+        'avg_win_r': avg_win_r,
+        'avg_loss_r': avg_loss_r,
+        'profit_factor': profit_factor,
+        'expectancy_r': expectancy,
+        'sharpe_ratio': sharpe,
+        'max_consecutive_wins': max_consecutive(is_win),
+        'max_consecutive_losses': max_consecutive(~is_win),
+        'ob_trades': n_ob,
+        'ob_pct': n_ob / total_trades * 100 if total_trades > 0 else 0,
+        'ob_win_rate': ob_win_rate,
+    }
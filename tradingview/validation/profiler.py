@@ -0,0 +1,134 @@
+"""
+Backtest Stage Profiler
+
+Hot-path instrumentation for BacktestEngine.run_backtest:
+- Cumulative wall time and call count per stage (zone detection, H1
+  alignment, trend analysis, retest scan, trade updates, equity, ...)
+- Latency distribution for stages entered many times per run (e.g. the
+  per-candidate trade updates), as percentiles and a histogram
+- Event counters (zones scanned, retests evaluated, trades opened/closed)
+
+Enabled with BacktestConfig(profile=True); the report is returned as
+results['profile']. When disabled the engine uses NULL_PROFILER, whose
+stage() hands back one shared no-op context, so instrumentation costs a
+method call per stage and nothing else.
+"""
+
+import time
+import numpy as np
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+
+# Latency histogram bucket upper bounds in microseconds (last bucket is open)
+LATENCY_BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 100_000)
+
+
+class StageProfiler:
+    """Collects stage timings and counters for one backtest run"""
+
+    enabled = True
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {}    # Stage -> seconds per call, in first-entry order
+        self.counters: Dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one call of stage `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations.setdefault(name, []).append(time.perf_counter() - start)
+
+    def count(self, name: str, n: int = 1):
+        """Add n to counter `name`"""
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def report(self) -> Dict:
+        """
+        Stage timings, latency statistics and counters
+
+        Returns:
+            Dictionary with:
+            - total_seconds: wall time since the profiler was created
+            - stages: name -> {seconds, calls, pct} and, for stages entered
+              more than once, latency percentiles in microseconds and a
+              histogram {bucket upper bound (us) or 'inf': count}
+            - counters: name -> count
+        """
+        total = time.perf_counter() - self._started
+        stages = {}
+
+        for name, durations in self.durations.items():
+            seconds = float(np.sum(durations))
+            stats = {
+                'seconds': seconds,
+                'calls': len(durations),
+                'pct': seconds / total * 100 if total > 0 else 0.0,
+            }
+
+            if len(durations) > 1:
+                micros = np.asarray(durations) * 1e6
+                counts = np.bincount(
+                    np.searchsorted(LATENCY_BUCKETS_US, micros, side='left'),
+                    minlength=len(LATENCY_BUCKETS_US) + 1
+                )
+                stats.update({
+                    'mean_us': float(micros.mean()),
+                    'p50_us': float(np.percentile(micros, 50)),
+                    'p90_us': float(np.percentile(micros, 90)),
+                    'p99_us': float(np.percentile(micros, 99)),
+                    'max_us': float(micros.max()),
+                    'histogram': {
+                        str(bound): int(n)
+                        for bound, n in zip(LATENCY_BUCKETS_US + ('inf',), counts)
+                    },
+                })
+
+            stages[name] = stats
+
+        return {
+            'total_seconds': total,
+            'stages': stages,
+            'counters': dict(self.counters),
+        }
+
+
+class NullProfiler:
+    """Disabled profiler: every method is a no-op"""
+
+    enabled = False
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+    def report(self) -> Dict:
+        return {}
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def format_profile(report: Dict) -> str:
+    """Profile report as a fixed-width text table"""
+    lines = [f"{'Stage':<22} {'Seconds':>10} {'%':>6} {'Calls':>8} {'p50 us':>10} {'p99 us':>10}"]
+    for name, stats in report['stages'].items():
+        p50 = f"{stats['p50_us']:.1f}" if 'p50_us' in stats else ""
+        p99 = f"{stats['p99_us']:.1f}" if 'p99_us' in stats else ""
+        lines.append(f"{name:<22} {stats['seconds']:>10.4f} {stats['pct']:>6.1f} "
+                     f"{stats['calls']:>8} {p50:>10} {p99:>10}")
+    lines.append(f"{'total':<22} {report['total_seconds']:>10.4f}")
+
+    if report['counters']:
+        lines.append("")
+        for name, n in report['counters'].items():
+            lines.append(f"{name:<22} {n:>10,}")
+
+    return "\n".join(lines)
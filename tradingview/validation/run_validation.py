@@ -19,6 +19,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, '../../'))
 sys.path.insert(0, parent_dir)
 
+import argparse
+import logging
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -34,6 +36,20 @@ spec.loader.exec_module(backtest_module)
 BacktestEngine = backtest_module.BacktestEngine
 BacktestConfig = backtest_module.BacktestConfig
 Trade = backtest_module.Trade
+FeatureStore = backtest_module.FeatureStore
+configure_logging = backtest_module.reporting_module.configure_logging
+get_logger = backtest_module.get_logger
+log_event = backtest_module.log_event
+
+log = get_logger('validation')
+
+# Scalar result fields recorded in the 'backtest_results' event
+RESULT_FIELDS = (
+    'instrument', 'period', 'bars', 'total_trades', 'wins', 'losses', 'win_rate',
+    'total_pnl_r', 'avg_win_r', 'avg_loss_r', 'profit_factor', 'expectancy_r',
+    'max_drawdown_pct', 'sharpe_ratio', 'final_capital', 'total_return_pct',
+    'ob_trades', 'ob_win_rate'
+)
 
 
 def load_data(instrument: str, start_date: str = None, end_date: str = None) -> tuple:
@@ -51,7 +67,7 @@ def load_data(instrument: str, start_date: str = None, end_date: str = None) ->
         base_dir.parent / 'data' / 'raw' / 'combined_2020_2025',  # One level up
     ]
 
-    print(f"\nLoading data for {instrument}...")
+    log.info(f"\nLoading data for {instrument}...")
 
     # Find M5 file
     m5_file = None
@@ -68,13 +84,13 @@ def load_data(instrument: str, start_date: str = None, end_date: str = None) ->
     if not m5_file or not m5_file.exists():
         raise FileNotFoundError(f"M5 data not found for {instrument}. Searched in: {[str(loc) for loc in possible_locations]}")
 
-    print(f"  Found M5 data: {m5_file}")
+    log.info(f"  Found M5 data: {m5_file}")
     df_m5 = pd.read_parquet(m5_file)
     if 'timestamp' in df_m5.columns:
         df_m5 = df_m5.set_index('timestamp')
 
     # Resample to H1
-    print(f"  Resampling to H1...")
+    log.info(f"  Resampling to H1...")
     agg_dict = {
         'open': 'first',
         'high': 'max',
@@ -98,90 +114,93 @@ def load_data(instrument: str, start_date: str = None, end_date: str = None) ->
         df_m5 = df_m5[df_m5.index <= end_date]
         df_h1 = df_h1[df_h1.index <= end_date]
 
-    print(f"  M5 bars: {len(df_m5):,} | Period: {df_m5.index[0]} to {df_m5.index[-1]}")
-    print(f"  H1 bars: {len(df_h1):,}")
+    log.info(f"  M5 bars: {len(df_m5):,} | Period: {df_m5.index[0]} to {df_m5.index[-1]}")
+    log.info(f"  H1 bars: {len(df_h1):,}")
 
     return df_m5, df_h1
 
 
 def print_results(results: dict, config_name: str = ""):
-    """Print backtest results"""
-
-    print(f"\n{'='*80}")
-    print(f"RESULTS: {results['instrument']} {config_name}")
-    print(f"{'='*80}")
-    print(f"Period: {results['period']}")
-    print(f"Duration: {results['duration_days']} days | Bars: {results['bars']:,}")
-    print()
-
-    print(f"TRADE STATISTICS:")
-    print(f"  Total Trades: {results['total_trades']}")
-    print(f"  Wins: {results['wins']} | Losses: {results['losses']}")
-    print(f"  Win Rate: {results['win_rate']:.1f}%")
-    print(f"  Trades/Month: {results['trades_per_month']:.1f}")
-    print()
-
-    print(f"PERFORMANCE:")
-    print(f"  Total P&L: {results['total_pnl_r']:.2f}R")
-    print(f"  Avg Win: {results['avg_win_r']:.2f}R | Avg Loss: {results['avg_loss_r']:.2f}R")
-    print(f"  Profit Factor: {results['profit_factor']:.2f}")
-    print(f"  Expectancy: {results['expectancy_r']:.3f}R")
-    print()
-
-    print(f"RISK METRICS:")
-    print(f"  Max Drawdown: {results['max_drawdown_pct']:.2f}%")
-    print(f"  Sharpe Ratio: {results['sharpe_ratio']:.2f}")
-    print()
-
-    print(f"RETURNS:")
-    print(f"  Initial Capital: ${results['initial_capital']:,.0f}")
-    print(f"  Final Capital: ${results['final_capital']:,.0f}")
-    print(f"  Total Return: {results['total_return_pct']:.2f}%")
-    print()
-
-    print(f"CONSECUTIVE:")
-    print(f"  Max Consecutive Wins: {results['max_consecutive_wins']}")
-    print(f"  Max Consecutive Losses: {results['max_consecutive_losses']}")
-    print()
-
-    print(f"ORDER BLOCK STATS:")
-    print(f"  OB Trades: {results['ob_trades']} ({results['ob_pct']:.1f}% of total)")
-    print(f"  OB Win Rate: {results['ob_win_rate']:.1f}%")
+    """Log backtest results (console report plus a 'backtest_results' event)"""
+
+    log_event(log, 'backtest_results', level=logging.DEBUG, config_name=config_name,
+              **{name: results[name] for name in RESULT_FIELDS if name in results})
+
+    log.info(f"\n{'='*80}")
+    log.info(f"RESULTS: {results['instrument']} {config_name}")
+    log.info(f"{'='*80}")
+    log.info(f"Period: {results['period']}")
+    log.info(f"Duration: {results['duration_days']} days | Bars: {results['bars']:,}")
+    log.info('')
+
+    log.info(f"TRADE STATISTICS:")
+    log.info(f"  Total Trades: {results['total_trades']}")
+    log.info(f"  Wins: {results['wins']} | Losses: {results['losses']}")
+    log.info(f"  Win Rate: {results['win_rate']:.1f}%")
+    log.info(f"  Trades/Month: {results['trades_per_month']:.1f}")
+    log.info('')
+
+    log.info(f"PERFORMANCE:")
+    log.info(f"  Total P&L: {results['total_pnl_r']:.2f}R")
+    log.info(f"  Avg Win: {results['avg_win_r']:.2f}R | Avg Loss: {results['avg_loss_r']:.2f}R")
+    log.info(f"  Profit Factor: {results['profit_factor']:.2f}")
+    log.info(f"  Expectancy: {results['expectancy_r']:.3f}R")
+    log.info('')
+
+    log.info(f"RISK METRICS:")
+    log.info(f"  Max Drawdown: {results['max_drawdown_pct']:.2f}%")
+    log.info(f"  Sharpe Ratio: {results['sharpe_ratio']:.2f}")
+    log.info('')
+
+    log.info(f"RETURNS:")
+    log.info(f"  Initial Capital: ${results['initial_capital']:,.0f}")
+    log.info(f"  Final Capital: ${results['final_capital']:,.0f}")
+    log.info(f"  Total Return: {results['total_return_pct']:.2f}%")
+    log.info('')
+
+    log.info(f"CONSECUTIVE:")
+    log.info(f"  Max Consecutive Wins: {results['max_consecutive_wins']}")
+    log.info(f"  Max Consecutive Losses: {results['max_consecutive_losses']}")
+    log.info('')
+
+    log.info(f"ORDER BLOCK STATS:")
+    log.info(f"  OB Trades: {results['ob_trades']} ({results['ob_pct']:.1f}% of total)")
+    log.info(f"  OB Win Rate: {results['ob_win_rate']:.1f}%")
 
     # Assessment
-    print(f"\n{'='*80}")
-    print(f"ASSESSMENT:")
+    log.info(f"\n{'='*80}")
+    log.info(f"ASSESSMENT:")
     if results['total_trades'] < 30:
-        print(f"  [!]  INSUFFICIENT DATA - Less than 30 trades")
+        log.info(f"  [!]  INSUFFICIENT DATA - Less than 30 trades")
     if results['profit_factor'] >= 1.5:
-        print(f"  [OK] GOOD - Profit Factor >= 1.5")
+        log.info(f"  [OK] GOOD - Profit Factor >= 1.5")
     elif results['profit_factor'] >= 1.2:
-        print(f"  [!]  ACCEPTABLE - Profit Factor >= 1.2")
+        log.info(f"  [!]  ACCEPTABLE - Profit Factor >= 1.2")
     else:
-        print(f"  [X] POOR - Profit Factor < 1.2")
+        log.info(f"  [X] POOR - Profit Factor < 1.2")
 
     if results['win_rate'] >= 50:
-        print(f"  [OK] GOOD - Win Rate >= 50%")
+        log.info(f"  [OK] GOOD - Win Rate >= 50%")
     elif results['win_rate'] >= 40:
-        print(f"  [!]  ACCEPTABLE - Win Rate >= 40%")
+        log.info(f"  [!]  ACCEPTABLE - Win Rate >= 40%")
     else:
-        print(f"  [X] POOR - Win Rate < 40%")
+        log.info(f"  [X] POOR - Win Rate < 40%")
 
     if results['expectancy_r'] > 0.2:
-        print(f"  [OK] GOOD - Positive Expectancy > 0.2R")
+        log.info(f"  [OK] GOOD - Positive Expectancy > 0.2R")
     elif results['expectancy_r'] > 0:
-        print(f"  [!]  ACCEPTABLE - Positive Expectancy")
+        log.info(f"  [!]  ACCEPTABLE - Positive Expectancy")
     else:
-        print(f"  [X] POOR - Negative Expectancy")
+        log.info(f"  [X] POOR - Negative Expectancy")
 
     if results['max_drawdown_pct'] < 15:
-        print(f"  [OK] GOOD - Drawdown < 15%")
+        log.info(f"  [OK] GOOD - Drawdown < 15%")
     elif results['max_drawdown_pct'] < 25:
-        print(f"  [!]  ACCEPTABLE - Drawdown < 25%")
+        log.info(f"  [!]  ACCEPTABLE - Drawdown < 25%")
     else:
-        print(f"  [X] POOR - Drawdown >= 25%")
+        log.info(f"  [X] POOR - Drawdown >= 25%")
 
-    print(f"{'='*80}\n")
+    log.info(f"{'='*80}\n")
 
 
 def run_instrument_validation(instrument: str, start_date: str = None, end_date: str = None):
@@ -212,8 +231,11 @@ def run_instrument_validation(instrument: str, start_date: str = None, end_date:
 
     results_list = []
 
+    # Indicators depend only on the data, so every configuration shares them
+    feature_store = FeatureStore()
+
     for config_name, config in configs:
-        engine = BacktestEngine(config)
+        engine = BacktestEngine(config, feature_store=feature_store)
         results = engine.run_backtest(df_m5, df_h1, instrument)
         results['config_name'] = config_name
         results['config'] = {
@@ -240,9 +262,9 @@ def run_period_validation(instrument: str):
     results_by_period = {}
 
     for period_name, start, end in periods:
-        print(f"\n{'#'*80}")
-        print(f"TESTING PERIOD: {period_name}")
-        print(f"{'#'*80}")
+        log.info(f"\n{'#'*80}")
+        log.info(f"TESTING PERIOD: {period_name}")
+        log.info(f"{'#'*80}")
 
         try:
             df_m5, df_h1 = load_data(instrument, start, end)
@@ -260,7 +282,7 @@ def run_period_validation(instrument: str):
             print_results(results)
 
         except Exception as e:
-            print(f"ERROR: {e}")
+            log.error(f"ERROR: {e}")
             results_by_period[period_name] = {'error': str(e)}
 
     return results_by_period
@@ -398,66 +420,73 @@ def generate_report(all_results: dict, output_file: str = "VALIDATION_REPORT.md"
     with open(output_path, 'w') as f:
         f.write('\n'.join(report))
 
-    print(f"\n[OK] Report generated: {output_path}")
+    log.info(f"\n[OK] Report generated: {output_path}")
 
     return output_path
 
 
 def main():
     """Run full validation suite"""
-
-    print("="*80)
-    print("TRADINGVIEW INDICATOR VALIDATION")
-    print("="*80)
-    print("\nThis will run comprehensive backtests to validate the indicator.")
-    print("Results will be HONEST - showing what works and what doesn't.\n")
-
-    input("Press Enter to continue...")
+    parser = argparse.ArgumentParser(description="Run the indicator validation suite")
+    parser.add_argument('--verbosity', default='info', choices=['quiet', 'warning', 'info', 'debug'],
+                        help="Console verbosity")
+    parser.add_argument('--log-json', default=None, help="Append JSON-lines records to this file")
+    args = parser.parse_args()
+    configure_logging(args.verbosity, json_path=args.log_json)
+
+    log.info("="*80)
+    log.info("TRADINGVIEW INDICATOR VALIDATION")
+    log.info("="*80)
+    log.info("\nThis will run comprehensive backtests to validate the indicator.")
+    log.info("Results will be HONEST - showing what works and what doesn't.\n")
+
+    if sys.stdin.isatty():
+        input("Press Enter to continue...")
 
     all_results = {}
 
     # Test instruments
     instruments = ['XAUUSD', 'EURUSD', 'USDJPY']
 
-    print("\n" + "="*80)
-    print("PHASE 1: INSTRUMENT VALIDATION (Full 6-Year Period)")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("PHASE 1: INSTRUMENT VALIDATION (Full 6-Year Period)")
+    log.info("="*80)
 
     for instrument in instruments:
-        print(f"\n{'#'*80}")
-        print(f"TESTING: {instrument}")
-        print(f"{'#'*80}")
+        log.info(f"\n{'#'*80}")
+        log.info(f"TESTING: {instrument}")
+        log.info(f"{'#'*80}")
 
         try:
             results = run_instrument_validation(instrument, "2020-01-01", "2025-12-31")
             all_results[instrument] = results
         except Exception as e:
-            print(f"\n[X] ERROR testing {instrument}: {e}")
+            log.error(f"\n[X] ERROR testing {instrument}: {e}")
             all_results[instrument] = [{'error': str(e)}]
 
-    print("\n" + "="*80)
-    print("PHASE 2: PERIOD VALIDATION (XAUUSD)")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("PHASE 2: PERIOD VALIDATION (XAUUSD)")
+    log.info("="*80)
 
     try:
         period_results = run_period_validation('XAUUSD')
         all_results['XAUUSD_Periods'] = period_results
     except Exception as e:
-        print(f"\n[X] ERROR in period validation: {e}")
+        log.error(f"\n[X] ERROR in period validation: {e}")
 
     # Generate report
-    print("\n" + "="*80)
-    print("GENERATING REPORT")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("GENERATING REPORT")
+    log.info("="*80)
 
     report_path = generate_report(all_results)
 
-    print("\n" + "="*80)
-    print("VALIDATION COMPLETE")
-    print("="*80)
-    print(f"\nFull report: {report_path}")
-    print("\n[!]  CRITICAL: Review results before releasing indicator to traders!")
-    print("If metrics are poor, the indicator needs improvement.\n")
+    log.info("\n" + "="*80)
+    log.info("VALIDATION COMPLETE")
+    log.info("="*80)
+    log.info(f"\nFull report: {report_path}")
+    log.info("\n[!]  CRITICAL: Review results before releasing indicator to traders!")
+    log.info("If metrics are poor, the indicator needs improvement.\n")
 
 
 if __name__ == "__main__":
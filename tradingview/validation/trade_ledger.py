@@ -0,0 +1,187 @@
+"""
+Columnar Trade Ledger
+
+Stores closed trades as typed columns instead of Trade dataclass instances,
+so backtest results from large parameter sweeps stay compact:
+- Prices, P&L and excursions as float64
+- Bar indices and the zone id (index into BacktestEngine.zones) as int64
+- Entry/exit times as DatetimeIndex
+- Direction, status, H1 trend, regime and exit reason as int8 codes with
+  a label table per column
+
+TradeRecord is a __slots__ view onto one row with the same attribute names
+as Trade (categorical fields come back as their string labels, e.g.
+status == 'tp2_hit'). The whole ledger exports to a DataFrame or Parquet.
+"""
+
+import numpy as np
+import pandas as pd
+from enum import Enum
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+
+FLOAT_COLUMNS = (
+    'entry_price', 'exit_price', 'stop_loss', 'tp1', 'tp2', 'position_size',
+    'pnl', 'pnl_pct', 'mae', 'mfe', 'h1_adx'
+)
+INT_COLUMNS = ('entry_idx', 'tp1_idx', 'exit_idx', 'zone_id')
+BOOL_COLUMNS = ('formed_in_ob',)
+TIME_COLUMNS = ('entry_time', 'exit_time')
+CATEGORY_COLUMNS = ('direction', 'status', 'h1_trend', 'regime', 'exit_reason')
+
+COLUMNS = TIME_COLUMNS + FLOAT_COLUMNS + INT_COLUMNS + BOOL_COLUMNS + CATEGORY_COLUMNS
+
+
+class TradeRecord:
+    """Read-only view of one ledger row"""
+
+    __slots__ = ('_ledger', '_row')
+
+    def __init__(self, ledger: 'TradeLedger', row: int):
+        self._ledger = ledger
+        self._row = row
+
+    def __getattr__(self, name: str):
+        # Private names never come from the ledger (and _ledger itself is unset during copy/unpickling)
+        if name.startswith('_') or name not in self._ledger.columns:
+            raise AttributeError(name)
+        return self._ledger.value(name, self._row)
+
+    def __reduce__(self):
+        return (TradeRecord, (self._ledger, self._row))
+
+    def to_dict(self) -> Dict:
+        """Row as a plain dictionary"""
+        return {name: self._ledger.value(name, self._row) for name in COLUMNS}
+
+    def __repr__(self) -> str:
+        return (f"TradeRecord({self.direction} {self.entry_time} -> {self.exit_time}, "
+                f"pnl={self.pnl:.2f}R, {self.status})")
+
+
+class TradeLedger:
+    """Closed trades stored as typed columns"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], labels: Dict[str, Tuple[str, ...]]):
+        """
+        Args:
+            columns: Column name -> array (category columns hold int8 codes)
+            labels: Category column name -> labels indexed by code
+        """
+        self.columns = columns
+        self.labels = labels
+
+    @classmethod
+    def from_trades(cls, trades: Iterable) -> 'TradeLedger':
+        """
+        Build a ledger from Trade objects
+
+        Args:
+            trades: Closed trades, in close order
+
+        Returns:
+            TradeLedger
+        """
+        trades = list(trades)
+        n_trades = len(trades)
+
+        columns: Dict[str, np.ndarray] = {}
+        labels: Dict[str, Tuple[str, ...]] = {}
+
+        for name in TIME_COLUMNS:
+            columns[name] = pd.DatetimeIndex([getattr(t, name) for t in trades])
+        for name in FLOAT_COLUMNS:
+            columns[name] = np.fromiter((getattr(t, name) for t in trades), dtype=float, count=n_trades)
+        for name in BOOL_COLUMNS:
+            columns[name] = np.fromiter((getattr(t, name) for t in trades), dtype=bool, count=n_trades)
+        for name in INT_COLUMNS:
+            columns[name] = np.fromiter((getattr(t, name) for t in trades), dtype=np.int64, count=n_trades)
+
+        for name in CATEGORY_COLUMNS:
+            values = [_label(getattr(t, name)) for t in trades]
+            categories, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+            labels[name] = tuple(str(label) for label in categories)
+            columns[name] = codes.astype(np.int8)
+
+        return cls(columns, labels)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'TradeLedger':
+        """Build a ledger from to_frame() / read_parquet() output"""
+        columns: Dict[str, np.ndarray] = {}
+        labels: Dict[str, Tuple[str, ...]] = {}
+
+        for name in TIME_COLUMNS:
+            columns[name] = pd.DatetimeIndex(df[name])
+        for name in FLOAT_COLUMNS:
+            columns[name] = df[name].to_numpy(dtype=float)
+        for name in INT_COLUMNS:
+            columns[name] = df[name].to_numpy(dtype=np.int64)
+        for name in BOOL_COLUMNS:
+            columns[name] = df[name].to_numpy(dtype=bool)
+        for name in CATEGORY_COLUMNS:
+            values = pd.Categorical(df[name].astype(str))
+            labels[name] = tuple(str(label) for label in values.categories)
+            columns[name] = values.codes.astype(np.int8)
+
+        return cls(columns, labels)
+
+    @classmethod
+    def read_parquet(cls, path: str) -> 'TradeLedger':
+        """Load a ledger written by to_parquet()"""
+        return cls.from_frame(pd.read_parquet(path))
+
+    def __len__(self) -> int:
+        return len(self.columns['pnl'])
+
+    def __getitem__(self, row: int) -> TradeRecord:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(f"Trade {row} out of range for ledger of {len(self)}")
+        return TradeRecord(self, row)
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        for row in range(len(self)):
+            yield TradeRecord(self, row)
+
+    def column(self, name: str) -> Union[np.ndarray, pd.DatetimeIndex]:
+        """
+        Column as an array
+
+        Category columns are decoded to an object array of labels; use
+        columns[name] and labels[name] for the raw codes.
+        """
+        if name in self.labels:
+            return np.array(self.labels[name], dtype=object)[self.columns[name]]
+        return self.columns[name]
+
+    def value(self, name: str, row: int):
+        """Single decoded value"""
+        if name in self.labels:
+            return self.labels[name][self.columns[name][row]]
+        value = self.columns[name][row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def to_frame(self) -> pd.DataFrame:
+        """All trades as a DataFrame (category columns as pandas Categoricals)"""
+        data = {}
+        for name in COLUMNS:
+            if name in self.labels:
+                data[name] = pd.Categorical.from_codes(self.columns[name], categories=list(self.labels[name]))
+            else:
+                data[name] = self.columns[name]
+        return pd.DataFrame(data)
+
+    def to_parquet(self, path: str, **kwargs):
+        """Write all trades to a Parquet file"""
+        self.to_frame().to_parquet(path, index=False, **kwargs)
+
+    def memory_usage(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(column.nbytes for column in self.columns.values())
+
+
+def _label(value) -> str:
+    """String label for a category field (enum values are unwrapped)"""
+    return value.value if isinstance(value, Enum) else str(value)
@@ -0,0 +1,247 @@
+"""
+Vectorized Trade Exit Resolution
+
+Given an entry bar, stop, TP1 and TP2, a trade's exit is a deterministic
+first-hit problem over the future high/low arrays. This module resolves the
+exit bar, exit reason, MAE and MFE for a whole batch of entries at once.
+
+Reproduces BacktestEngine's bar-by-bar management exactly:
+1. Bars are evaluated from the bar after entry.
+2. On each bar, stop loss is checked first, then TP2, then TP1.
+3. TP1 (while still OPEN) does not exit: it moves the stop to breakeven
+   (if enabled); from the next bar only stop and TP2 are checked.
+4. Trades still open on the last bar exit at its close ("end_of_data").
+5. MAE/MFE are taken over bar closes from the bar after entry up to and
+   including the exit bar.
+
+Short trades are handled by negating prices, so every search is a single
+"adverse <= stop or favorable >= target" test.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+
+
+# Search window grows geometrically from this many bars
+DEFAULT_HORIZON = 64
+
+# Upper bound on (pending trades x window bars) evaluated per step
+MAX_BLOCK_CELLS = 4_000_000
+
+
+@dataclass
+class ExitResolution:
+    """Resolved exits for a batch of trades (one array element per trade)"""
+    exit_idx: np.ndarray        # Bar index of exit
+    exit_price: np.ndarray      # Fill price (stop, TP2 or final close)
+    reason: np.ndarray          # 'stop_loss', 'tp2' or 'end_of_data'
+    tp1_idx: np.ndarray         # Bar index where TP1 was hit, -1 if never
+    final_stop: np.ndarray      # Stop level in force at exit
+    mae: np.ndarray             # Max Adverse Excursion (price units, <= 0)
+    mfe: np.ndarray             # Max Favorable Excursion (price units, >= 0)
+
+
+def resolve_exits(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_idx: np.ndarray,
+    is_long: np.ndarray,
+    entry_price: np.ndarray,
+    stop_loss: np.ndarray,
+    tp1: np.ndarray,
+    tp2: np.ndarray,
+    move_to_breakeven: bool = True,
+    horizon: int = DEFAULT_HORIZON
+) -> ExitResolution:
+    """
+    Resolve exits for a batch of trades
+
+    Args:
+        high, low, close: Bar price arrays
+        entry_idx: Bar index each trade was entered on
+        is_long: True for long trades, False for short
+        entry_price, stop_loss, tp1, tp2: Trade levels
+        move_to_breakeven: Move stop to entry once TP1 is hit
+        horizon: Initial search window in bars
+
+    Returns:
+        ExitResolution
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    is_long = np.asarray(is_long, dtype=bool)
+    entry_price = np.asarray(entry_price, dtype=float)
+    stop_loss = np.asarray(stop_loss, dtype=float)
+    tp1 = np.asarray(tp1, dtype=float)
+    tp2 = np.asarray(tp2, dtype=float)
+
+    n_bars = len(close)
+    n_trades = len(entry_idx)
+    last_bar = n_bars - 1
+
+    # Signed levels: shorts are mirrored so "adverse" always means <= stop
+    sign = np.where(is_long, 1.0, -1.0)
+    sl_s = sign * stop_loss
+    tp1_s = sign * tp1
+    tp2_s = sign * tp2
+    entry_s = sign * entry_price
+
+    exit_idx = np.full(n_trades, last_bar, dtype=np.int64)
+    exit_price = np.full(n_trades, close[last_bar] if n_bars else np.nan)
+    reason = np.full(n_trades, 'end_of_data', dtype=object)
+    tp1_idx = np.full(n_trades, -1, dtype=np.int64)
+    final_stop = stop_loss.copy()
+
+    # Phase 1: first bar touching the stop, TP1 or TP2
+    start = entry_idx + 1
+    hit = _first_hit(high, low, is_long, start, sl_s, np.minimum(tp1_s, tp2_s), horizon)
+
+    rows = np.flatnonzero(hit >= 0)
+    bars = hit[rows]
+    adverse, favorable = _signed_prices(high, low, is_long[rows], bars)
+
+    stopped = adverse <= sl_s[rows]
+    at_tp2 = ~stopped & (favorable >= tp2_s[rows])
+    at_tp1 = ~stopped & ~at_tp2
+
+    _record(exit_idx, exit_price, reason, rows[stopped], bars[stopped], stop_loss[rows[stopped]], 'stop_loss')
+    _record(exit_idx, exit_price, reason, rows[at_tp2], bars[at_tp2], tp2[rows[at_tp2]], 'tp2')
+
+    # Phase 2: after TP1 only the (possibly breakeven) stop and TP2 apply
+    rows = rows[at_tp1]
+    tp1_idx[rows] = bars[at_tp1]
+    if move_to_breakeven:
+        final_stop[rows] = entry_price[rows]
+
+    stop2_s = entry_s[rows] if move_to_breakeven else sl_s[rows]
+    hit = _first_hit(high, low, is_long[rows], tp1_idx[rows] + 1, stop2_s, tp2_s[rows], horizon)
+
+    found = hit >= 0
+    rows, bars = rows[found], hit[found]
+    adverse, _ = _signed_prices(high, low, is_long[rows], bars)
+
+    stopped = adverse <= stop2_s[found]
+    _record(exit_idx, exit_price, reason, rows[stopped], bars[stopped], final_stop[rows[stopped]], 'stop_loss')
+    _record(exit_idx, exit_price, reason, rows[~stopped], bars[~stopped], tp2[rows[~stopped]], 'tp2')
+
+    # Excursions over closes in (entry, exit]
+    close_max, close_min = _range_extrema(close, entry_idx + 1, exit_idx, horizon)
+    best = np.where(is_long, close_max, close_min)
+    worst = np.where(is_long, close_min, close_max)
+    mfe = np.where(np.isnan(best), 0.0, np.maximum(sign * (best - entry_price), 0.0))
+    mae = np.where(np.isnan(worst), 0.0, np.minimum(sign * (worst - entry_price), 0.0))
+
+    return ExitResolution(
+        exit_idx=exit_idx,
+        exit_price=exit_price,
+        reason=reason,
+        tp1_idx=tp1_idx,
+        final_stop=final_stop,
+        mae=mae,
+        mfe=mfe
+    )
+
+
+def _record(exit_idx, exit_price, reason, rows, bars, prices, label):
+    """Write exits for a subset of trades"""
+    exit_idx[rows] = bars
+    exit_price[rows] = prices
+    reason[rows] = label
+
+
+def _signed_prices(high, low, is_long, bars):
+    """Adverse and favorable prices at the given bars, mirrored for shorts"""
+    adverse = np.where(is_long, low[bars], -high[bars])
+    favorable = np.where(is_long, high[bars], -low[bars])
+    return adverse, favorable
+
+
+def _block_width(width: int, pending: int, horizon: int) -> int:
+    """Next search window width, bounded by MAX_BLOCK_CELLS"""
+    return max(horizon, min(width * 2, MAX_BLOCK_CELLS // max(pending, 1)))
+
+
+def _first_hit(
+    high: np.ndarray,
+    low: np.ndarray,
+    is_long: np.ndarray,
+    start: np.ndarray,
+    stop_s: np.ndarray,
+    target_s: np.ndarray,
+    horizon: int
+) -> np.ndarray:
+    """
+    First bar >= start where the signed adverse price <= stop_s or the
+    signed favorable price >= target_s; -1 if none before the last bar.
+
+    Searches all pending trades at once in windows that double in width,
+    so short-lived trades cost a single small block.
+    """
+    n_bars = len(high)
+    result = np.full(len(start), -1, dtype=np.int64)
+    position = np.asarray(start, dtype=np.int64).copy()
+    pending = np.flatnonzero(position < n_bars)
+    width = horizon
+
+    while pending.size:
+        cols = position[pending, None] + np.arange(width)
+        valid = cols < n_bars
+        cols = np.minimum(cols, n_bars - 1)
+
+        long_rows = is_long[pending, None]
+        adverse = np.where(long_rows, low[cols], -high[cols])
+        favorable = np.where(long_rows, high[cols], -low[cols])
+        hit = valid & (
+            (adverse <= stop_s[pending, None]) |
+            (favorable >= target_s[pending, None])
+        )
+
+        found = hit.any(axis=1)
+        first = hit[found].argmax(axis=1)
+        result[pending[found]] = cols[found, first]
+
+        position[pending] += width
+        pending = pending[~found & (position[pending] < n_bars)]
+        width = _block_width(width, pending.size, horizon)
+
+    return result
+
+
+def _range_extrema(
+    values: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+    horizon: int
+):
+    """
+    Max and min of values[start..stop] (inclusive) per row
+
+    Rows with an empty range get NaN.
+    """
+    n_rows = len(start)
+    range_max = np.full(n_rows, -np.inf)
+    range_min = np.full(n_rows, np.inf)
+    position = np.asarray(start, dtype=np.int64).copy()
+    pending = np.flatnonzero(position <= stop)
+    empty = position > stop
+    width = horizon
+
+    while pending.size:
+        cols = position[pending, None] + np.arange(width)
+        valid = cols <= stop[pending, None]
+        cols = np.minimum(cols, stop[pending, None])
+
+        block = values[cols]
+        range_max[pending] = np.maximum(range_max[pending], np.where(valid, block, -np.inf).max(axis=1))
+        range_min[pending] = np.minimum(range_min[pending], np.where(valid, block, np.inf).min(axis=1))
+
+        position[pending] += width
+        pending = pending[position[pending] <= stop[pending]]
+        width = _block_width(width, pending.size, horizon)
+
+    range_max[empty] = np.nan
+    range_min[empty] = np.nan
+    return range_max, range_min